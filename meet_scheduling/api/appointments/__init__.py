@@ -9,8 +9,12 @@ from meet_scheduling.api.appointments.endpoints import (
     # Calendar Resources
     get_active_calendar_resources,
     get_available_slots,
+    get_availability_summary,
+    get_next_available_slot,
+    get_slot_cache_stats,
     # Validation
     validate_appointment,
+    check_intervals_bulk,
     # CRUD
     create_and_confirm_appointment,
     cancel_or_delete_appointment,
@@ -25,8 +29,12 @@ __all__ = [
     # Calendar Resources
     "get_active_calendar_resources",
     "get_available_slots",
+    "get_availability_summary",
+    "get_next_available_slot",
+    "get_slot_cache_stats",
     # Validation
     "validate_appointment",
+    "check_intervals_bulk",
     # CRUD
     "create_and_confirm_appointment",
     "cancel_or_delete_appointment",
@@ -9,16 +9,28 @@ All public endpoints allow guest access with security protections:
 - Token-based authentication for User Contacts
 """
 
+import base64
+import json
 import frappe
 from frappe import _
-from frappe.utils import get_datetime, getdate
-from typing import Dict, List, Any, Optional
-import pytz
+from frappe.utils import add_days, cint, get_datetime, getdate
+from typing import Dict, List, Any, Optional, Tuple, Union
+from datetime import date
 
 # Import scheduling services
-from meet_scheduling.meet_scheduling.scheduling.slots import generate_available_slots
-from meet_scheduling.meet_scheduling.scheduling.overlap import check_overlap
+from meet_scheduling.meet_scheduling.scheduling.slots import SlotFilters, iter_available_slots
+from meet_scheduling.meet_scheduling.scheduling.plan_cache import WEEKDAYS, to_minutes
+from meet_scheduling.meet_scheduling.scheduling.slot_cache import (
+	get_cached_availability_summary,
+	get_cached_available_slots,
+	get_slot_cache_stats as _get_slot_cache_stats,
+	SLOT_FORMATS,
+)
+from meet_scheduling.meet_scheduling.scheduling.slot_index import get_indexed_slots
+from meet_scheduling.meet_scheduling.scheduling.overlap import check_overlap, check_overlaps_bulk
 from meet_scheduling.meet_scheduling.scheduling.availability import get_availability_slots_for_day
+from meet_scheduling.meet_scheduling.scheduling.booking import book_appointment
+from meet_scheduling.meet_scheduling.scheduling.timezones import get_resource_timezone, localize
 
 # Import video call services
 from meet_scheduling.meet_scheduling.video_calls.factory import get_adapter
@@ -38,6 +50,24 @@ from meet_scheduling.api.shared import (
 )
 
 
+# Días máximos por página de get_available_slots (el resto se pide con next_cursor)
+SLOTS_MAX_SPAN_DAYS = 31
+# Paso mínimo entre inicios de slot (step_minutes)
+SLOTS_MIN_STEP_MINUTES = 5
+
+# Días máximos de get_availability_summary (una grilla de mes con bordes)
+SUMMARY_MAX_SPAN_DAYS = 62
+
+# Límites de get_next_available_slot
+NEXT_SLOT_MAX_HORIZON_DAYS = 90
+NEXT_SLOT_MAX_LIMIT = 20
+NEXT_SLOT_CHUNK_DAYS = 7
+
+# Límites de check_intervals_bulk
+BULK_CHECK_MAX_INTERVALS = 100
+BULK_CHECK_MAX_SPAN_DAYS = 366
+
+
 @frappe.whitelist(allow_guest=True, methods=['GET'])
 def get_active_calendar_resources() -> List[Dict[str, Any]]:
 	"""
@@ -91,7 +121,20 @@ def get_active_calendar_resources() -> List[Dict[str, Any]]:
 
 
 @frappe.whitelist(allow_guest=True, methods=['GET'])
-def get_available_slots(calendar_resource: str, from_date: str, to_date: str) -> List[Dict[str, Any]]:
+def get_available_slots(
+	calendar_resource: str,
+	from_date: str = None,
+	to_date: str = None,
+	format: str = "full",
+	cursor: str = None,
+	time_from: str = None,
+	time_to: str = None,
+	weekdays: str = None,
+	min_capacity_remaining: int = 0,
+	only_available: int = 0,
+	duration_minutes: int = None,
+	step_minutes: int = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
 	"""
 	Obtiene slots disponibles para un rango de fechas.
 
@@ -100,13 +143,37 @@ def get_available_slots(calendar_resource: str, from_date: str, to_date: str) ->
 
 	Rate limited: 30 requests per minute per IP.
 
+	Cada respuesta cubre como máximo SLOTS_MAX_SPAN_DAYS días desde from_date.
+	Si el rango pedido es más largo, la respuesta incluye `next_cursor`; al
+	llamar de nuevo con `cursor` (sin from_date/to_date) se continúa desde el
+	día siguiente, sin recalcular los anteriores. El tope de días acota la
+	memoria de cada request. `next_cursor` va en frappe.response, junto a
+	`message` (desde Python: frappe.response.get("next_cursor")).
+
+	Si el resource tiene use_slot_index y la página cae en el horizonte
+	indexado, el formato full sin duración/paso ni filtros de día/horario se
+	lee del índice de slots (scheduling/slot_index.py) con una sola query. Si
+	no, la respuesta se cachea por (resource, versión, from_date, to_date); la
+	versión cambia al escribir appointments, excepciones, planes o el resource
+	(ver scheduling/slot_cache.py).
+
 	Args:
 		calendar_resource: nombre del Calendar Resource
 		from_date: fecha inicial (YYYY-MM-DD)
 		to_date: fecha final (YYYY-MM-DD)
+		format: "full" (default) o "compact"
+		cursor: valor de `next_cursor` de la respuesta anterior
+		time_from: solo slots que empiezan desde esta hora local (HH:MM)
+		time_to: solo slots que terminan hasta esta hora local (HH:MM)
+		weekdays: días incluidos, separados por coma (ej. "Monday,Tuesday")
+		min_capacity_remaining: capacidad restante mínima del slot
+		only_available: 1 para omitir slots sin capacidad
+		duration_minutes: duración de cada slot (default: slot_duration_minutes del resource)
+		step_minutes: separación entre inicios de slot (default: la duración;
+			mínimo SLOTS_MIN_STEP_MINUTES). Ej. servicios de 45 min cada 15 min.
 
 	Returns:
-		list[dict]: [
+		list[dict]: con format="full": [
 			{
 				"start": "2026-01-15 09:00:00",
 				"end": "2026-01-15 09:30:00",
@@ -116,6 +183,22 @@ def get_available_slots(calendar_resource: str, from_date: str, to_date: str) ->
 			...
 		]
 
+		dict: con format="compact", un run por intervalo disponible (ver
+		scheduling.slots.iter_slot_runs): {
+			"format": "compact",
+			"timezone": "America/Bogota",
+			"runs": [
+				{
+					"date": "2026-01-15",
+					"start_epoch": 1768485600,
+					"step_seconds": 1800,
+					"duration_seconds": 1800,
+					"capacity_remaining": [1, 0, 1, 1]
+				},
+				...
+			]
+		}
+
 	Example:
 		```javascript
 		frappe.call({
@@ -127,6 +210,7 @@ def get_available_slots(calendar_resource: str, from_date: str, to_date: str) ->
 			},
 			callback: function(r) {
 				console.log(r.message); // Array of available slots
+				console.log(r.next_cursor); // null si no hay más días
 			}
 		});
 		```
@@ -136,9 +220,24 @@ def get_available_slots(calendar_resource: str, from_date: str, to_date: str) ->
 
 	# Validate inputs
 	calendar_resource = validate_docname(calendar_resource, "calendar_resource")
+	if cursor:
+		from_date, to_date = _decode_slots_cursor(cursor)
 	from_date = validate_date_string(from_date, "from_date")
 	to_date = validate_date_string(to_date, "to_date")
 
+	format = format or "full"
+	if format not in SLOT_FORMATS:
+		frappe.throw(_("format debe ser uno de: {0}").format(", ".join(SLOT_FORMATS)))
+
+	filters = _parse_slot_filters(time_from, time_to, weekdays, min_capacity_remaining, only_available)
+
+	duration_minutes = cint(duration_minutes) or None
+	step_minutes = cint(step_minutes) or None
+	if duration_minutes is not None and duration_minutes <= 0:
+		frappe.throw(_("duration_minutes debe ser mayor que 0"))
+	if step_minutes is not None and step_minutes < SLOTS_MIN_STEP_MINUTES:
+		frappe.throw(_("step_minutes debe ser al menos {0}").format(SLOTS_MIN_STEP_MINUTES))
+
 	try:
 		# Validar que el Calendar Resource existe
 		if not frappe.db.exists("Calendar Resource", calendar_resource):
@@ -154,13 +253,41 @@ def get_available_slots(calendar_resource: str, from_date: str, to_date: str) ->
 		if start_date > end_date:
 			frappe.throw(_("from_date debe ser menor o igual que to_date"))
 
-		# Generar slots usando el servicio
-		slots = generate_available_slots(
-			calendar_resource,
-			start_date,
-			end_date
+		# Recortar a una página; el resto queda en next_cursor
+		page_end = min(end_date, add_days(start_date, SLOTS_MAX_SPAN_DAYS - 1))
+		next_cursor = (
+			_encode_slots_cursor(add_days(page_end, 1), end_date)
+			if page_end < end_date else None
 		)
 
+		slots = None
+		if format == "full" and not duration_minutes and not step_minutes and _is_capacity_only(filters):
+			slots = get_indexed_slots(
+				calendar_resource, start_date, page_end,
+				filters.min_remaining if filters else 0
+			)
+
+		# Sin índice: generar slots usando el servicio (caché versionada por resource)
+		if slots is None:
+			slots = get_cached_available_slots(
+				calendar_resource,
+				start_date,
+				page_end,
+				format,
+				filters,
+				duration_minutes,
+				step_minutes
+			)
+
+		frappe.response["next_cursor"] = next_cursor
+
+		if format == "compact":
+			return {
+				"format": "compact",
+				"timezone": str(get_resource_timezone(calendar_resource)),
+				"runs": slots
+			}
+
 		return slots
 
 	except Exception as e:
@@ -168,6 +295,244 @@ def get_available_slots(calendar_resource: str, from_date: str, to_date: str) ->
 		frappe.throw(_(f"Error al obtener slots disponibles: {str(e)}"))
 
 
+def _parse_slot_filters(
+	time_from: Optional[str],
+	time_to: Optional[str],
+	weekdays: Optional[str],
+	min_capacity_remaining: Any,
+	only_available: Any
+) -> Optional[SlotFilters]:
+	"""Valida los filtros de get_available_slots; None si no se pidió ninguno."""
+	weekday_indexes = None
+	if weekdays:
+		names = [name.strip().capitalize() for name in weekdays.split(",") if name.strip()]
+		invalid = [name for name in names if name not in WEEKDAYS]
+		if invalid:
+			frappe.throw(_("weekdays inválidos: {0}. Use {1}").format(", ".join(invalid), ", ".join(WEEKDAYS)))
+		weekday_indexes = tuple(sorted({WEEKDAYS.index(name) for name in names}))
+
+	try:
+		start_minute = to_minutes(time_from) if time_from else None
+		end_minute = to_minutes(time_to) if time_to else None
+	except Exception:
+		frappe.throw(_("Formato de hora inválido. Use HH:MM"))
+
+	if start_minute is not None and end_minute is not None and start_minute >= end_minute:
+		frappe.throw(_("time_from debe ser menor que time_to"))
+
+	min_capacity_remaining = cint(min_capacity_remaining)
+	if min_capacity_remaining < 0:
+		frappe.throw(_("min_capacity_remaining no puede ser negativo"))
+
+	filters = SlotFilters(
+		weekdays=weekday_indexes,
+		start_minute=start_minute,
+		end_minute=end_minute,
+		min_capacity_remaining=min_capacity_remaining,
+		only_available=bool(cint(only_available))
+	)
+	return None if filters == SlotFilters() else filters
+
+
+def _is_capacity_only(filters: Optional[SlotFilters]) -> bool:
+	"""True si los filtros se pueden resolver en el índice de slots (solo capacidad)."""
+	return filters is None or (
+		filters.weekdays is None and filters.start_minute is None and filters.end_minute is None
+	)
+
+
+def _encode_slots_cursor(resume_date: date, end_date: date) -> str:
+	"""Cursor opaco de get_available_slots: día desde el que continuar y fecha final."""
+	payload = json.dumps({"from": str(resume_date), "to": str(end_date)})
+	return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_slots_cursor(cursor: str) -> Tuple[str, str]:
+	"""Inverso de _encode_slots_cursor; retorna (from_date, to_date) como strings."""
+	try:
+		payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+		return payload["from"], payload["to"]
+	except Exception:
+		frappe.throw(_("cursor inválido"))
+
+
+@frappe.whitelist(allow_guest=True, methods=['GET'])
+def get_availability_summary(
+	calendar_resource: str,
+	from_date: str,
+	to_date: str
+) -> List[Dict[str, Any]]:
+	"""
+	Resumen de disponibilidad por día para la vista de mes.
+
+	Cuenta slots totales y libres por día sin armar los slots individuales;
+	el detalle de un día se pide después con get_available_slots. Cacheado
+	con la misma versión por resource que get_available_slots.
+
+	Rate limited: 30 requests per minute per IP.
+
+	Args:
+		calendar_resource: nombre del Calendar Resource
+		from_date: fecha inicial (YYYY-MM-DD)
+		to_date: fecha final (YYYY-MM-DD), máximo SUMMARY_MAX_SPAN_DAYS días
+
+	Returns:
+		list[dict]: días con al menos un slot, en orden: [
+			{
+				"date": "2026-01-15",
+				"total_slots": 16,
+				"free_slots": 12,
+				"first_free": "2026-01-15 09:00:00"
+			},
+			...
+		]
+
+	Example:
+		```javascript
+		frappe.call({
+			method: "meet_scheduling.api.appointments.get_availability_summary",
+			args: {
+				calendar_resource: "Sebastian Ortiz",
+				from_date: "2026-01-01",
+				to_date: "2026-01-31"
+			},
+			callback: function(r) {
+				console.log(r.message); // [{date, total_slots, free_slots, first_free}, ...]
+			}
+		});
+		```
+	"""
+	# Rate limit check
+	check_rate_limit("get_availability_summary", limit=30, seconds=60)
+
+	# Validate inputs
+	calendar_resource = validate_docname(calendar_resource, "calendar_resource")
+	from_date = validate_date_string(from_date, "from_date")
+	to_date = validate_date_string(to_date, "to_date")
+
+	try:
+		# Validar que el Calendar Resource existe
+		if not frappe.db.exists("Calendar Resource", calendar_resource):
+			frappe.throw(_(f"Calendar Resource '{calendar_resource}' no existe"))
+
+		start_date = getdate(from_date)
+		end_date = getdate(to_date)
+
+		if start_date > end_date:
+			frappe.throw(_("from_date debe ser menor o igual que to_date"))
+		if (end_date - start_date).days >= SUMMARY_MAX_SPAN_DAYS:
+			frappe.throw(_("El rango no puede superar {0} días").format(SUMMARY_MAX_SPAN_DAYS))
+
+		return get_cached_availability_summary(calendar_resource, start_date, end_date)
+
+	except Exception as e:
+		frappe.log_error(f"Error in get_availability_summary: {str(e)}", "API Error")
+		frappe.throw(_(f"Error al obtener el resumen de disponibilidad: {str(e)}"))
+
+
+@frappe.whitelist(methods=['GET'])
+def get_slot_cache_stats() -> Dict[str, Any]:
+	"""
+	Contadores de la caché de get_available_slots (solo managers).
+
+	Returns:
+		dict: {
+			"hits": int,
+			"stale_hits": int,
+			"misses": int,
+			"hit_ratio": float
+		}
+	"""
+	frappe.only_for(["System Manager", "Meet Scheduling Manager"])
+	return _get_slot_cache_stats()
+
+
+@frappe.whitelist(allow_guest=True, methods=['GET'])
+def get_next_available_slot(
+	calendar_resource: str,
+	after: str,
+	duration: Optional[int] = None,
+	limit: int = 1
+) -> List[Dict[str, Any]]:
+	"""
+	Obtiene los próximos slots libres a partir de una fecha/hora.
+
+	Recorre la disponibilidad hacia adelante (por bloques de NEXT_SLOT_CHUNK_DAYS
+	días, con los appointments pre-cargados por bloque) y se detiene en cuanto
+	encuentra `limit` slots libres o alcanza NEXT_SLOT_MAX_HORIZON_DAYS.
+
+	Rate limited: 30 requests per minute per IP.
+
+	Args:
+		calendar_resource: nombre del Calendar Resource
+		after: fecha/hora mínima de inicio (YYYY-MM-DD HH:MM:SS, hora local del resource)
+		duration: duración del slot en minutos (default: slot_duration_minutes del resource)
+		limit: cantidad de slots libres a retornar (máximo NEXT_SLOT_MAX_LIMIT)
+
+	Returns:
+		list[dict]: hasta `limit` slots libres, en orden cronológico. Lista vacía
+		si no hay ninguno dentro del horizonte máximo.
+
+	Example:
+		```javascript
+		frappe.call({
+			method: "meet_scheduling.api.appointments.get_next_available_slot",
+			args: {
+				calendar_resource: "Sebastian Ortiz",
+				after: "2026-01-20 08:00:00",
+				limit: 3
+			},
+			callback: function(r) {
+				console.log(r.message); // [{start, end, capacity_remaining, is_available}, ...]
+			}
+		});
+		```
+	"""
+	# Rate limit check
+	check_rate_limit("get_next_available_slot", limit=30, seconds=60)
+
+	# Validate inputs
+	calendar_resource = validate_docname(calendar_resource, "calendar_resource")
+	after = validate_datetime_string(after, "after")
+	limit = min(max(cint(limit), 1), NEXT_SLOT_MAX_LIMIT)
+	duration = cint(duration) or None
+
+	if duration is not None and duration <= 0:
+		frappe.throw(_("duration debe ser mayor que 0"))
+
+	try:
+		# Validar que el Calendar Resource existe
+		if not frappe.db.exists("Calendar Resource", calendar_resource):
+			frappe.throw(_(f"Calendar Resource '{calendar_resource}' no existe"))
+
+		start_date = getdate(after)
+		horizon_date = add_days(start_date, NEXT_SLOT_MAX_HORIZON_DAYS)
+
+		found = []
+
+		for slot in iter_available_slots(
+			calendar_resource,
+			start_date,
+			horizon_date,
+			slot_duration_minutes=duration,
+			chunk_days=NEXT_SLOT_CHUNK_DAYS,
+			filters=SlotFilters(only_available=True)
+		):
+			# Los slots vienen en orden y con formato YYYY-MM-DD HH:MM:SS
+			if slot["start"] < after:
+				continue
+
+			found.append(slot)
+			if len(found) >= limit:
+				break
+
+		return found
+
+	except Exception as e:
+		frappe.log_error(f"Error in get_next_available_slot: {str(e)}", "API Error")
+		frappe.throw(_(f"Error al buscar el próximo slot disponible: {str(e)}"))
+
+
 @frappe.whitelist(allow_guest=True, methods=['GET', 'POST'])
 def validate_appointment(
 	calendar_resource: str,
@@ -251,22 +616,10 @@ def validate_appointment(
 				"overlap_info": {}
 			}
 
-		# Obtener timezone del resource para localizar los datetimes
-		resource = frappe.get_doc("Calendar Resource", calendar_resource)
-		tz_name = resource.timezone or "UTC"
-		if tz_name == "system timezone":
-			tz_name = frappe.utils.get_system_timezone()
-
-		try:
-			tz = pytz.timezone(tz_name)
-		except Exception:
-			tz = pytz.UTC
-
 		# Localizar los datetimes si son naive (sin timezone)
-		if start.tzinfo is None:
-			start = tz.localize(start)
-		if end.tzinfo is None:
-			end = tz.localize(end)
+		tz = get_resource_timezone(calendar_resource)
+		start = localize(start, tz)
+		end = localize(end, tz)
 
 		# Validar consistencia de fechas
 		if start >= end:
@@ -314,7 +667,7 @@ def validate_appointment(
 
 		if overlap_result["capacity_exceeded"]:
 			errors.append(
-				_(f"Capacidad excedida ({overlap_result['capacity_used']} appointments)")
+				_(f"Capacidad excedida ({overlap_result['peak_occupancy']} appointments simultáneos desde {overlap_result['peak_at']})")
 			)
 			capacity_ok = False
 
@@ -352,6 +705,117 @@ def validate_appointment(
 		}
 
 
+@frappe.whitelist(allow_guest=True, methods=['GET', 'POST'])
+def check_intervals_bulk(
+	calendar_resource: str,
+	intervals: Any,
+	appointment_name: Optional[str] = None
+) -> List[Dict[str, Any]]:
+	"""
+	Overlaps y capacidad de muchos horarios candidatos en una sola llamada.
+
+	Para widgets de calendario, citas recurrentes y herramientas de admin: una
+	query para todos los candidatos (check_overlaps_bulk) en lugar de un
+	validate_appointment por horario. No valida disponibilidad del plan.
+
+	Rate limited: 20 requests per minute per IP.
+
+	Args:
+		calendar_resource: nombre del Calendar Resource
+		intervals: lista JSON de {"start", "end"} (YYYY-MM-DD HH:MM:SS), máximo
+			BULK_CHECK_MAX_INTERVALS, dentro de BULK_CHECK_MAX_SPAN_DAYS días
+		appointment_name: nombre del Appointment existente (para ediciones)
+
+	Returns:
+		list[dict]: uno por intervalo, en el mismo orden: [
+			{
+				"start": "2026-01-20 10:00:00",
+				"end": "2026-01-20 10:30:00",
+				"has_overlap": bool,
+				"overlapping_appointments": [list of appointment names],
+				"capacity_exceeded": bool,
+				"capacity_used": int,
+				"capacity_available": int,
+				"peak_occupancy": int,
+				"peak_at": "2026-01-20 10:15:00" | None
+			},
+			...
+		]
+
+	Example:
+		```javascript
+		frappe.call({
+			method: "meet_scheduling.api.appointments.check_intervals_bulk",
+			args: {
+				calendar_resource: "Sebastian Ortiz",
+				intervals: JSON.stringify([
+					{start: "2026-01-20 10:00:00", end: "2026-01-20 10:30:00"},
+					{start: "2026-01-27 10:00:00", end: "2026-01-27 10:30:00"}
+				])
+			},
+			callback: function(r) {
+				const free = r.message.filter(i => !i.capacity_exceeded);
+			}
+		});
+		```
+	"""
+	# Rate limit check
+	check_rate_limit("check_intervals_bulk", limit=20, seconds=60)
+
+	# Validate inputs
+	calendar_resource = validate_docname(calendar_resource, "calendar_resource")
+	if appointment_name:
+		appointment_name = validate_docname(appointment_name, "appointment_name")
+
+	if isinstance(intervals, str):
+		try:
+			intervals = json.loads(intervals)
+		except ValueError:
+			frappe.throw(_("intervals debe ser una lista JSON"), frappe.ValidationError)
+
+	if not isinstance(intervals, list) or not intervals:
+		frappe.throw(_("intervals debe ser una lista JSON no vacía"), frappe.ValidationError)
+	if len(intervals) > BULK_CHECK_MAX_INTERVALS:
+		frappe.throw(
+			_("No se pueden validar más de {0} intervalos por llamada").format(BULK_CHECK_MAX_INTERVALS),
+			frappe.ValidationError
+		)
+
+	candidates = []
+	for interval in intervals:
+		if not isinstance(interval, dict):
+			frappe.throw(_("Cada intervalo debe ser un objeto {start, end}"), frappe.ValidationError)
+		start = validate_datetime_string(interval.get("start"), "start")
+		end = validate_datetime_string(interval.get("end"), "end")
+		if get_datetime(start) >= get_datetime(end):
+			frappe.throw(_("start debe ser menor que end ({0})").format(start), frappe.ValidationError)
+		candidates.append((start, end))
+
+	first = min(get_datetime(start) for start, _end in candidates)
+	last = max(get_datetime(end) for _start, end in candidates)
+	if (last - first).days >= BULK_CHECK_MAX_SPAN_DAYS:
+		frappe.throw(
+			_("Los intervalos no pueden abarcar más de {0} días").format(BULK_CHECK_MAX_SPAN_DAYS),
+			frappe.ValidationError
+		)
+
+	try:
+		# Validar que el Calendar Resource existe
+		if not frappe.db.exists("Calendar Resource", calendar_resource):
+			frappe.throw(_(f"Calendar Resource '{calendar_resource}' no existe"))
+
+		results = check_overlaps_bulk(calendar_resource, candidates, exclude=appointment_name)
+
+		return [
+			{"start": start, "end": end, **result}
+			for (start, end), result in zip(candidates, results)
+		]
+
+	except Exception as e:
+		frappe.log_error(f"Error in check_intervals_bulk: {str(e)}", "API Error")
+		frappe.throw(_(f"Error al validar los intervalos: {str(e)}"))
+
+
 @frappe.whitelist(allow_guest=True, methods=['POST'])
 def create_and_confirm_appointment(
 	calendar_resource: str,
@@ -367,8 +831,9 @@ def create_and_confirm_appointment(
 	Este endpoint:
 	1. Valida que el usuario está autenticado con un token válido
 	2. Verifica que el user_contact del token coincide con el solicitado
-	3. Crea el Appointment en estado Draft
-	4. Hace submit (lo confirma)
+	3. Toma el lock de reservas del Calendar Resource (las reservas
+	   simultáneas del mismo resource se serializan)
+	4. Crea el Appointment en estado Draft y hace submit (lo confirma)
 	5. Retorna el documento confirmado
 
 	Rate limited: 5 requests per minute per IP (write operation).
@@ -459,24 +924,15 @@ def create_and_confirm_appointment(
 		if not validation_result["valid"]:
 			frappe.throw(_("Appointment no válido: ") + ", ".join(validation_result["errors"]))
 
-		# Crear Appointment en Draft
-		appointment = frappe.get_doc({
-			"doctype": "Appointment",
-			"calendar_resource": calendar_resource,
-			"user_contact": user_contact,
-			"start_datetime": start_datetime,
-			"end_datetime": end_datetime,
-			"status": "Draft",
-			"appointment_context": appointment_context or ""
-		})
-
-		# Guardar
-		appointment.insert(ignore_permissions=True)
-
-		# Submit (confirmar)
-		appointment.submit()
-
-		frappe.db.commit()
+		# Crear y confirmar bajo el lock del resource (la capacidad se vuelve a
+		# validar dentro del lock, ver scheduling/booking.py)
+		appointment = book_appointment(
+			calendar_resource,
+			user_contact,
+			start_datetime,
+			end_datetime,
+			appointment_context
+		)
 
 		# Retornar el documento completo
 		return appointment.as_dict()
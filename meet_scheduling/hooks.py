@@ -179,6 +179,32 @@ appointment_email_recipients = []
 # 	}
 # }
 
+doc_events = {
+	"Appointment": {
+		"on_update": "meet_scheduling.meet_scheduling.scheduling.doc_events.on_appointment_change",
+		"on_submit": "meet_scheduling.meet_scheduling.scheduling.doc_events.on_appointment_change",
+		"on_cancel": "meet_scheduling.meet_scheduling.scheduling.doc_events.on_appointment_change",
+		"on_update_after_submit": "meet_scheduling.meet_scheduling.scheduling.doc_events.on_appointment_change",
+		"on_trash": "meet_scheduling.meet_scheduling.scheduling.doc_events.on_appointment_change"
+	},
+	"Availability Plan": {
+		"on_update": "meet_scheduling.meet_scheduling.scheduling.doc_events.on_availability_plan_change",
+		"on_trash": "meet_scheduling.meet_scheduling.scheduling.doc_events.on_availability_plan_change"
+	},
+	"Calendar Exception": {
+		"on_update": "meet_scheduling.meet_scheduling.scheduling.doc_events.on_calendar_exception_change",
+		"on_trash": "meet_scheduling.meet_scheduling.scheduling.doc_events.on_calendar_exception_change"
+	},
+	"Calendar Resource": {
+		"on_update": "meet_scheduling.meet_scheduling.scheduling.doc_events.on_calendar_resource_update",
+		"on_trash": "meet_scheduling.meet_scheduling.scheduling.doc_events.on_calendar_resource_trash"
+	},
+	"Holiday Calendar": {
+		"on_update": "meet_scheduling.meet_scheduling.scheduling.doc_events.on_holiday_calendar_change",
+		"on_trash": "meet_scheduling.meet_scheduling.scheduling.doc_events.on_holiday_calendar_change"
+	}
+}
+
 # Scheduled Tasks
 # ---------------
 
@@ -191,6 +217,10 @@ scheduler_events = {
 	"hourly": [
 		"meet_scheduling.meet_scheduling.scheduling.tasks.auto_complete_past_appointments",
 		"meet_scheduling.meet_scheduling.scheduling.tasks.send_appointment_reminders"
+	],
+	"daily": [
+		"meet_scheduling.meet_scheduling.scheduling.materialized.rebuild_all_availability_days",
+		"meet_scheduling.meet_scheduling.scheduling.slot_index.rebuild_all_slot_indexes"
 	]
 }
 
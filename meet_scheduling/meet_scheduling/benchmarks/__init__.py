@@ -0,0 +1,13 @@
+"""
+Benchmarks Module
+
+Micro-benchmarks for the scheduling engine. They only use the pure-Python
+modules of scheduling/ (no DB), so they can be run outside of bench:
+
+    python -m meet_scheduling.meet_scheduling.benchmarks.bench_exceptions
+
+bench_overlaps times CapacityTimeline, whose module imports frappe: run it
+with the bench's Python (no site or DB needed). check_appointment_indexes
+EXPLAINs the Appointment hot queries on a seeded table and therefore runs
+through bench execute.
+"""
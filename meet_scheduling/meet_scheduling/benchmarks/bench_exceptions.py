@@ -0,0 +1,90 @@
+"""
+Benchmark: application of Calendar Exceptions
+
+Compara la resta secuencial de excepciones (una reconstrucción completa de la
+lista de intervalos por cada Closed/Blocked, O(intervalos × excepciones)) con
+la pasada única de sweep-line (intervals.sweep, O((n+m) log(n+m))) en días con
+docenas de bloqueos parciales.
+
+Uso:
+    python -m meet_scheduling.meet_scheduling.benchmarks.bench_exceptions
+"""
+
+import random
+import timeit
+from typing import List, Tuple
+
+from meet_scheduling.meet_scheduling.scheduling.intervals import (
+	Interval,
+	normalize,
+	subtract,
+	sweep,
+	union,
+)
+
+DAY_START = 1_768_903_200  # 2026-01-20 09:00 UTC
+DAY_SECONDS = 12 * 3600
+
+
+def _random_ranges(count: int, max_length: int, rng: random.Random) -> List[Interval]:
+	"""Genera rangos aleatorios dentro de la jornada."""
+	ranges = []
+	for _ in range(count):
+		start = DAY_START + rng.randrange(0, DAY_SECONDS - 60, 60)
+		ranges.append(Interval(start, min(start + rng.randrange(60, max_length, 60), DAY_START + DAY_SECONDS)))
+	return ranges
+
+
+def build_day(
+	base_count: int,
+	block_count: int,
+	extra_count: int,
+	seed: int = 42
+) -> Tuple[List[Interval], List[Interval], List[Interval]]:
+	"""Construye un día sintético: franjas del plan, bloqueos parciales y extras."""
+	rng = random.Random(seed)
+	step = DAY_SECONDS // base_count
+	base = [
+		Interval(DAY_START + i * step, DAY_START + i * step + step - 300)
+		for i in range(base_count)
+	]
+	return base, _random_ranges(block_count, 3600, rng), _random_ranges(extra_count, 1800, rng)
+
+
+def sequential(base: List[Interval], blocks: List[Interval], extra: List[Interval]) -> List[Interval]:
+	"""Estrategia anterior: unir extras y restar cada bloqueo por separado."""
+	intervals = union(normalize(base), normalize(extra))
+	for block in blocks:
+		intervals = subtract(intervals, [block])
+	return intervals
+
+
+def run(repeat: int = 5, number: int = 200) -> None:
+	"""Imprime tiempos por día para ambas estrategias en varios escenarios."""
+	scenarios = [(4, 5, 1), (12, 24, 4), (48, 48, 8), (96, 200, 20)]
+
+	print(f"{'base':>5} {'blocks':>7} {'extra':>6} {'sequential µs':>14} {'sweep µs':>10} {'speedup':>8}")
+
+	for base_count, block_count, extra_count in scenarios:
+		base, blocks, extra = build_day(base_count, block_count, extra_count)
+
+		# Ambas estrategias deben coincidir (bloqueo gana sobre extra)
+		expected = subtract(union(normalize(base), normalize(extra)), normalize(blocks))
+		assert sweep(base, extra, blocks) == expected
+
+		sequential_time = min(timeit.repeat(
+			lambda: sequential(base, blocks, extra), repeat=repeat, number=number
+		)) / number
+		sweep_time = min(timeit.repeat(
+			lambda: sweep(base, extra, blocks), repeat=repeat, number=number
+		)) / number
+
+		print(
+			f"{base_count:>5} {block_count:>7} {extra_count:>6} "
+			f"{sequential_time * 1e6:>14.1f} {sweep_time * 1e6:>10.1f} "
+			f"{sequential_time / sweep_time:>7.1f}x"
+		)
+
+
+if __name__ == "__main__":
+	run()
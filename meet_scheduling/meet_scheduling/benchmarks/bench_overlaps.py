@@ -0,0 +1,87 @@
+"""
+Benchmark: remaining capacity in slot generation
+
+Compara el cálculo anterior de capacidad restante por slot (recorrer todas
+las citas pre-cargadas en cada slot y tomar el pico de simultáneas,
+O(slots × citas)) con CapacityTimeline, que es lo que usa slots.py (función
+escalonada armada una vez y range-min O(1) por slot, O(n log n + slots)).
+
+capacity.py importa frappe (sin usar la DB en CapacityTimeline), así que
+se corre con el Python del bench:
+
+    python -m meet_scheduling.meet_scheduling.benchmarks.bench_overlaps
+"""
+
+import random
+import timeit
+from typing import List, Tuple
+
+from meet_scheduling.meet_scheduling.scheduling.capacity import CapacityTimeline
+from meet_scheduling.meet_scheduling.scheduling.intervals import Interval, peak_overlap
+
+RANGE_START = 1_768_885_200  # 2026-01-20 05:00 UTC
+SLOT_SECONDS = 30 * 60
+CAPACITY = 5
+
+
+def build_scenario(
+	appointment_count: int,
+	slot_count: int,
+	seed: int = 42
+) -> Tuple[List[Interval], List[Interval]]:
+	"""Slots back-to-back y citas aleatorias (15-90 min) sobre el mismo rango."""
+	rng = random.Random(seed)
+	range_seconds = slot_count * SLOT_SECONDS
+
+	slots = [
+		Interval(RANGE_START + i * SLOT_SECONDS, RANGE_START + (i + 1) * SLOT_SECONDS)
+		for i in range(slot_count)
+	]
+
+	appointments = []
+	for _ in range(appointment_count):
+		start = RANGE_START + rng.randrange(0, range_seconds, 900)
+		appointments.append(Interval(start, start + rng.randrange(900, 5401, 900)))
+
+	return appointments, slots
+
+
+def linear_scan(appointments: List[Interval], slots: List[Interval]) -> List[int]:
+	"""Estrategia anterior: pico de citas simultáneas recorriendo todas las citas por slot."""
+	remaining = []
+	for slot_start, slot_end in slots:
+		peak, _at = peak_overlap(appointments, slot_start, slot_end)
+		remaining.append(CAPACITY - peak)
+	return remaining
+
+
+def timeline(appointments: List[Interval], slots: List[Interval]) -> List[int]:
+	"""Estrategia actual: CapacityTimeline (incluye el costo de armarlo)."""
+	capacity = CapacityTimeline([], appointments, default_seats=CAPACITY)
+	return [capacity.free_seats(slot_start, slot_end) for slot_start, slot_end in slots]
+
+
+def run(repeat: int = 3) -> None:
+	"""Imprime tiempos por escenario para ambas estrategias."""
+	scenarios = [(100, 500), (1_000, 1_000), (10_000, 5_000)]
+
+	print(f"{'appointments':>12} {'slots':>6} {'linear scan ms':>15} {'timeline ms':>12} {'speedup':>8}")
+
+	for appointment_count, slot_count in scenarios:
+		appointments, slots = build_scenario(appointment_count, slot_count)
+
+		# Ambas estrategias deben coincidir
+		assert timeline(appointments, slots) == linear_scan(appointments, slots)
+
+		linear_time = min(timeit.repeat(lambda: linear_scan(appointments, slots), repeat=repeat, number=1))
+		timeline_time = min(timeit.repeat(lambda: timeline(appointments, slots), repeat=repeat, number=1))
+
+		print(
+			f"{appointment_count:>12} {slot_count:>6} "
+			f"{linear_time * 1e3:>15.1f} {timeline_time * 1e3:>12.2f} "
+			f"{linear_time / timeline_time:>7.0f}x"
+		)
+
+
+if __name__ == "__main__":
+	run()
@@ -0,0 +1,191 @@
+"""
+Check: índices de Appointment en las queries calientes
+
+Siembra una tabla de Appointment de 1M de filas (distribución parecida a
+producción: mayoría de citas pasadas Completed/Cancelled, pocas Confirmed
+futuras, muy pocos Drafts), corre EXPLAIN sobre cada query caliente y falla
+si alguna recorre `tabAppointment` completa (type ALL o sin key).
+
+Queries verificadas (los índices están en APPOINTMENT_INDEXES):
+- capacity.get_active_bookings y overlap.check_overlap
+- tasks.cleanup_expired_drafts, send_appointment_reminders y
+  auto_complete_past_appointments
+- get_my_appointments (con y sin rango de fechas)
+
+Necesita DB (MariaDB), así que corre dentro de bench. Solo en sitios de
+desarrollo: inserta y luego borra 1M de filas (prefijo IDXCHK-).
+
+Uso:
+    bench --site <site de desarrollo> execute \
+        meet_scheduling.meet_scheduling.benchmarks.check_appointment_indexes.run
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import frappe
+from frappe.utils import now_datetime
+
+from meet_scheduling.meet_scheduling.scheduling.tasks import (
+	EXPIRED_DRAFTS_QUERY,
+	PAST_CONFIRMED_QUERY,
+	UPCOMING_CONFIRMED_QUERY,
+)
+
+SEED_PREFIX = "IDXCHK-"
+SEED_ROWS = 1_000_000
+SEED_RESOURCES = 200
+SEED_CONTACTS = 50_000
+CHUNK_SIZE = 10_000
+
+PAST_DAYS = 730
+FUTURE_DAYS = 90
+
+FIELDS = [
+	"name", "creation", "modified", "owner", "modified_by", "docstatus",
+	"calendar_resource", "user_contact", "start_datetime", "end_datetime",
+	"status", "draft_expires_at",
+]
+
+
+def run(rows: int = SEED_ROWS, seed: int = 42) -> None:
+	"""Siembra, verifica los planes de ejecución y limpia (también si falla)."""
+	if frappe.db.db_type != "mariadb":
+		frappe.throw("check_appointment_indexes solo soporta MariaDB (EXPLAIN)")
+
+	current_time = now_datetime()
+
+	try:
+		_seed(int(rows), current_time, random.Random(seed))
+		frappe.db.sql("ANALYZE TABLE `tabAppointment`")
+
+		failures = []
+		for label, query, values in _hot_queries(current_time):
+			plan = frappe.db.sql(f"EXPLAIN {query}", values, as_dict=True)
+			scans = [
+				row for row in plan
+				if row.get("table") == "tabAppointment"
+				and (row.get("type") == "ALL" or not row.get("key"))
+			]
+			keys = ", ".join(str(row.get("key")) for row in plan if row.get("table") == "tabAppointment")
+			print(f"{label:<34} {'FULL SCAN' if scans else 'ok':<10} key={keys}")
+			if scans:
+				failures.append(label)
+
+		if failures:
+			raise AssertionError(f"Full scan de tabAppointment en: {', '.join(failures)}")
+	finally:
+		frappe.db.delete("Appointment", {"name": ["like", f"{SEED_PREFIX}%"]})
+		frappe.db.commit()
+
+
+def _seed(rows: int, current_time: datetime, rng: random.Random) -> None:
+	"""Inserta las citas sintéticas en bloques de CHUNK_SIZE."""
+	range_start = current_time - timedelta(days=PAST_DAYS)
+	range_minutes = (PAST_DAYS + FUTURE_DAYS) * 24 * 60
+
+	for chunk_start in range(0, rows, CHUNK_SIZE):
+		values = []
+		for i in range(chunk_start, min(chunk_start + CHUNK_SIZE, rows)):
+			start = range_start + timedelta(minutes=rng.randrange(0, range_minutes, 15))
+			end = start + timedelta(minutes=rng.choice((15, 30, 45, 60)))
+			status = _seed_status(start, current_time, rng)
+			values.append((
+				f"{SEED_PREFIX}{i:07d}",
+				current_time,
+				current_time,
+				"Administrator",
+				"Administrator",
+				1 if status in ("Confirmed", "Completed", "No-show") else (2 if status == "Cancelled" else 0),
+				f"{SEED_PREFIX}RES-{rng.randrange(SEED_RESOURCES):03d}",
+				f"{SEED_PREFIX}UC-{rng.randrange(SEED_CONTACTS):05d}",
+				start,
+				end,
+				status,
+				current_time + timedelta(minutes=rng.randrange(-60, 15)) if status == "Draft" else None,
+			))
+
+		frappe.db.bulk_insert("Appointment", fields=FIELDS, values=values)
+		frappe.db.commit()
+
+
+def _seed_status(start: datetime, current_time: datetime, rng: random.Random) -> str:
+	roll = rng.random()
+	if start < current_time:
+		if roll < 0.7:
+			return "Completed"
+		return "Cancelled" if roll < 0.9 else "No-show"
+	if roll < 0.02:
+		return "Draft"
+	return "Confirmed" if roll < 0.9 else "Cancelled"
+
+
+def _hot_queries(current_time: datetime) -> List[Tuple[str, str, Optional[Dict[str, Any]]]]:
+	"""(etiqueta, SQL, valores) de cada query caliente, armadas como en el código real."""
+	resource = f"{SEED_PREFIX}RES-007"
+	contact = f"{SEED_PREFIX}UC-00042"
+	day = (current_time + timedelta(days=3)).date()
+	window_start = datetime.combine(day, datetime.min.time()) + timedelta(hours=9)
+	window_end = window_start + timedelta(minutes=30)
+
+	# Las queries del ORM se obtienen con run=0 (SQL con los valores ya escapados)
+	active_bookings = frappe.get_all(
+		"Appointment",
+		filters={
+			"calendar_resource": resource,
+			"status": ["in", ["Draft", "Confirmed"]],
+			"start_datetime": ["<=", f"{day} 23:59:59"],
+			"end_datetime": [">=", f"{day} 00:00:00"],
+		},
+		fields=["name", "status", "draft_expires_at", "start_datetime", "end_datetime"],
+		run=0
+	)
+	overlap = frappe.get_all(
+		"Appointment",
+		filters={
+			"calendar_resource": resource,
+			"status": ["in", ["Draft", "Confirmed"]],
+			"start_datetime": ["<", window_end],
+			"end_datetime": [">", window_start],
+		},
+		fields=["name", "status", "draft_expires_at", "start_datetime", "end_datetime"],
+		run=0
+	)
+	my_appointments = frappe.get_all(
+		"Appointment",
+		filters={"user_contact": contact},
+		fields=["name", "calendar_resource", "start_datetime", "end_datetime", "status"],
+		order_by="start_datetime desc",
+		limit=100,
+		run=0
+	)
+	my_appointments_range = frappe.get_all(
+		"Appointment",
+		filters=[
+			["user_contact", "=", contact],
+			["start_datetime", ">=", str(current_time.date())],
+			["start_datetime", "<=", f"{day} 23:59:59"],
+		],
+		fields=["name", "calendar_resource", "start_datetime", "end_datetime", "status"],
+		order_by="start_datetime desc",
+		limit=100,
+		run=0
+	)
+
+	return [
+		("get_active_bookings", active_bookings, None),
+		("check_overlap", overlap, None),
+		("cleanup_expired_drafts", EXPIRED_DRAFTS_QUERY, {
+			"now": current_time,
+			"fallback_cutoff": current_time - timedelta(hours=24),
+		}),
+		("send_appointment_reminders", UPCOMING_CONFIRMED_QUERY, {
+			"lead_start": current_time + timedelta(hours=23),
+			"lead_end": current_time + timedelta(hours=25),
+		}),
+		("auto_complete_past_appointments", PAST_CONFIRMED_QUERY, {"now": current_time}),
+		("get_my_appointments", my_appointments, None),
+		("get_my_appointments (rango)", my_appointments_range, None),
+	]
+
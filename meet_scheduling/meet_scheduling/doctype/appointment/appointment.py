@@ -16,6 +16,7 @@ from typing import Any
 # Import scheduling services
 from meet_scheduling.meet_scheduling.scheduling.overlap import check_overlap
 from meet_scheduling.meet_scheduling.scheduling.availability import get_availability_slots_for_day
+from meet_scheduling.meet_scheduling.scheduling.timezones import get_resource_timezone, localize
 
 # Import video call services
 from meet_scheduling.meet_scheduling.video_calls.factory import get_adapter
@@ -254,7 +255,7 @@ class Appointment(Document):
 		if overlap_result["capacity_exceeded"]:
 			overlapping = ", ".join(overlap_result["overlapping_appointments"])
 			frappe.throw(
-				_(f"No hay capacidad disponible en este horario. Ya hay {overlap_result['capacity_used']} cita(s) que ocupan toda la capacidad.")
+				_(f"No hay capacidad disponible en este horario. Ya hay {overlap_result['peak_occupancy']} cita(s) simultáneas desde {overlap_result['peak_at']} que ocupan toda la capacidad.")
 			)
 
 	def _validate_slot_granularity(self) -> None:
@@ -331,23 +332,10 @@ class Appointment(Document):
 		start = get_datetime(self.start_datetime)
 		end = get_datetime(self.end_datetime)
 
-		# Obtener timezone del Calendar Resource para comparación
-		resource = frappe.get_cached_doc("Calendar Resource", self.calendar_resource)
-		tz_name = resource.timezone or "UTC"
-		if tz_name == "system timezone":
-			tz_name = frappe.utils.get_system_timezone()
-
-		try:
-			import pytz
-			tz = pytz.timezone(tz_name)
-			# Convertir start y end al timezone del resource para comparar
-			if start.tzinfo is None:
-				start = tz.localize(start)
-			if end.tzinfo is None:
-				end = tz.localize(end)
-		except Exception:
-			# Si falla, continuar con comparación sin timezone
-			pass
+		# Convertir start y end al timezone del resource para comparar
+		tz = get_resource_timezone(self.calendar_resource)
+		start = localize(start, tz)
+		end = localize(end, tz)
 
 		is_within_availability = False
 		for slot in availability_slots:
@@ -379,7 +367,7 @@ class Appointment(Document):
 		if overlap_result["capacity_exceeded"]:
 			overlapping = ", ".join(overlap_result["overlapping_appointments"])
 			frappe.throw(
-				_(f"Capacidad excedida. Ya hay {overlap_result['capacity_used']} cita(s) en este horario.")
+				_(f"Capacidad excedida. Ya hay {overlap_result['peak_occupancy']} cita(s) simultáneas en este horario (desde {overlap_result['peak_at']}).")
 			)
 
 	# ===== VIDEO CALL METHODS =====
@@ -515,3 +503,30 @@ class Appointment(Document):
 					alert=True
 				)
 
+
+
+# Índices compuestos para las queries calientes (nombre → columnas, en orden
+# de igualdad, luego rango). Los verifica benchmarks/check_appointment_indexes.py.
+APPOINTMENT_INDEXES = {
+	# capacity.get_active_bookings y overlap.check_overlap
+	"resource_status_window": ["calendar_resource", "status", "start_datetime", "end_datetime"],
+	# tasks.cleanup_expired_drafts
+	"status_docstatus_expiry": ["status", "docstatus", "draft_expires_at", "start_datetime"],
+	# tasks.send_appointment_reminders
+	"status_start": ["status", "start_datetime"],
+	# tasks.auto_complete_past_appointments
+	"status_end": ["status", "end_datetime"],
+	# api get_my_appointments (filtro por contacto, orden por start_datetime)
+	"user_contact_start": ["user_contact", "start_datetime"],
+}
+
+
+def add_appointment_indexes() -> None:
+	"""Crea los índices de APPOINTMENT_INDEXES que falten (add_index es idempotente)."""
+	for index_name, fields in APPOINTMENT_INDEXES.items():
+		frappe.db.add_index("Appointment", fields, index_name=index_name)
+
+
+def on_doctype_update() -> None:
+	"""Índices en instalaciones nuevas; en sitios existentes los crea el patch."""
+	add_appointment_indexes()
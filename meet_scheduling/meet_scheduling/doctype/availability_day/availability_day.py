@@ -0,0 +1,25 @@
+# Copyright (c) 2026, Sebastian Ortiz Valencia and contributors
+# For license information, please see license.txt
+
+"""
+Availability Day DocType
+
+Disponibilidad efectiva precalculada (plan + excepciones) de un Calendar Resource
+para una fecha. Se mantiene desde scheduling/materialized.py; no se edita a mano.
+"""
+
+import frappe
+from frappe.model.document import Document
+
+
+class AvailabilityDay(Document):
+	pass
+
+
+def on_doctype_update() -> None:
+	"""Una fila por (calendar_resource, date); también sirve de índice de lectura."""
+	frappe.db.add_unique(
+		"Availability Day",
+		["calendar_resource", "date"],
+		constraint_name="unique_resource_date"
+	)
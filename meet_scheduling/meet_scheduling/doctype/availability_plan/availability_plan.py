@@ -15,6 +15,11 @@ from frappe.utils import getdate, get_time
 from datetime import time, timedelta
 from typing import List, Dict, Any
 
+from meet_scheduling.meet_scheduling.scheduling.plan_cache import (
+	invalidate_compiled_plan,
+	store_compiled_plan,
+)
+
 
 class AvailabilityPlan(Document):
 	"""
@@ -38,6 +43,18 @@ class AvailabilityPlan(Document):
 		self._validate_slots_times()
 		self._validate_no_overlapping_slots()
 
+	def on_update(self) -> None:
+		"""
+		Invalida el plan compilado y lo vuelve a compilar tras el commit,
+		para que el cálculo de disponibilidad nunca recorra la tabla hija.
+		"""
+		invalidate_compiled_plan(self.name)
+		frappe.db.after_commit.add(lambda: store_compiled_plan(self))
+
+	def on_trash(self) -> None:
+		"""Elimina el plan compilado de la caché."""
+		invalidate_compiled_plan(self.name)
+
 	def _validate_plan_name(self) -> None:
 		"""Valida que plan_name esté presente."""
 		if not self.plan_name:
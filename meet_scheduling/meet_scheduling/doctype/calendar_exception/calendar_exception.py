@@ -8,13 +8,29 @@ Override de disponibilidad para fechas específicas:
 - Closed: Cierra todo el día o un rango
 - Blocked: Bloquea un rango
 - Extra Availability: Agrega disponibilidad adicional
+
+Una excepción puede aplicar a un rango de fechas (date..to_date) y/o repetirse
+(Weekly, Yearly). Se expande solo sobre la ventana consultada
+(ver availability.iter_exception_dates).
 """
 
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import getdate, get_time
-from datetime import time, timedelta
+from frappe.utils import add_years, getdate, get_time
+from datetime import date, time, timedelta
+from typing import Any, Optional
+
+from meet_scheduling.meet_scheduling.scheduling.availability import (
+	get_exception_span,
+	get_exceptions_in_range,
+	iter_exception_dates,
+)
+
+
+# Hasta dónde se comparan dos excepciones recurrentes sin fin: el calendario
+# gregoriano repite fechas y días de la semana cada 28 años (dentro de un siglo)
+DUPLICATE_CHECK_HORIZON_YEARS = 28
 
 
 class CalendarException(Document):
@@ -25,9 +41,11 @@ class CalendarException(Document):
 	- calendar_resource required
 	- exception_type required
 	- date required
+	- date <= to_date (if present)
 	- start_time < end_time (if both present)
 	- Extra Availability requires start_time and end_time
-	- Warn on duplicate exceptions for same date/resource
+	- Warn on exceptions of the same resource that share a date (ranges and
+	  recurrences included)
 	"""
 
 	def validate(self) -> None:
@@ -35,6 +53,7 @@ class CalendarException(Document):
 		Validación antes de guardar.
 		"""
 		self._validate_required_fields()
+		self._validate_date_range()
 		self._validate_times()
 		self._validate_extra_availability()
 		self._check_duplicate_exceptions()
@@ -50,6 +69,11 @@ class CalendarException(Document):
 		if not self.date:
 			frappe.throw(_("Date es requerido"))
 
+	def _validate_date_range(self) -> None:
+		"""Valida que date <= to_date si to_date está presente."""
+		if self.to_date and getdate(self.to_date) < getdate(self.date):
+			frappe.throw(_("To Date debe ser mayor o igual que Date"))
+
 	def _validate_times(self) -> None:
 		"""Valida que start_time < end_time si ambos están presentes."""
 		if self.start_time and self.end_time:
@@ -83,52 +107,80 @@ class CalendarException(Document):
 
 	def _check_duplicate_exceptions(self) -> None:
 		"""
-		Advierte si ya existe una excepción para el mismo día y recurso.
+		Advierte si otra excepción del mismo recurso aplica en alguna fecha de esta.
 		No bloquea, solo informa, porque pueden haber múltiples bloqueos parciales.
+
+		Compara las fechas expandidas (rango date..to_date y recurrencia, ver
+		availability.iter_exception_dates), no solo el campo date.
 		"""
 		if not self.calendar_resource or not self.date:
 			return
 
-		filters = {
-			"calendar_resource": self.calendar_resource,
-			"date": self.date,
-			"name": ["!=", self.name] if self.name else ["is", "set"]
-		}
-
-		existing = frappe.get_all(
-			"Calendar Exception",
-			filters=filters,
-			fields=["name", "exception_type", "start_time", "end_time"]
-		)
-
-		if existing:
-			# Si es Closed todo el día y ya hay excepciones, advertir
-			if self.exception_type == "Closed" and not self.start_time and not self.end_time:
-				frappe.msgprint(
-					_(f"Ya existen {len(existing)} excepción(es) para {self.calendar_resource} en {self.date}. "
-					  f"Esta excepción 'Closed' sin horario cerrará todo el día."),
-					indicator="orange",
-					alert=True
-				)
-			else:
-				# Verificar si hay overlap con excepciones existentes
-				if self.start_time and self.end_time:
-					new_start = self._to_time(self.start_time)
-					new_end = self._to_time(self.end_time)
-
-					for exc in existing:
-						if exc.start_time and exc.end_time:
-							exc_start = self._to_time(exc.start_time)
-							exc_end = self._to_time(exc.end_time)
-
-							# Verificar overlap
-							if new_start < exc_end and new_end > exc_start:
-								frappe.msgprint(
-									_(f"Esta excepción ({new_start.strftime('%H:%M')}-{new_end.strftime('%H:%M')}) "
-									  f"se solapa con {exc.name} ({exc_start.strftime('%H:%M')}-{exc_end.strftime('%H:%M')})"),
-									indicator="orange",
-									alert=True
-								)
+		first, last = get_exception_span(self)
+		horizon_end = last or add_years(first, DUPLICATE_CHECK_HORIZON_YEARS)
+
+		existing = []
+		for exc in get_exceptions_in_range(self.calendar_resource, first, horizon_end):
+			if exc.name == self.name:
+				continue
+			shared_date = self._first_shared_date(exc, horizon_end)
+			if shared_date:
+				existing.append((exc, shared_date))
+
+		if not existing:
+			return
+
+		# Si es Closed todo el día y ya hay excepciones, advertir
+		if self.exception_type == "Closed" and not self.start_time and not self.end_time:
+			first_shared = min(shared_date for _exc, shared_date in existing)
+			frappe.msgprint(
+				_(f"Ya existen {len(existing)} excepción(es) para {self.calendar_resource} en fechas de esta "
+				  f"(la primera, {first_shared}). Esta excepción 'Closed' sin horario cerrará todo el día."),
+				indicator="orange",
+				alert=True
+			)
+			return
+
+		# Verificar si hay overlap horario con excepciones existentes
+		if not (self.start_time and self.end_time):
+			return
+
+		new_start = self._to_time(self.start_time)
+		new_end = self._to_time(self.end_time)
+
+		for exc, shared_date in existing:
+			if exc.start_time and exc.end_time:
+				exc_start = self._to_time(exc.start_time)
+				exc_end = self._to_time(exc.end_time)
+
+				# Verificar overlap
+				if new_start < exc_end and new_end > exc_start:
+					frappe.msgprint(
+						_(f"Esta excepción ({new_start.strftime('%H:%M')}-{new_end.strftime('%H:%M')}) "
+						  f"se solapa con {exc.name} ({exc_start.strftime('%H:%M')}-{exc_end.strftime('%H:%M')}) "
+						  f"el {shared_date}"),
+						indicator="orange",
+						alert=True
+					)
+
+	def _first_shared_date(self, other: Any, horizon_end: date) -> Optional[date]:
+		"""
+		Primera fecha en que aplican esta excepción y `other`, o None.
+
+		Recorre las fechas de esta excepción dentro de la intersección de ambos
+		spans (acotada a horizon_end) y prueba si `other` aplica en cada una.
+		"""
+		first, _last = get_exception_span(self)
+		other_first, other_last = get_exception_span(other)
+
+		window_start = max(first, other_first)
+		window_end = min(horizon_end, other_last) if other_last else horizon_end
+
+		for day in iter_exception_dates(self, window_start, window_end):
+			if next(iter_exception_dates(other, day, day), None):
+				return day
+
+		return None
 
 	def _to_time(self, time_value) -> time:
 		"""
@@ -143,3 +195,8 @@ class CalendarException(Document):
 			return get_time(time_value)
 		else:
 			return get_time(time_value)
+
+
+def on_doctype_update() -> None:
+	"""Índice para las búsquedas por rango de _load_availability_context."""
+	frappe.db.add_index("Calendar Exception", ["calendar_resource", "date", "to_date"])
@@ -1,9 +1,90 @@
 # Copyright (c) 2026, Sebastian Ortiz Valencia and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
 
 
 class TestCalendarException(FrappeTestCase):
-	pass
+	"""Tests for the duplicate-exception warning with ranges and recurrences."""
+
+	def setUp(self):
+		"""Set up a resource with a date-range and a weekly exception."""
+		if not frappe.db.exists("Calendar Resource", "Test Resource Exception Dupes"):
+			frappe.get_doc({
+				"doctype": "Calendar Resource",
+				"resource_name": "Test Resource Exception Dupes",
+				"timezone": "America/Bogota",
+				"slot_duration_minutes": 30,
+				"capacity": 1,
+				"is_active": 1
+			}).insert(ignore_permissions=True)
+
+		frappe.db.delete("Calendar Exception", {"calendar_resource": "Test Resource Exception Dupes"})
+		for exception in (
+			# Vacaciones: lunes 2026-02-02 a viernes 2026-02-13
+			{"date": "2026-02-02", "to_date": "2026-02-13", "exception_type": "Closed"},
+			# Todos los miércoles desde 2026-01-07: bloqueo 12:00-13:00
+			{"date": "2026-01-07", "recurrence": "Weekly", "exception_type": "Blocked",
+			 "start_time": "12:00:00", "end_time": "13:00:00"},
+		):
+			self._exception(**exception).insert(ignore_permissions=True)
+
+		frappe.clear_messages()
+
+	def _exception(self, **fields):
+		return frappe.get_doc({
+			"doctype": "Calendar Exception",
+			"calendar_resource": "Test Resource Exception Dupes",
+			**fields
+		})
+
+	def _warnings(self):
+		return [str(message) for message in frappe.get_message_log()]
+
+	def test_shared_date_with_range_and_recurrence(self):
+		"""Test that shared dates are found through ranges and weekly recurrences."""
+		vacation, weekly = frappe.get_all(
+			"Calendar Exception",
+			filters={"calendar_resource": "Test Resource Exception Dupes"},
+			fields=["name", "date", "to_date", "recurrence", "start_time", "end_time"],
+			order_by="date desc"
+		)
+		horizon = getdate("2030-12-31")
+
+		# Un rango que empieza después del date del otro rango
+		closure = self._exception(date="2026-02-10", to_date="2026-02-20", exception_type="Closed")
+		self.assertEqual(closure._first_shared_date(vacation, horizon), getdate("2026-02-10"))
+		# 2026-02-11 es el primer miércoles del rango
+		self.assertEqual(closure._first_shared_date(weekly, horizon), getdate("2026-02-11"))
+
+		# Recurrencia anual sin fin contra una semanal sin fin: 2027-01-13 es miércoles
+		yearly = self._exception(date="2026-01-13", recurrence="Yearly", exception_type="Closed")
+		self.assertEqual(yearly._first_shared_date(weekly, horizon), getdate("2027-01-13"))
+
+		# Sin fechas en común
+		thursday = self._exception(date="2026-03-05", exception_type="Closed")
+		self.assertIsNone(thursday._first_shared_date(weekly, horizon))
+
+	def test_warns_on_overlapping_time_in_range(self):
+		"""Test that a range exception overlapping a weekly block warns with the shared date."""
+		self._exception(
+			date="2026-03-01", to_date="2026-03-10", exception_type="Blocked",
+			start_time="12:30:00", end_time="13:30:00"
+		).insert(ignore_permissions=True)
+
+		self.assertTrue(any("2026-03-04" in message for message in self._warnings()))
+
+	def test_no_warning_without_shared_dates(self):
+		"""Test that exceptions on other dates don't warn."""
+		self._exception(
+			date="2026-03-02", to_date="2026-03-03", exception_type="Blocked",
+			start_time="12:30:00", end_time="13:30:00"
+		).insert(ignore_permissions=True)
+
+		self.assertEqual(self._warnings(), [])
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
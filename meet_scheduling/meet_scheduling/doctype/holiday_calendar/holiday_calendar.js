@@ -0,0 +1,8 @@
+// Copyright (c) 2026, Sebastian Ortiz Valencia and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Holiday Calendar", {
+// 	refresh(frm) {
+
+// 	},
+// });
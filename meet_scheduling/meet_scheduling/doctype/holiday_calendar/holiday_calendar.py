@@ -0,0 +1,61 @@
+# Copyright (c) 2026, Sebastian Ortiz Valencia and contributors
+# For license information, please see license.txt
+
+"""
+Holiday Calendar DocType
+
+Calendario de cierres compartido (festivos, cierres de oficina) que se enlaza
+desde Calendar Resource. Sus filas se aplican como excepciones Closed sin
+copiarlas por resource.
+"""
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import getdate
+
+from meet_scheduling.meet_scheduling.scheduling.holiday_calendars import invalidate_holiday_calendar
+from meet_scheduling.meet_scheduling.scheduling.plan_cache import to_minutes
+
+
+class HolidayCalendar(Document):
+	"""
+	Holiday Calendar with validation for closures.
+
+	Validations:
+	- calendar_name required
+	- Each closure: date <= to_date (if present)
+	- Each closure: start_time < end_time (if both present)
+	"""
+
+	def validate(self) -> None:
+		"""
+		Validación antes de guardar.
+		"""
+		if not self.calendar_name:
+			frappe.throw(_("Calendar Name es requerido"))
+
+		self._validate_closures()
+
+	def on_update(self) -> None:
+		"""Invalida los cierres cacheados del calendario (tras el commit)."""
+		invalidate_holiday_calendar(self.name)
+
+	def on_trash(self) -> None:
+		"""Elimina los cierres cacheados del calendario (tras el commit)."""
+		invalidate_holiday_calendar(self.name)
+
+	def _validate_closures(self) -> None:
+		"""Valida rango de fechas y horario de cada cierre."""
+		for idx, closure in enumerate(self.closures or [], 1):
+			if not closure.date:
+				frappe.throw(_(f"Fila {idx}: Date es requerido"))
+
+			if closure.to_date and getdate(closure.to_date) < getdate(closure.date):
+				frappe.throw(_(f"Fila {idx}: To Date debe ser mayor o igual que Date"))
+
+			if bool(closure.start_time) != bool(closure.end_time):
+				frappe.throw(_(f"Fila {idx}: Start Time y End Time van juntos (vacíos cierra todo el día)"))
+
+			if closure.start_time and to_minutes(closure.start_time) >= to_minutes(closure.end_time):
+				frappe.throw(_(f"Fila {idx}: Start Time debe ser menor que End Time"))
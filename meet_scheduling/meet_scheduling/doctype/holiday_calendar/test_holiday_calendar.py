@@ -0,0 +1,86 @@
+# Copyright (c) 2026, Sebastian Ortiz Valencia and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from meet_scheduling.meet_scheduling.scheduling.availability import get_effective_availability
+from meet_scheduling.meet_scheduling.scheduling.holiday_calendars import (
+	HOLIDAY_CALENDAR_CACHE_KEY,
+	get_holiday_closures,
+)
+
+
+class TestHolidayCalendar(FrappeTestCase):
+	"""Tests for Holiday Calendar closures and their cache."""
+
+	def setUp(self):
+		"""Set up a resource linked to a Holiday Calendar with one closure."""
+		if not frappe.db.exists("Availability Plan", "Test Plan Holiday Cache"):
+			frappe.get_doc({
+				"doctype": "Availability Plan",
+				"plan_name": "Test Plan Holiday Cache",
+				"is_active": 1,
+				"availability_slots": [
+					{"weekday": day, "start_time": "09:00:00", "end_time": "17:00:00"}
+					for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+				]
+			}).insert(ignore_permissions=True)
+
+		if frappe.db.exists("Holiday Calendar", "Test Holidays Cache"):
+			frappe.delete_doc("Holiday Calendar", "Test Holidays Cache", ignore_permissions=True, force=True)
+
+		frappe.get_doc({
+			"doctype": "Holiday Calendar",
+			"calendar_name": "Test Holidays Cache",
+			"closures": [{"date": "2026-03-02", "reason": "Cierre"}]
+		}).insert(ignore_permissions=True)
+
+		if not frappe.db.exists("Calendar Resource", "Test Resource Holiday Cache"):
+			frappe.get_doc({
+				"doctype": "Calendar Resource",
+				"resource_name": "Test Resource Holiday Cache",
+				"timezone": "America/Bogota",
+				"slot_duration_minutes": 30,
+				"capacity": 1,
+				"is_active": 1,
+				"availability_plan": "Test Plan Holiday Cache",
+				"holiday_calendar": "Test Holidays Cache"
+			}).insert(ignore_permissions=True)
+
+		frappe.db.commit()
+
+	def _closure_dates(self):
+		return [str(closure["date"]) for closure in get_holiday_closures("Test Holidays Cache")]
+
+	def test_closures_apply_to_linked_resource(self):
+		"""Test that the calendar's closures close those dates for the resource."""
+		result = get_effective_availability("Test Resource Holiday Cache", "2026-03-02", "2026-03-03")
+
+		self.assertNotIn("2026-03-02", result)
+		self.assertIn("2026-03-03", result)
+
+	def test_closures_refresh_after_edit(self):
+		"""Test that an edited calendar is reloaded once the edit commits."""
+		self.assertEqual(self._closure_dates(), ["2026-03-02"])
+
+		calendar = frappe.get_doc("Holiday Calendar", "Test Holidays Cache")
+		calendar.append("closures", {"date": "2026-03-04", "reason": "Inventario"})
+		calendar.save(ignore_permissions=True)
+
+		# Hasta el commit la caché sigue con los cierres confirmados
+		self.assertIsNotNone(frappe.cache().hget(HOLIDAY_CALENDAR_CACHE_KEY, "Test Holidays Cache"))
+
+		frappe.db.commit()
+
+		self.assertIsNone(frappe.cache().hget(HOLIDAY_CALENDAR_CACHE_KEY, "Test Holidays Cache"))
+		self.assertEqual(self._closure_dates(), ["2026-03-02", "2026-03-04"])
+
+		result = get_effective_availability("Test Resource Holiday Cache", "2026-03-02", "2026-03-04")
+		self.assertEqual(sorted(result), ["2026-03-03"])
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+		frappe.delete_doc("Holiday Calendar", "Test Holidays Cache", ignore_permissions=True, force=True)
+		frappe.db.commit()
@@ -0,0 +1,26 @@
+# Copyright (c) 2026, Sebastian Ortiz Valencia and contributors
+# For license information, please see license.txt
+
+"""
+Slot Index Entry DocType
+
+Slot precalculado (inicio, fin, capacidad restante) de un Calendar Resource con
+el índice de slots activado. Se mantiene desde scheduling/slot_index.py; no se
+edita a mano.
+"""
+
+import frappe
+from frappe.model.document import Document
+
+
+class SlotIndexEntry(Document):
+	pass
+
+
+def on_doctype_update() -> None:
+	"""Índice de lectura por rango: (calendar_resource, date, slot_start)."""
+	frappe.db.add_index(
+		"Slot Index Entry",
+		["calendar_resource", "date", "slot_start"],
+		index_name="resource_date_start"
+	)
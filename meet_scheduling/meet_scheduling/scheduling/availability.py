@@ -8,32 +8,21 @@ considering:
 - Timezones
 """
 
+import json
 import frappe
 from frappe.utils import get_datetime, getdate, get_time, now_datetime
-from datetime import datetime, time, timedelta, date
-from typing import List, Dict, Union, Optional, Any
+from datetime import datetime, time, timedelta, date, tzinfo
+from typing import Collection, Iterator, List, Dict, Tuple, Union, Optional, Any
 import pytz
 
+from .intervals import Interval, from_epoch, normalize, subtract, sweep, to_epoch
+from .holiday_calendars import get_holiday_closures
+from .plan_cache import get_compiled_plan, to_minutes
+from .timezones import get_resource_timezone, local_to_epoch
 
-def _to_time(time_value: Union[time, timedelta, str]) -> time:
-	"""
-	Convierte diferentes formatos de tiempo a datetime.time.
 
-	Args:
-		time_value: puede ser time, timedelta (desde medianoche), o string
-
-	Returns:
-		datetime.time object
-	"""
-	if isinstance(time_value, time):
-		return time_value
-	elif isinstance(time_value, timedelta):
-		# timedelta representa tiempo desde medianoche
-		return (datetime.min + time_value).time()
-	elif isinstance(time_value, str):
-		return get_time(time_value)
-	else:
-		raise ValueError(f"Cannot convert {type(time_value)} to time")
+# Días por bloque al cargar contexto (excepciones, appointments) en rangos largos
+AVAILABILITY_CHUNK_DAYS = 31
 
 
 def get_availability_slots_for_day(
@@ -43,6 +32,9 @@ def get_availability_slots_for_day(
 	"""
 	Obtiene slots de disponibilidad para un día específico.
 
+	Usa el contexto de target_date: si el día está en la tabla materializada
+	"Availability Day" (ver materialized.py) lo lee de ahí; si no, lo calcula.
+
 	Args:
 		calendar_resource: nombre del Calendar Resource o doc
 		target_date: fecha (date object o string YYYY-MM-DD)
@@ -52,15 +44,270 @@ def get_availability_slots_for_day(
 			{"start": datetime, "end": datetime},
 			...
 		]
+	"""
+	# Convertir date si es string
+	if isinstance(target_date, str):
+		target_date = getdate(target_date)
 
-	Algoritmo:
-		1. Obtener availability_plan del calendar_resource
-		2. Obtener weekday del date (Monday, Tuesday, etc.)
-		3. Obtener Availability Slots para ese weekday
-		4. Convertir time slots a datetime con timezone del calendar_resource
-		5. Aplicar excepciones (Closed, Blocked, Extra Availability)
-		6. Merge intervalos adyacentes/overlapping
-		7. Retornar lista ordenada
+	if isinstance(calendar_resource, str):
+		calendar_resource = frappe.get_doc("Calendar Resource", calendar_resource)
+
+	context = _load_availability_context(calendar_resource, target_date, target_date)
+	return _compute_day_availability(context, target_date)
+
+
+def get_effective_availability(
+	calendar_resource: Union[str, Any],
+	start_date: Union[date, str],
+	end_date: Union[date, str]
+) -> Dict[str, List[Dict[str, datetime]]]:
+	"""
+	Obtiene disponibilidad efectiva para un rango de fechas.
+
+	Materializa iter_effective_availability en un dict. Para horizontes largos
+	o búsquedas que pueden terminar antes, usar el generador directamente.
+
+	Args:
+		calendar_resource: nombre del Calendar Resource o doc
+		start_date: fecha inicial
+		end_date: fecha final
+
+	Returns:
+		dict: {
+			"2026-01-15": [{"start": datetime, "end": datetime}, ...],
+			"2026-01-16": [...],
+			...
+		}
+	"""
+	return {
+		day.strftime("%Y-%m-%d"): slots
+		for day, slots in iter_effective_availability(calendar_resource, start_date, end_date)
+	}
+
+
+def iter_effective_availability(
+	calendar_resource: Union[str, Any],
+	start_date: Union[date, str],
+	end_date: Union[date, str]
+) -> Iterator[Tuple[date, List[Dict[str, datetime]]]]:
+	"""
+	Genera (date, intervalos) de forma perezosa, solo para días con disponibilidad.
+
+	Args:
+		calendar_resource: nombre del Calendar Resource o doc
+		start_date: fecha inicial
+		end_date: fecha final
+
+	Yields:
+		tuple: (date, [{"start": datetime, "end": datetime}, ...])
+	"""
+	if isinstance(calendar_resource, str):
+		calendar_resource = frappe.get_doc("Calendar Resource", calendar_resource)
+
+	tz = get_resource_timezone(calendar_resource)
+	for day, intervals in iter_effective_intervals(calendar_resource, start_date, end_date):
+		yield day, _to_dicts(intervals, tz)
+
+
+def iter_effective_intervals(
+	calendar_resource: Union[str, Any],
+	start_date: Union[date, str],
+	end_date: Union[date, str],
+	chunk_days: int = None,
+	weekdays: Optional[Collection[int]] = None
+) -> Iterator[Tuple[date, List[Interval]]]:
+	"""
+	Variante epoch de iter_effective_availability (usada por slots).
+
+	El contexto (plan compilado + días materializados + excepciones de los
+	días que faltan) se carga por bloques de chunk_days días, así un
+	consumidor que se detiene antes no paga las queries del resto del horizonte.
+
+	Con weekdays (0 = lunes) solo se calculan esos días de la semana.
+
+	Yields:
+		tuple: (date, [Interval(start_epoch, end_epoch), ...])
+	"""
+	if isinstance(calendar_resource, str):
+		calendar_resource = frappe.get_doc("Calendar Resource", calendar_resource)
+
+	for chunk_start, chunk_end in iter_date_chunks(start_date, end_date, chunk_days):
+		context = _load_availability_context(calendar_resource, chunk_start, chunk_end)
+		if not context["is_available"]:
+			return
+
+		current_date = chunk_start
+		while current_date <= chunk_end:
+			if weekdays is None or current_date.weekday() in weekdays:
+				intervals = _compute_day_intervals(context, current_date)
+				if intervals:
+					yield current_date, intervals
+			current_date += timedelta(days=1)
+
+
+def iter_date_chunks(
+	start_date: Union[date, str],
+	end_date: Union[date, str],
+	chunk_days: int = None
+) -> Iterator[Tuple[date, date]]:
+	"""
+	Divide [start_date, end_date] en bloques consecutivos de chunk_days días.
+
+	Yields:
+		tuple: (chunk_start, chunk_end), ambos inclusive
+	"""
+	if isinstance(start_date, str):
+		start_date = getdate(start_date)
+	if isinstance(end_date, str):
+		end_date = getdate(end_date)
+
+	chunk_days = chunk_days or AVAILABILITY_CHUNK_DAYS
+	chunk_start = start_date
+
+	while chunk_start <= end_date:
+		chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+		yield chunk_start, chunk_end
+		chunk_start = chunk_end + timedelta(days=1)
+
+
+def get_exceptions_in_range(
+	resource_name: str,
+	start_date: date,
+	end_date: date
+) -> List[Dict[str, Any]]:
+	"""
+	Calendar Exceptions de un resource que pueden aplicar en [start_date, end_date].
+
+	Incluye excepciones de un día, rangos (date..to_date) que se solapan con la
+	ventana y recurrencias que empiezan antes de end_date. Usa el índice
+	(calendar_resource, date, to_date).
+	"""
+	return frappe.get_all(
+		"Calendar Exception",
+		filters=[
+			["calendar_resource", "=", resource_name],
+			["date", "<=", end_date],
+		],
+		or_filters=[
+			["date", ">=", start_date],
+			["to_date", ">=", start_date],
+			["recurrence", "is", "set"],
+		],
+		fields=[
+			"name", "date", "to_date", "recurrence",
+			"exception_type", "start_time", "end_time", "reason"
+		]
+	)
+
+
+def iter_exception_dates(
+	exc: Dict[str, Any],
+	start_date: date,
+	end_date: date
+) -> Iterator[date]:
+	"""
+	Expande una excepción a las fechas en que aplica dentro de [start_date, end_date].
+
+	- Sin recurrencia: cada día de date..to_date (to_date vacío = solo date).
+	- Weekly: el mismo día de la semana que date, desde date hasta to_date (o sin fin).
+	- Yearly: el mismo día y mes que date (un 29 de febrero solo aplica en años bisiestos).
+	"""
+	first, last = get_exception_span(exc)
+	window_start = max(start_date, first)
+	window_end = min(end_date, last) if last else end_date
+
+	if window_start > window_end:
+		return
+
+	recurrence = exc.get("recurrence")
+
+	if recurrence == "Weekly":
+		current = window_start + timedelta(days=(first.weekday() - window_start.weekday()) % 7)
+		while current <= window_end:
+			yield current
+			current += timedelta(days=7)
+
+	elif recurrence == "Yearly":
+		for year in range(window_start.year, window_end.year + 1):
+			try:
+				current = first.replace(year=year)
+			except ValueError:
+				continue
+			if window_start <= current <= window_end:
+				yield current
+
+	else:
+		current = window_start
+		while current <= window_end:
+			yield current
+			current += timedelta(days=1)
+
+
+def get_exception_span(exc: Any) -> Tuple[date, Optional[date]]:
+	"""
+	Primer y último día que puede afectar una excepción.
+
+	Returns:
+		tuple: (date, to_date); to_date es None si la recurrencia no tiene fin
+	"""
+	first = getdate(exc.get("date"))
+
+	if exc.get("to_date"):
+		return first, getdate(exc.get("to_date"))
+	if exc.get("recurrence"):
+		return first, None
+	return first, first
+
+
+def _get_materialized_days(
+	resource_name: str,
+	start_date: date,
+	end_date: date
+) -> Dict[date, List[Interval]]:
+	"""
+	Intervalos precalculados de [start_date, end_date] desde "Availability Day"
+	(una query). Las fechas sin fila no están materializadas.
+	"""
+	rows = frappe.get_all(
+		"Availability Day",
+		filters={"calendar_resource": resource_name, "date": ["between", [start_date, end_date]]},
+		fields=["date", "intervals"]
+	)
+
+	return {
+		getdate(row.date): [Interval(start, end) for start, end in json.loads(row.intervals or "[]")]
+		for row in rows
+	}
+
+
+def _load_availability_context(
+	calendar_resource: Union[str, Any],
+	start_date: date,
+	end_date: date,
+	use_materialized: bool = True
+) -> Dict[str, Any]:
+	"""
+	Pre-carga todo lo necesario para calcular disponibilidad en [start_date, end_date].
+
+	Queries (una de cada una, independientemente del tamaño del rango):
+		1. Calendar Resource
+		2. Plan compilado (caché, ver plan_cache.py)
+		3. Días materializados del rango ("Availability Day"), salvo
+		   use_materialized=False (la reconstrucción de la tabla)
+		4. Calendar Exceptions de los días que faltan, agrupadas por fecha en memoria
+		5. Cierres del Holiday Calendar (caché compartida por calendario)
+
+	Si todos los días están materializados, no se consultan excepciones.
+
+	Returns:
+		dict: {
+			"resource_name": str,
+			"is_available": bool,   # False si el resource/plan no permite disponibilidad
+			"plan": dict | None,
+			"tz": tzinfo,
+			"materialized": {date: [Interval, ...]},
+			"exceptions_by_date": {date: [exception, ...]}
+		}
 	"""
 	# Si es string, convertir a nombre
 	if isinstance(calendar_resource, str):
@@ -70,13 +317,18 @@ def get_availability_slots_for_day(
 		resource_name = calendar_resource.name
 		resource = calendar_resource
 
-	# Convertir date si es string
-	if isinstance(target_date, str):
-		target_date = getdate(target_date)
+	context = {
+		"resource_name": resource_name,
+		"is_available": False,
+		"plan": None,
+		"tz": pytz.UTC,
+		"materialized": {},
+		"exceptions_by_date": {},
+	}
 
 	# Verificar que esté activo
 	if not resource.is_active:
-		return []
+		return context
 
 	# Obtener availability plan
 	if not resource.availability_plan:
@@ -84,219 +336,185 @@ def get_availability_slots_for_day(
 			f"Calendar Resource {resource_name} no tiene Availability Plan asignado",
 			"Get Availability Slots"
 		)
-		return []
+		return context
 
-	plan = frappe.get_doc("Availability Plan", resource.availability_plan)
+	plan = get_compiled_plan(resource.availability_plan)
 
-	if not plan.is_active:
-		return []
-
-	# Verificar vigencia del plan
-	if plan.valid_from and target_date < getdate(plan.valid_from):
-		return []
-	if plan.valid_to and target_date > getdate(plan.valid_to):
-		return []
-
-	# Obtener día de la semana (Monday, Tuesday, etc.)
-	weekday_name = target_date.strftime("%A")
+	if not plan or not plan["is_active"]:
+		return context
 
 	# Obtener timezone del resource
-	tz_name = resource.timezone or "UTC"
-	if tz_name == "system timezone":
-		tz_name = frappe.utils.get_system_timezone()
-
-	try:
-		tz = pytz.timezone(tz_name)
-	except Exception:
-		tz = pytz.UTC
-		frappe.log_error(
-			f"Invalid timezone '{tz_name}' for {resource_name}, usando UTC",
-			"Get Availability Slots"
-		)
-
-	# Obtener slots del plan para este día
-	base_intervals = []
+	tz = get_resource_timezone(resource)
+
+	# Días ya materializados: se leen tal cual, solo se calculan los que faltan
+	materialized = _get_materialized_days(resource_name, start_date, end_date) if use_materialized else {}
+	missing = [
+		start_date + timedelta(days=offset)
+		for offset in range((end_date - start_date).days + 1)
+		if start_date + timedelta(days=offset) not in materialized
+	]
+
+	exceptions_by_date = {}
+	if missing:
+		# Excepciones que tocan los días faltantes (1 sola query), expandidas
+		# por fecha solo dentro de esa ventana
+		first_missing, last_missing = missing[0], missing[-1]
+		exceptions = get_exceptions_in_range(resource_name, first_missing, last_missing)
+
+		# Cierres del Holiday Calendar compartido (caché por calendario, sin query por resource)
+		exceptions += get_holiday_closures(resource.holiday_calendar)
+
+		for exc in exceptions:
+			for exception_date in iter_exception_dates(exc, first_missing, last_missing):
+				exceptions_by_date.setdefault(exception_date, []).append(exc)
+
+	context.update({
+		"is_available": True,
+		"plan": plan,
+		"tz": tz,
+		"materialized": materialized,
+		"exceptions_by_date": exceptions_by_date,
+	})
+
+	return context
+
+
+def _compute_day_availability(
+	context: Dict[str, Any],
+	target_date: date
+) -> List[Dict[str, datetime]]:
+	"""
+	Calcula la disponibilidad de un día desde un contexto pre-cargado (sin queries)
+	y la convierte a dicts con datetimes aware (formato de la API).
+	"""
+	return _to_dicts(_compute_day_intervals(context, target_date), context["tz"])
 
-	# Buscar en child table 'availability_slots'
-	if hasattr(plan, 'availability_slots'):
-		slots = plan.availability_slots
-	elif hasattr(plan, 'slots'):
-		# Backward compatibility por si alguien usó 'slots'
-		slots = plan.slots
-	else:
-		# Fallback: buscar directamente en la tabla hija
-		slots = frappe.get_all(
-			"Availability Slot",
-			filters={"parent": plan.name, "parenttype": "Availability Plan"},
-			fields=["weekday", "start_time", "end_time"]
-		)
 
-	for slot in slots:
-		# Verificar si es el día correcto
-		slot_day = slot.get("weekday") if isinstance(slot, dict) else slot.weekday
+def _compute_day_intervals(
+	context: Dict[str, Any],
+	target_date: date
+) -> List[Interval]:
+	"""
+	Calcula los intervalos epoch disponibles de un día desde un contexto pre-cargado.
 
-		if slot_day == weekday_name:
-			start_time = slot.get("start_time") if isinstance(slot, dict) else slot.start_time
-			end_time = slot.get("end_time") if isinstance(slot, dict) else slot.end_time
+	Algoritmo:
+		0. Si el día está materializado, retornar sus intervalos
+		1. Verificar vigencia del plan
+		2. Obtener las franjas compiladas para el weekday del date
+		3. Convertir minutos a epoch con timezone del calendar_resource
+		4. Aplicar excepciones (Closed, Blocked, Extra Availability)
+		5. Retornar conjunto normalizado (ordenado y sin solapamientos)
+	"""
+	if not context["is_available"]:
+		return []
 
-			# Convertir a time object (puede venir como timedelta o string)
-			start_time = _to_time(start_time)
-			end_time = _to_time(end_time)
+	materialized = context["materialized"].get(target_date)
+	if materialized is not None:
+		return materialized
 
-			# Convertir time a datetime con la fecha target y timezone
-			start_dt = datetime.combine(target_date, start_time)
-			end_dt = datetime.combine(target_date, end_time)
+	plan = context["plan"]
+	tz = context["tz"]
 
-			# Localizar a timezone
-			start_dt = tz.localize(start_dt) if start_dt.tzinfo is None else start_dt
-			end_dt = tz.localize(end_dt) if end_dt.tzinfo is None else end_dt
+	# Verificar vigencia del plan
+	if plan["valid_from"] and target_date < plan["valid_from"]:
+		return []
+	if plan["valid_to"] and target_date > plan["valid_to"]:
+		return []
 
-			base_intervals.append({"start": start_dt, "end": end_dt})
+	# Obtener franjas compiladas del plan para este día de la semana
+	base_intervals = [
+		Interval(
+			local_to_epoch(target_date, start_minute, tz),
+			local_to_epoch(target_date, end_minute, tz)
+		)
+		for start_minute, end_minute, _capacity in plan["weekdays"][target_date.weekday()]
+	]
 
 	# Si no hay slots para este día, retornar vacío
 	if not base_intervals:
 		return []
 
-	# Aplicar excepciones
-	final_intervals = _apply_exceptions(base_intervals, resource_name, target_date, tz)
-
-	# Merge intervalos adyacentes/overlapping
-	final_intervals = _merge_intervals(final_intervals)
+	# Aplicar excepciones y normalizar (merge de adyacentes/overlapping)
+	exceptions = context["exceptions_by_date"].get(target_date, [])
+	return _apply_exceptions(base_intervals, exceptions, target_date, tz)
 
-	# Ordenar por start time
-	final_intervals.sort(key=lambda x: x["start"])
 
-	return final_intervals
-
-
-def get_effective_availability(
-	calendar_resource: str,
-	start_date: Union[date, str],
-	end_date: Union[date, str]
-) -> Dict[str, List[Dict[str, datetime]]]:
-	"""
-	Obtiene disponibilidad efectiva para un rango de fechas.
-
-	Args:
-		calendar_resource: nombre del Calendar Resource
-		start_date: fecha inicial
-		end_date: fecha final
-
-	Returns:
-		dict: {
-			"2026-01-15": [{"start": datetime, "end": datetime}, ...],
-			"2026-01-16": [...],
-			...
-		}
-	"""
-	# Convertir a date objects
-	if isinstance(start_date, str):
-		start_date = getdate(start_date)
-	if isinstance(end_date, str):
-		end_date = getdate(end_date)
-
-	result = {}
-	current_date = start_date
-
-	while current_date <= end_date:
-		slots = get_availability_slots_for_day(calendar_resource, current_date)
-		if slots:
-			result[current_date.strftime("%Y-%m-%d")] = slots
-		current_date += timedelta(days=1)
-
-	return result
+def _to_dicts(intervals: List[Interval], tz: tzinfo) -> List[Dict[str, datetime]]:
+	"""Convierte intervalos epoch a dicts {"start", "end"} con datetimes aware."""
+	return [
+		{"start": from_epoch(start, tz), "end": from_epoch(end, tz)}
+		for start, end in intervals
+	]
 
 
 def _apply_exceptions(
-	intervals: List[Dict[str, datetime]],
-	calendar_resource: str,
+	intervals: List[Interval],
+	exceptions: List[Dict[str, Any]],
 	target_date: date,
-	tz: pytz.tzinfo.BaseTzInfo
-) -> List[Dict[str, datetime]]:
+	tz: tzinfo
+) -> List[Interval]:
 	"""
-	Aplica excepciones (Closed/Blocked/Extra) a intervalos base.
+	Aplica excepciones (Closed/Blocked/Extra) a intervalos base en una sola
+	pasada de sweep-line (intervals.sweep).
+
+	Reglas (independientes del orden en que llegan las excepciones):
+	- Closed sin horario: cierra todo el día (gana sobre Extra Availability).
+	- Closed/Blocked con horario: bloquea el rango, también sobre Extra Availability.
+	- Extra Availability: abre el rango aunque no esté en el plan.
 
 	Args:
-		intervals: lista de intervalos base del plan
-		calendar_resource: nombre del resource
+		intervals: intervalos base del plan
+		exceptions: excepciones pre-cargadas del resource para target_date
 		target_date: fecha objetivo
 		tz: timezone object
 
 	Returns:
-		list: intervalos después de aplicar excepciones
+		list: conjunto normalizado después de aplicar excepciones
 	"""
-	# Obtener excepciones para esta fecha y resource
-	exceptions = frappe.get_all(
-		"Calendar Exception",
-		filters={
-			"calendar_resource": calendar_resource,
-			"date": target_date
-		},
-		fields=["name", "exception_type", "start_time", "end_time", "reason"]
-	)
-
 	if not exceptions:
-		return intervals
+		return normalize(intervals)
+
+	extra = []
+	blocks = []
+	close_all = False
 
-	# Procesar cada excepción
 	for exc in exceptions:
 		exception_type = exc.get("exception_type")
-
-		if exception_type == "Closed":
-			# Closed: elimina disponibilidad
-			if exc.get("start_time") and exc.get("end_time"):
-				# Closed parcial (solo un rango)
-				closed_start_time = _to_time(exc.get("start_time"))
-				closed_end_time = _to_time(exc.get("end_time"))
-				closed_start = datetime.combine(target_date, closed_start_time)
-				closed_end = datetime.combine(target_date, closed_end_time)
-				closed_start = tz.localize(closed_start) if closed_start.tzinfo is None else closed_start
-				closed_end = tz.localize(closed_end) if closed_end.tzinfo is None else closed_end
-
-				# Restar este rango de todos los intervalos
-				new_intervals = []
-				for interval in intervals:
-					result = _interval_subtract(interval, {"start": closed_start, "end": closed_end})
-					new_intervals.extend(result)
-				intervals = new_intervals
-			else:
-				# Closed todo el día
-				intervals = []
-
-		elif exception_type == "Blocked":
-			# Blocked: similar a closed parcial
-			if exc.get("start_time") and exc.get("end_time"):
-				blocked_start_time = _to_time(exc.get("start_time"))
-				blocked_end_time = _to_time(exc.get("end_time"))
-				blocked_start = datetime.combine(target_date, blocked_start_time)
-				blocked_end = datetime.combine(target_date, blocked_end_time)
-				blocked_start = tz.localize(blocked_start) if blocked_start.tzinfo is None else blocked_start
-				blocked_end = tz.localize(blocked_end) if blocked_end.tzinfo is None else blocked_end
-
-				new_intervals = []
-				for interval in intervals:
-					result = _interval_subtract(interval, {"start": blocked_start, "end": blocked_end})
-					new_intervals.extend(result)
-				intervals = new_intervals
-
+		exc_range = _exception_interval(exc, target_date, tz)
+
+		if exception_type == "Closed" and exc_range is None:
+			close_all = True
+		elif exc_range is None:
+			# Sin horario: solo tiene efecto en Closed
+			continue
+		elif exception_type in ("Closed", "Blocked"):
+			blocks.append(exc_range)
 		elif exception_type == "Extra Availability":
-			# Extra: agrega disponibilidad adicional
-			if exc.get("start_time") and exc.get("end_time"):
-				extra_start_time = _to_time(exc.get("start_time"))
-				extra_end_time = _to_time(exc.get("end_time"))
-				extra_start = datetime.combine(target_date, extra_start_time)
-				extra_end = datetime.combine(target_date, extra_end_time)
-				extra_start = tz.localize(extra_start) if extra_start.tzinfo is None else extra_start
-				extra_end = tz.localize(extra_end) if extra_end.tzinfo is None else extra_end
+			extra.append(exc_range)
+
+	return sweep(intervals, extra, blocks, close_all)
 
-				intervals.append({"start": extra_start, "end": extra_end})
 
-	return intervals
+def _exception_interval(
+	exc: Dict[str, Any],
+	target_date: date,
+	tz: tzinfo
+) -> Optional[Interval]:
+	"""Convierte el rango horario de una excepción a Interval epoch (None si no tiene)."""
+	if not exc.get("start_time") or not exc.get("end_time"):
+		return None
+
+	return Interval(
+		local_to_epoch(target_date, to_minutes(exc.get("start_time")), tz),
+		local_to_epoch(target_date, to_minutes(exc.get("end_time")), tz)
+	)
 
 
 def _merge_intervals(intervals: List[Dict[str, datetime]]) -> List[Dict[str, datetime]]:
 	"""
-	Une intervalos adyacentes o overlapping.
+	Une intervalos dict adyacentes o overlapping.
+
+	Adaptador dict -> engine de intervalos (intervals.normalize).
 
 	Args:
 		intervals: lista de intervalos {"start": datetime, "end": datetime}
@@ -307,24 +525,12 @@ def _merge_intervals(intervals: List[Dict[str, datetime]]) -> List[Dict[str, dat
 	if not intervals:
 		return []
 
-	# Ordenar por start time
-	intervals.sort(key=lambda x: x["start"])
-
-	merged = [intervals[0]]
-
-	for current in intervals[1:]:
-		last_merged = merged[-1]
-
-		# Si current se solapa o es adyacente a last_merged, merge
-		if current["start"] <= last_merged["end"]:
-			# Extend el end si es mayor
-			if current["end"] > last_merged["end"]:
-				last_merged["end"] = current["end"]
-		else:
-			# No hay overlap, agregar como nuevo intervalo
-			merged.append(current)
-
-	return merged
+	tz = intervals[0]["start"].tzinfo
+	merged = normalize(
+		Interval(to_epoch(interval["start"]), to_epoch(interval["end"]))
+		for interval in intervals
+	)
+	return _to_dicts(merged, tz)
 
 
 def _interval_subtract(
@@ -334,6 +540,8 @@ def _interval_subtract(
 	"""
 	Resta un bloqueo de un intervalo.
 
+	Adaptador dict -> engine de intervalos (intervals.subtract).
+
 	Args:
 		interval: {"start": datetime, "end": datetime} - intervalo original
 		block: {"start": datetime, "end": datetime} - bloqueo a restar
@@ -341,37 +549,8 @@ def _interval_subtract(
 	Returns:
 		list: lista de intervalos resultantes (puede ser 0, 1 o 2 intervalos)
 	"""
-	# Casos:
-	# 1. Block no se solapa con interval -> retornar interval original
-	# 2. Block cubre completamente interval -> retornar []
-	# 3. Block cubre parte inicial -> retornar [parte final]
-	# 4. Block cubre parte final -> retornar [parte inicial]
-	# 5. Block está en medio -> retornar [parte inicial, parte final]
-
-	# Verificar si hay overlap
-	if block["end"] <= interval["start"] or block["start"] >= interval["end"]:
-		# No hay overlap
-		return [interval]
-
-	# Verificar si block cubre completamente interval
-	if block["start"] <= interval["start"] and block["end"] >= interval["end"]:
-		# Block cubre todo
-		return []
-
-	# Block cubre parte inicial
-	if block["start"] <= interval["start"] and block["end"] < interval["end"]:
-		return [{"start": block["end"], "end": interval["end"]}]
-
-	# Block cubre parte final
-	if block["start"] > interval["start"] and block["end"] >= interval["end"]:
-		return [{"start": interval["start"], "end": block["start"]}]
-
-	# Block está en medio (split en dos)
-	if block["start"] > interval["start"] and block["end"] < interval["end"]:
-		return [
-			{"start": interval["start"], "end": block["start"]},
-			{"start": block["end"], "end": interval["end"]}
-		]
-
-	# Fallback (no debería llegar aquí)
-	return [interval]
+	result = subtract(
+		[Interval(to_epoch(interval["start"]), to_epoch(interval["end"]))],
+		[Interval(to_epoch(block["start"]), to_epoch(block["end"]))]
+	)
+	return _to_dicts(result, interval["start"].tzinfo)
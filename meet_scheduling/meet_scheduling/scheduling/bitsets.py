@@ -0,0 +1,280 @@
+"""
+Availability Bitsets
+
+Representación de la disponibilidad de un día como bitset (int de Python):
+el bit i representa la celda [i * 15min, (i + 1) * 15min) en hora local del
+resource, 96 bits por día.
+
+- available: celda completamente dentro de la disponibilidad efectiva.
+- booked: celda disponible con menos asientos libres que el mínimo pedido
+  (mínimo del CapacityTimeline en la celda: capacity por franja del plan,
+  fallback a la del resource, menos citas simultáneas).
+- free = available & ~booked
+
+Con esto las consultas típicas son operaciones de bits:
+- "¿está libre este slot?"           → free & mask == mask
+- "¿cuántos slots libres hay?"       → popcount tras un AND de desplazamientos
+- "tiempo libre común de N resources" → AND de sus bitsets
+
+Un día solo se representa si da exactamente los mismos slots que el cálculo
+por epochs (slots.py): celdas de 15 min reales (sin cambio DST ese día) e
+intervalos disponibles con bordes en la grilla. Como los asientos libres de
+un slot son el mínimo sobre sus celdas, "slot libre" coincide con "todas sus
+celdas libres". build_day_bitset retorna None si no se cumple y el llamador
+usa el cálculo exacto. generate_availability_summary lo usa como camino
+rápido para contar slots libres por día.
+
+Los bitsets se serializan a hex (to_payload / from_payload) para poder
+cachearlos.
+"""
+
+from datetime import date, datetime, tzinfo
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .capacity import CapacityTimeline
+from .intervals import Interval, from_epoch
+from .timezones import local_to_epoch
+
+
+BITSET_GRANULARITY_MINUTES = 15
+BITS_PER_DAY = 24 * 60 // BITSET_GRANULARITY_MINUTES
+FULL_DAY = (1 << BITS_PER_DAY) - 1
+
+_CELL_SECONDS = BITSET_GRANULARITY_MINUTES * 60
+
+
+class DayBitset(NamedTuple):
+	"""Bitsets de un resource para un día."""
+
+	date: date
+	available: int
+	booked: int
+
+	@property
+	def free(self) -> int:
+		"""Celdas disponibles y con capacidad (available ANDNOT booked)."""
+		return self.available & ~self.booked
+
+
+class SlotCounts(NamedTuple):
+	"""Slots de un día: totales, libres e inicio epoch del primero libre (None si no hay)."""
+
+	total: int
+	free: int
+	first_free: Optional[int]
+
+
+def supports_bitsets(slot_seconds: int, step_seconds: int) -> bool:
+	"""True si slots back-to-back de slot_seconds caen exactamente en la grilla de celdas."""
+	return step_seconds == slot_seconds and slot_seconds % _CELL_SECONDS == 0
+
+
+def build_day_bitset(
+	target_date: date,
+	intervals: List[Interval],
+	timeline: CapacityTimeline,
+	tz: tzinfo,
+	min_free: int = 1
+) -> Optional[DayBitset]:
+	"""
+	DayBitset de un día a partir de sus intervalos efectivos y el timeline de capacidad.
+
+	Args:
+		target_date: fecha (en hora local de tz)
+		intervals: conjunto normalizado de intervalos epoch del día
+		timeline: CapacityTimeline que cubre el día
+		tz: timezone del resource
+		min_free: asientos libres mínimos para que una celda no cuente como booked
+
+	Returns:
+		DayBitset, o None si el día no cae en la grilla (cambio DST, bordes
+		de intervalo fuera de la grilla o intervalos que salen del día)
+	"""
+	boundaries = _cell_boundaries(target_date, tz)
+	day_start, day_end = boundaries[0], boundaries[-1]
+
+	if day_end - day_start != BITS_PER_DAY * _CELL_SECONDS:
+		return None
+	for interval_start, interval_end in intervals:
+		if interval_start < day_start or interval_end > day_end:
+			return None
+		if (interval_start - day_start) % _CELL_SECONDS or (interval_end - day_start) % _CELL_SECONDS:
+			return None
+
+	available = intervals_to_bits(intervals, target_date, tz)
+	return DayBitset(target_date, available, capacity_to_bits(timeline, boundaries, available, min_free))
+
+
+def intervals_to_bits(intervals: List[Interval], target_date: date, tz: tzinfo) -> int:
+	"""
+	Marca las celdas del día contenidas por completo en algún intervalo.
+
+	Args:
+		intervals: conjunto normalizado de intervalos epoch
+		target_date: fecha (en hora local de tz)
+		tz: timezone del resource
+	"""
+	bits = 0
+	j = 0
+	boundaries = _cell_boundaries(target_date, tz)
+
+	for i in range(BITS_PER_DAY):
+		cell_start, cell_end = boundaries[i], boundaries[i + 1]
+		if cell_start >= cell_end:
+			# Celda inexistente (hueco DST)
+			continue
+
+		while j < len(intervals) and intervals[j].end <= cell_start:
+			j += 1
+		if j == len(intervals):
+			break
+
+		if intervals[j].start <= cell_start and cell_end <= intervals[j].end:
+			bits |= 1 << i
+
+	return bits
+
+
+def capacity_to_bits(
+	timeline: CapacityTimeline,
+	boundaries: List[int],
+	available: int,
+	min_free: int = 1
+) -> int:
+	"""
+	Marca las celdas disponibles con menos de min_free asientos libres.
+
+	Cada celda es un range-min O(1) del timeline: una cita que toca parte de
+	la celda solo la llena si ahí no quedan asientos.
+	"""
+	bits = 0
+	for run_start, run_end in _iter_runs(available):
+		for cell in range(run_start, run_end):
+			if timeline.free_seats(boundaries[cell], boundaries[cell + 1]) < min_free:
+				bits |= 1 << cell
+	return bits
+
+
+def slot_mask(start_minute: int, duration_minutes: int) -> int:
+	"""Máscara de las celdas que cubre un slot [start_minute, start_minute + duration)."""
+	first = start_minute // BITSET_GRANULARITY_MINUTES
+	last = -(-(start_minute + duration_minutes) // BITSET_GRANULARITY_MINUTES)
+	return ((1 << (last - first)) - 1) << first
+
+
+def is_slot_free(free_bits: int, start_minute: int, duration_minutes: int) -> bool:
+	"""True si todas las celdas del slot están libres."""
+	mask = slot_mask(start_minute, duration_minutes)
+	return free_bits & mask == mask
+
+
+def count_slots(day_bitset: DayBitset, slot_minutes: int, tz: tzinfo) -> SlotCounts:
+	"""
+	Cuenta los slots de slot_minutes del día, igual que slots.py: back-to-back
+	desde el inicio de cada intervalo disponible (cada tramo de celdas
+	available), descartando el resto que no entra completo.
+
+	Un slot es libre si todas sus celdas están en free.
+	"""
+	cells = slot_minutes // BITSET_GRANULARITY_MINUTES
+	free_bits = day_bitset.free
+
+	# Bit p queda en 1 solo si las celdas p .. p + cells - 1 están libres
+	fits = free_bits
+	for shift in range(1, cells):
+		fits &= free_bits >> shift
+
+	total = free = 0
+	first_cell = None
+
+	for run_start, run_end in _iter_runs(day_bitset.available):
+		slot_count = (run_end - run_start) // cells
+		if not slot_count:
+			continue
+
+		total += slot_count
+		free_starts = (fits >> run_start) & _aligned_mask(cells, slot_count)
+		free += free_starts.bit_count()
+		if first_cell is None and free_starts:
+			first_cell = run_start + (free_starts & -free_starts).bit_length() - 1
+
+	first_free = (
+		local_to_epoch(day_bitset.date, first_cell * BITSET_GRANULARITY_MINUTES, tz)
+		if first_cell is not None else None
+	)
+	return SlotCounts(total, free, first_free)
+
+
+def common_free_bits(bitsets: Iterable[int]) -> int:
+	"""Tiempo libre común de varios resources (AND de sus bitsets free)."""
+	result = FULL_DAY
+	for bits in bitsets:
+		result &= bits
+	return result
+
+
+def bits_to_intervals(bits: int, target_date: date, tz: tzinfo) -> List[Dict[str, datetime]]:
+	"""Convierte un bitset a intervalos {"start", "end"} aware (celdas contiguas unidas)."""
+	boundaries = _cell_boundaries(target_date, tz)
+	return [
+		{
+			"start": from_epoch(boundaries[run_start], tz),
+			"end": from_epoch(boundaries[run_end], tz)
+		}
+		for run_start, run_end in _iter_runs(bits)
+	]
+
+
+def to_payload(day_bitset: DayBitset) -> Dict[str, str]:
+	"""Serializa un DayBitset (hex, seguro para JSON y Redis)."""
+	return {
+		"date": day_bitset.date.isoformat(),
+		"available": format(day_bitset.available, "x"),
+		"booked": format(day_bitset.booked, "x"),
+	}
+
+
+def from_payload(payload: Dict[str, str]) -> DayBitset:
+	"""Inverso de to_payload."""
+	return DayBitset(
+		date.fromisoformat(payload["date"]),
+		int(payload["available"], 16),
+		int(payload["booked"], 16)
+	)
+
+
+def _cell_boundaries(target_date: date, tz: tzinfo) -> List[int]:
+	"""
+	Epochs de los BITS_PER_DAY + 1 bordes de celda del día (hora local).
+
+	Se fuerza que sean no decrecientes: las celdas dentro de un hueco DST quedan
+	vacías (se descartan) y en una hora repetida la última celda antes del
+	cambio absorbe la repetición.
+	"""
+	boundaries = [
+		local_to_epoch(target_date, i * BITSET_GRANULARITY_MINUTES, tz)
+		for i in range(BITS_PER_DAY + 1)
+	]
+	for i in range(BITS_PER_DAY - 1, -1, -1):
+		if boundaries[i] > boundaries[i + 1]:
+			boundaries[i] = boundaries[i + 1]
+	return boundaries
+
+
+def _iter_runs(bits: int) -> Iterator[Tuple[int, int]]:
+	"""Tramos [inicio, fin) de bits consecutivos en 1, en orden."""
+	position = 0
+	while bits:
+		# Saltar los ceros hasta el próximo 1 y luego medir el tramo de unos
+		zeros = (bits & -bits).bit_length() - 1
+		bits >>= zeros
+		position += zeros
+		ones = (~bits & (bits + 1)).bit_length() - 1
+		yield position, position + ones
+		bits >>= ones
+		position += ones
+
+
+def _aligned_mask(cells: int, count: int) -> int:
+	"""Bits en las posiciones 0, cells, 2 * cells, ... (count posiciones)."""
+	return ((1 << (cells * count)) - 1) // ((1 << cells) - 1)
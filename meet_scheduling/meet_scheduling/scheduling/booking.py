@@ -0,0 +1,84 @@
+"""
+Booking Service
+
+Reserva de citas serializada por Calendar Resource.
+
+check_overlap valida capacidad leyendo las citas existentes, así que dos
+reservas simultáneas del mismo horario pueden pasar ambas el chequeo antes de
+que cualquiera haga commit. book_appointment toma primero un lock de fila
+sobre el Calendar Resource (SELECT ... FOR UPDATE): las reservas de un mismo
+resource esperan su turno y las de resources distintos bloquean filas
+distintas, así que siguen en paralelo. El lock lo libera el commit (o el
+rollback si la reserva falla); no hay nada que soltar a mano.
+"""
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from typing import Optional
+
+
+def lock_calendar_resource(calendar_resource: str) -> None:
+	"""
+	Toma el lock de reservas de un Calendar Resource hasta el fin de la transacción.
+
+	Hace commit antes de bloquear: con REPEATABLE READ la transacción lee de
+	un snapshot tomado en su primera lectura, y un snapshot previo al lock no
+	vería las citas que otra reserva commiteó mientras esperábamos. Así las
+	lecturas posteriores (check_overlap) arrancan un snapshot nuevo.
+
+	Raises:
+		frappe.ValidationError: si no se obtuvo el lock a tiempo
+	"""
+	frappe.db.commit()
+
+	try:
+		frappe.db.get_value("Calendar Resource", calendar_resource, "name", for_update=True)
+	except (frappe.QueryTimeoutError, frappe.QueryDeadlockError):
+		frappe.throw(
+			_("El calendario está procesando otras reservas. Intente de nuevo en unos segundos."),
+			frappe.ValidationError
+		)
+
+
+def book_appointment(
+	calendar_resource: str,
+	user_contact: Optional[str],
+	start_datetime: str,
+	end_datetime: str,
+	appointment_context: Optional[str] = None
+) -> Document:
+	"""
+	Crea y confirma un Appointment bajo el lock del Calendar Resource.
+
+	La capacidad la validan Appointment.validate y on_submit (check_overlap)
+	ya dentro del lock. Hace commit al terminar, lo que libera el lock.
+
+	Args:
+		calendar_resource: nombre del Calendar Resource
+		user_contact: nombre del User contact
+		start_datetime: inicio (YYYY-MM-DD HH:MM:SS, hora local del resource)
+		end_datetime: fin
+		appointment_context: contexto adicional (ya sanitizado)
+
+	Returns:
+		Document: Appointment confirmado
+	"""
+	lock_calendar_resource(calendar_resource)
+
+	appointment = frappe.get_doc({
+		"doctype": "Appointment",
+		"calendar_resource": calendar_resource,
+		"user_contact": user_contact,
+		"start_datetime": start_datetime,
+		"end_datetime": end_datetime,
+		"status": "Draft",
+		"appointment_context": appointment_context or ""
+	})
+
+	appointment.insert(ignore_permissions=True)
+	appointment.submit()
+
+	frappe.db.commit()
+
+	return appointment
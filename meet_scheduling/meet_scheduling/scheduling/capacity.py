@@ -0,0 +1,239 @@
+"""
+Capacity Timeline
+
+Asientos de un Calendar Resource como función escalonada sobre epochs:
+
+- seats: capacidad vigente en cada instante. Dentro de una franja del plan es
+  la capacity del Availability Slot (0 = la del Calendar Resource); si varias
+  franjas se solapan, la mayor. Fuera de las franjas (Extra Availability, días
+  sin plan) vale la capacity del resource.
+- booked: citas activas simultáneas en cada instante.
+- free = seats - booked.
+
+"Asientos libres en [a, b)" es el mínimo de free en el rango: una consulta
+O(1) sobre una sparse table que se arma una vez por timeline. La usan
+slots.py (capacidad restante de cada slot) y overlap.py (check_overlap).
+"""
+
+import frappe
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from datetime import date, timedelta, tzinfo
+from frappe.utils import now_datetime, get_datetime, getdate
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .intervals import Interval
+from .plan_cache import get_compiled_plan
+from .timezones import get_resource_timezone, local_to_epoch, wall_to_epoch
+
+
+# (inicio epoch, fin epoch, asientos)
+SeatSegment = Tuple[int, int, int]
+
+
+class CapacityTimeline:
+	"""
+	Asientos libres de un resource como función escalonada.
+
+	times son los bordes ordenados de franjas y citas; free[i] es el valor en
+	[times[i], times[i + 1]) y, antes de times[0] o desde times[-1], valen
+	default_seats. free puede ser negativo si hay sobreventa.
+	"""
+
+	__slots__ = ("times", "free", "default_seats", "_table")
+
+	def __init__(
+		self,
+		seat_segments: Iterable[SeatSegment],
+		bookings: Iterable[Interval],
+		default_seats: int
+	):
+		seat_events: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+		for start, end, seats in seat_segments:
+			if end > start:
+				seat_events[start].append((1, seats))
+				seat_events[end].append((-1, seats))
+
+		booked_delta: Dict[int, int] = defaultdict(int)
+		for start, end in bookings:
+			if end > start:
+				booked_delta[start] += 1
+				booked_delta[end] -= 1
+
+		self.times = sorted(set(seat_events) | set(booked_delta))
+		self.default_seats = default_seats
+
+		# Barrido: franjas activas (multiconjunto de capacidades) y citas activas
+		active: Counter = Counter()
+		booked = 0
+		free: List[int] = []
+		for time in self.times:
+			for sign, seats in seat_events.get(time, ()):
+				active[seats] += sign
+				if not active[seats]:
+					del active[seats]
+			booked += booked_delta.get(time, 0)
+			free.append((max(active) if active else default_seats) - booked)
+
+		self.free = free
+		self._table = _build_sparse_table(free)
+
+	def free_seats(self, start: int, end: int) -> int:
+		"""Mínimo de asientos libres en [start, end)."""
+		times = self.times
+		first = bisect_right(times, start) - 1
+		last = bisect_left(times, end) - 1
+
+		# [start, times[0]) no tiene franjas ni citas
+		result = self.default_seats if first < 0 else None
+		first = max(first, 0)
+
+		if last >= first:
+			level = (last - first + 1).bit_length() - 1
+			row = self._table[level]
+			segment_min = min(row[first], row[last - (1 << level) + 1])
+			result = segment_min if result is None else min(result, segment_min)
+
+		return self.default_seats if result is None else result
+
+
+def build_capacity_timeline(
+	calendar_resource: Any,
+	start_date: date,
+	end_date: date,
+	bookings: Iterable[Interval]
+) -> CapacityTimeline:
+	"""
+	Arma el timeline de [start_date, end_date] desde el plan compilado (caché,
+	sin queries) y las citas ya cargadas.
+
+	Args:
+		calendar_resource: doc del Calendar Resource
+		start_date: fecha inicial (hora local del resource)
+		end_date: fecha final (inclusive)
+		bookings: intervalos epoch de las citas activas
+	"""
+	fallback = calendar_resource.capacity or 1
+	plan = get_compiled_plan(calendar_resource.availability_plan) if calendar_resource.availability_plan else None
+	tz = get_resource_timezone(calendar_resource)
+
+	segments: List[SeatSegment] = []
+	if plan and plan["is_active"]:
+		current_date = start_date
+		while current_date <= end_date:
+			segments.extend(_day_seat_segments(plan, current_date, tz, fallback))
+			current_date += timedelta(days=1)
+
+	return CapacityTimeline(segments, bookings, fallback)
+
+
+def get_max_seats(calendar_resource: Any) -> int:
+	"""Mayor capacidad que puede tener un instante del resource (plan o fallback)."""
+	fallback = calendar_resource.capacity or 1
+	plan = get_compiled_plan(calendar_resource.availability_plan) if calendar_resource.availability_plan else None
+	if not plan:
+		return fallback
+
+	return max(
+		[fallback] + [capacity for day in plan["weekdays"] for _start, _end, capacity in day]
+	)
+
+
+def get_active_bookings(
+	calendar_resource: str,
+	start_date: Union[date, str],
+	end_date: Union[date, str],
+	tz: tzinfo,
+	exclude_appointment: Optional[str] = None
+) -> List[Interval]:
+	"""
+	Pre-carga todos los appointments activos del rango con una sola query.
+
+	Activos = Draft no expirados + Confirmed. exclude_appointment deja afuera
+	una cita (ej. una que se está borrando).
+
+	Los datetimes de Appointment se guardan naive en la hora local del
+	Calendar Resource, así que se localizan con tz antes de pasarlos a epoch.
+	"""
+	if isinstance(start_date, str):
+		start_date = getdate(start_date)
+	if isinstance(end_date, str):
+		end_date = getdate(end_date)
+
+	# Rango ampliado: incluye un margen para citas que cruzan medianoche
+	range_start = f"{start_date} 00:00:00"
+	range_end = f"{end_date} 23:59:59"
+
+	filters = {
+		"calendar_resource": calendar_resource,
+		"status": ["in", ["Draft", "Confirmed"]],
+		"start_datetime": ["<=", range_end],
+		"end_datetime": [">=", range_start],
+	}
+	if exclude_appointment:
+		filters["name"] = ["!=", exclude_appointment]
+
+	appointments = frappe.get_all(
+		"Appointment",
+		filters=filters,
+		fields=["name", "status", "draft_expires_at", "start_datetime", "end_datetime"],
+	)
+
+	return [appointment_interval(appt, tz) for appt in filter_active_appointments(appointments)]
+
+
+def filter_active_appointments(appointments: Iterable[Any]) -> List[Any]:
+	"""Descarta los Drafts cuyo draft_expires_at ya pasó."""
+	current_time = now_datetime()
+	return [
+		appt for appt in appointments
+		if not (
+			appt.status == "Draft"
+			and appt.draft_expires_at
+			and get_datetime(appt.draft_expires_at) < current_time
+		)
+	]
+
+
+def appointment_interval(appointment: Any, tz: tzinfo) -> Interval:
+	"""Intervalo epoch de un appointment (start_datetime / end_datetime en hora local)."""
+	return Interval(
+		wall_to_epoch(get_datetime(appointment.start_datetime), tz),
+		wall_to_epoch(get_datetime(appointment.end_datetime), tz)
+	)
+
+
+def _day_seat_segments(
+	plan: Dict[str, Any],
+	target_date: date,
+	tz: tzinfo,
+	fallback: int
+) -> List[SeatSegment]:
+	"""Franjas del plan de un día con su capacidad (0 → la del resource)."""
+	if plan["valid_from"] and target_date < plan["valid_from"]:
+		return []
+	if plan["valid_to"] and target_date > plan["valid_to"]:
+		return []
+
+	return [
+		(
+			local_to_epoch(target_date, start_minute, tz),
+			local_to_epoch(target_date, end_minute, tz),
+			capacity or fallback
+		)
+		for start_minute, end_minute, capacity in plan["weekdays"][target_date.weekday()]
+	]
+
+
+def _build_sparse_table(values: List[int]) -> List[List[int]]:
+	"""table[k][i] = min(values[i : i + 2**k]), O(n log n)."""
+	table = [values]
+	width = 1
+	while width * 2 <= len(values):
+		previous = table[-1]
+		table.append([
+			min(previous[i], previous[i + width])
+			for i in range(len(values) - width * 2 + 1)
+		])
+		width *= 2
+	return table
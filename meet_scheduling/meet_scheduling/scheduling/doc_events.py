@@ -0,0 +1,105 @@
+"""
+Document Events
+
+Handlers registrados en hooks.py (doc_events) que mantienen los datos derivados
+de la disponibilidad cuando cambian sus fuentes: la tabla Availability Day
+(materialized.py), el índice de slots (slot_index.py) y la versión de la caché
+de slots (slot_cache.py).
+- Appointment: la versión de slots de su resource y la capacidad de los slots
+  indexados que toca (sin reconstruir días).
+- Availability Plan: todos los resources que lo usan.
+- Calendar Exception: solo las fechas que cubre (antes y después del cambio).
+- Calendar Resource: todo el horizonte del resource.
+- Holiday Calendar: todos los resources que lo enlazan.
+"""
+
+import frappe
+from typing import Any
+
+from .availability import get_exception_span
+from .materialized import enqueue_availability_rebuild, invalidate_availability_days
+from .slot_cache import bump_resource_version
+from .slot_index import enqueue_slot_index_rebuild, invalidate_slot_index, update_slot_index_for_appointment
+from .timezones import invalidate_resource_timezone
+
+
+def on_appointment_change(doc: Any, method: str = None) -> None:
+	"""Appointment on_update / on_submit / on_cancel / on_update_after_submit / on_trash."""
+	resources = {doc.calendar_resource}
+
+	# Si la cita se movió a otro resource, el anterior también cambia
+	before = doc.get_doc_before_save()
+	if before:
+		resources.add(before.calendar_resource)
+
+	for resource_name in resources:
+		bump_resource_version(resource_name)
+
+	update_slot_index_for_appointment(doc, deleted=method == "on_trash")
+
+
+def on_availability_plan_change(doc: Any, method: str = None) -> None:
+	"""Availability Plan on_update / on_trash."""
+	resources = frappe.get_all(
+		"Calendar Resource",
+		filters={"availability_plan": doc.name},
+		pluck="name"
+	)
+
+	for resource_name in resources:
+		enqueue_availability_rebuild(resource_name)
+		enqueue_slot_index_rebuild(resource_name)
+		bump_resource_version(resource_name)
+
+
+def on_holiday_calendar_change(doc: Any, method: str = None) -> None:
+	"""Holiday Calendar on_update / on_trash."""
+	resources = frappe.get_all(
+		"Calendar Resource",
+		filters={"holiday_calendar": doc.name},
+		pluck="name"
+	)
+
+	for resource_name in resources:
+		enqueue_availability_rebuild(resource_name)
+		enqueue_slot_index_rebuild(resource_name)
+		bump_resource_version(resource_name)
+
+
+def on_calendar_exception_change(doc: Any, method: str = None) -> None:
+	"""
+	Calendar Exception on_update / on_trash.
+
+	Solo se reconstruyen las fechas que cubre la excepción (rango o recurrencia),
+	antes y después del cambio.
+	"""
+	affected = [doc]
+
+	# Si cambió el resource o las fechas, lo que cubría antes también queda afectado
+	before = doc.get_doc_before_save()
+	if before:
+		affected.append(before)
+
+	for exc in affected:
+		if not exc.calendar_resource or not exc.date:
+			continue
+		first, last = get_exception_span(exc)
+		enqueue_availability_rebuild(exc.calendar_resource, first, last)
+		enqueue_slot_index_rebuild(exc.calendar_resource, first, last)
+		bump_resource_version(exc.calendar_resource)
+
+
+def on_calendar_resource_update(doc: Any, method: str = None) -> None:
+	"""Calendar Resource on_update (plan, timezone o is_active pueden haber cambiado)."""
+	invalidate_resource_timezone(doc.name)
+	enqueue_availability_rebuild(doc.name)
+	enqueue_slot_index_rebuild(doc.name)
+	bump_resource_version(doc.name)
+
+
+def on_calendar_resource_trash(doc: Any, method: str = None) -> None:
+	"""Calendar Resource on_trash."""
+	invalidate_resource_timezone(doc.name)
+	invalidate_availability_days(doc.name)
+	invalidate_slot_index(doc.name)
+	bump_resource_version(doc.name)
@@ -0,0 +1,68 @@
+"""
+Holiday Calendar Cache
+
+Los cierres de un Holiday Calendar se comparten entre todos los Calendar
+Resources que lo enlazan. Se cargan una vez por calendario (Redis, con memo
+por request de frappe.cache) y se aplican como excepciones "Closed" con las
+mismas reglas de rango/recurrencia que Calendar Exception:
+
+	[
+		{"name": "...", "exception_type": "Closed", "date": date, "to_date": date | None,
+		 "recurrence": "" | "Weekly" | "Yearly", "start_time": ..., "end_time": ..., "reason": "..."},
+		...
+	]
+
+Se invalida desde HolidayCalendar.on_update / on_trash, tras el commit.
+"""
+
+import frappe
+from typing import Any, Dict, List, Optional
+
+
+HOLIDAY_CALENDAR_CACHE_KEY = "meet_scheduling:holiday_calendar_closures"
+
+
+def get_holiday_closures(calendar_name: Optional[str]) -> List[Dict[str, Any]]:
+	"""
+	Cierres de un Holiday Calendar como dicts con forma de Calendar Exception.
+
+	Args:
+		calendar_name: nombre del Holiday Calendar
+
+	Returns:
+		list[dict]: cierres (vacío si no hay calendario o no existe)
+	"""
+	if not calendar_name:
+		return []
+
+	return frappe.cache().hget(
+		HOLIDAY_CALENDAR_CACHE_KEY,
+		calendar_name,
+		generator=lambda: _load_holiday_closures(calendar_name)
+	)
+
+
+def invalidate_holiday_calendar(calendar_name: str) -> None:
+	"""
+	Elimina los cierres cacheados de un Holiday Calendar tras el commit de la
+	transacción actual.
+
+	El hash no tiene TTL: borrarlos antes del commit permitiría que una lectura
+	concurrente vuelva a cachear los cierres viejos sin vencimiento.
+	"""
+	frappe.db.after_commit.add(lambda: frappe.cache().hdel(HOLIDAY_CALENDAR_CACHE_KEY, calendar_name))
+
+
+def _load_holiday_closures(calendar_name: str) -> List[Dict[str, Any]]:
+	"""Lee las filas de cierre del calendario (1 query)."""
+	closures = frappe.get_all(
+		"Holiday Calendar Closure",
+		filters={"parent": calendar_name, "parenttype": "Holiday Calendar"},
+		fields=["name", "date", "to_date", "recurrence", "start_time", "end_time", "reason"],
+		order_by="idx asc"
+	)
+
+	for closure in closures:
+		closure["exception_type"] = "Closed"
+
+	return closures
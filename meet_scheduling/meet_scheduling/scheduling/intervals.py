@@ -0,0 +1,287 @@
+"""
+Interval Algebra Engine
+
+Operaciones sobre conjuntos de intervalos semiabiertos [start, end) expresados
+como segundos epoch UTC (int). Trabajar con enteros evita crear dicts y comparar
+datetimes con timezone en cada operación; la conversión a datetime se hace solo
+en el borde de la API (from_epoch).
+
+Convenciones:
+- Un "conjunto" es una lista de Interval ordenada por start, sin solapamientos
+  ni adyacencias (normalizada). normalize() produce esa forma desde cualquier input.
+- union, subtract, intersect y clip reciben conjuntos normalizados y corren en
+  tiempo lineal sobre el tamaño de la entrada.
+- overlapping_pairs lista, para muchas ventanas a la vez, qué intervalos tocan
+  cada una (check_overlaps_bulk) con una sola pasada de sweep-line.
+- peak_overlap da el máximo de intervalos simultáneos dentro de una ventana y
+  el primer instante en que se alcanza (sweep ordenado de inicios y fines).
+"""
+
+from datetime import datetime, tzinfo
+from heapq import merge
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class Interval(NamedTuple):
+	"""Intervalo semiabierto [start, end) en segundos epoch UTC."""
+
+	start: int
+	end: int
+
+
+def to_epoch(value: datetime) -> int:
+	"""Convierte un datetime aware a segundos epoch UTC."""
+	return int(value.timestamp())
+
+
+def from_epoch(value: int, tz: tzinfo) -> datetime:
+	"""Convierte segundos epoch UTC a datetime aware en la timezone indicada."""
+	return datetime.fromtimestamp(value, tz)
+
+
+def _coalesce(intervals: Iterable[Interval]) -> List[Interval]:
+	"""Une intervalos ya ordenados por start que se solapan o son adyacentes."""
+	result: List[Interval] = []
+
+	for start, end in intervals:
+		if start >= end:
+			continue
+		if result and start <= result[-1].end:
+			if end > result[-1].end:
+				result[-1] = Interval(result[-1].start, end)
+		else:
+			result.append(Interval(start, end))
+
+	return result
+
+
+def normalize(intervals: Iterable[Interval]) -> List[Interval]:
+	"""
+	Ordena y une intervalos arbitrarios. O(n log n).
+
+	Descarta intervalos vacíos (start >= end).
+	"""
+	return _coalesce(sorted(intervals))
+
+
+def union(a: List[Interval], b: List[Interval]) -> List[Interval]:
+	"""Unión de dos conjuntos normalizados. O(n + m)."""
+	return _coalesce(merge(a, b))
+
+
+def subtract(a: List[Interval], b: List[Interval]) -> List[Interval]:
+	"""
+	Diferencia a - b de dos conjuntos normalizados. O(n + m).
+
+	Casos por intervalo de a: sin overlap (se conserva), cubierto por completo
+	(desaparece), recortado al inicio/fin, o partido en dos por un bloque interno.
+	"""
+	result: List[Interval] = []
+	j = 0
+
+	for start, end in a:
+		cursor = start
+
+		# Descartar bloques que terminan antes de este intervalo
+		while j < len(b) and b[j].end <= cursor:
+			j += 1
+
+		k = j
+		while k < len(b) and b[k].start < end:
+			if b[k].start > cursor:
+				result.append(Interval(cursor, b[k].start))
+			cursor = max(cursor, b[k].end)
+			if cursor >= end:
+				break
+			k += 1
+
+		if cursor < end:
+			result.append(Interval(cursor, end))
+
+	return result
+
+
+def intersect(a: List[Interval], b: List[Interval]) -> List[Interval]:
+	"""Intersección de dos conjuntos normalizados. O(n + m)."""
+	result: List[Interval] = []
+	i = j = 0
+
+	while i < len(a) and j < len(b):
+		start = max(a[i].start, b[j].start)
+		end = min(a[i].end, b[j].end)
+		if start < end:
+			result.append(Interval(start, end))
+
+		if a[i].end < b[j].end:
+			i += 1
+		else:
+			j += 1
+
+	return result
+
+
+def clip(a: List[Interval], start: int, end: int) -> List[Interval]:
+	"""Recorta un conjunto normalizado a la ventana [start, end). O(n)."""
+	result: List[Interval] = []
+
+	for interval_start, interval_end in a:
+		if interval_end <= start:
+			continue
+		if interval_start >= end:
+			break
+		result.append(Interval(max(interval_start, start), min(interval_end, end)))
+
+	return result
+
+
+def sweep(
+	base: Iterable[Interval],
+	extra: Iterable[Interval] = (),
+	blocks: Iterable[Interval] = (),
+	close_all: bool = False
+) -> List[Interval]:
+	"""
+	Aplica aperturas y bloqueos en una sola pasada de sweep-line.
+
+	Resultado = (base ∪ extra) - blocks, o [] si close_all. No depende del orden
+	de los inputs: un bloqueo siempre gana sobre una apertura, sin importar cuál
+	se procese primero. O((n + m) log(n + m)).
+
+	Args:
+		base: intervalos abiertos por el plan (no necesitan estar ordenados)
+		extra: intervalos de disponibilidad extra
+		blocks: intervalos bloqueados/cerrados
+		close_all: cierra todo el día (gana sobre cualquier apertura)
+
+	Returns:
+		list: conjunto normalizado resultante
+	"""
+	if close_all:
+		return []
+
+	# Eventos: (tiempo, delta_abiertos, delta_bloqueos)
+	events = []
+	for start, end in base:
+		if start < end:
+			events.append((start, 1, 0))
+			events.append((end, -1, 0))
+	for start, end in extra:
+		if start < end:
+			events.append((start, 1, 0))
+			events.append((end, -1, 0))
+	for start, end in blocks:
+		if start < end:
+			events.append((start, 0, 1))
+			events.append((end, 0, -1))
+
+	if not events:
+		return []
+
+	events.sort()
+
+	result: List[Interval] = []
+	open_count = block_count = 0
+	available_since = None
+	i = 0
+
+	while i < len(events):
+		now = events[i][0]
+
+		# Aplicar todos los eventos del mismo instante antes de evaluar el estado
+		while i < len(events) and events[i][0] == now:
+			open_count += events[i][1]
+			block_count += events[i][2]
+			i += 1
+
+		is_available = open_count > 0 and block_count == 0
+
+		if is_available and available_since is None:
+			available_since = now
+		elif not is_available and available_since is not None:
+			result.append(Interval(available_since, now))
+			available_since = None
+
+	return result
+
+
+def overlapping_pairs(windows: List[Interval], intervals: List[Interval]) -> List[List[int]]:
+	"""
+	Para cada ventana, los índices (en intervals) de los intervalos que se
+	solapan con ella, en orden creciente.
+
+	Sweep-line sobre inicios y fines de ambas listas: al abrirse una ventana se
+	empareja con los intervalos abiertos y viceversa. Los fines se procesan
+	antes que los inicios del mismo instante (semiabiertos: [0, 10) no toca
+	[10, 20)). O((n + m) log(n + m) + pares).
+
+	Args:
+		windows: ventanas a consultar (no necesitan estar ordenadas)
+		intervals: intervalos que pueden solaparse entre sí (ej. citas)
+
+	Returns:
+		list: una lista de índices por ventana, en el orden de windows
+	"""
+	# Eventos: (tiempo, 0 = fin / 1 = inicio, 0 = ventana / 1 = intervalo, índice)
+	events = []
+	for kind, items in ((0, windows), (1, intervals)):
+		for index, (start, end) in enumerate(items):
+			if start < end:
+				events.append((start, 1, kind, index))
+				events.append((end, 0, kind, index))
+	events.sort()
+
+	result: List[List[int]] = [[] for _ in windows]
+	open_windows: Dict[int, None] = {}
+	open_intervals: Dict[int, None] = {}
+
+	for _time, is_start, kind, index in events:
+		opened, others = (open_windows, open_intervals) if kind == 0 else (open_intervals, open_windows)
+		if not is_start:
+			del opened[index]
+			continue
+
+		opened[index] = None
+		if kind == 0:
+			result[index].extend(others)
+		else:
+			for window in others:
+				result[window].append(index)
+
+	for matches in result:
+		matches.sort()
+	return result
+
+
+def peak_overlap(intervals: Iterable[Interval], start: int, end: int) -> Tuple[int, Optional[int]]:
+	"""
+	Máximo de intervalos simultáneos dentro de [start, end) y el primer instante
+	en que se alcanza.
+
+	Recorta cada intervalo a la ventana y recorre inicios y fines ordenados por
+	tiempo, con los fines antes que los inicios del mismo instante
+	(semiabiertos: [0, 10) y [10, 20) nunca coinciden). O(n log n).
+
+	Args:
+		intervals: intervalos que pueden solaparse entre sí (ej. citas)
+		start: inicio de la ventana
+		end: fin de la ventana
+
+	Returns:
+		tuple: (pico, instante epoch del pico); (0, None) si nada toca la ventana
+	"""
+	# Eventos: (tiempo, -1 = fin / +1 = inicio); -1 ordena antes que +1
+	events = []
+	for interval_start, interval_end in intervals:
+		interval_start, interval_end = max(interval_start, start), min(interval_end, end)
+		if interval_start < interval_end:
+			events.append((interval_start, 1))
+			events.append((interval_end, -1))
+	events.sort()
+
+	peak, peak_at, current = 0, None, 0
+	for time, delta in events:
+		current += delta
+		if current > peak:
+			peak, peak_at = current, time
+
+	return peak, peak_at
@@ -0,0 +1,182 @@
+"""
+Materialized Availability Store
+
+Mantiene la tabla "Availability Day": los intervalos efectivos (plan + excepciones)
+de cada Calendar Resource por fecha, precalculados para un horizonte móvil de
+AVAILABILITY_DAY_HORIZON_DAYS días.
+
+- rebuild_availability_days: recalcula un rango de fechas de un resource.
+- invalidate_availability_days: borra filas para que las lecturas recalculen
+  (availability._load_availability_context lee las filas del rango y calcula
+  solo las fechas que faltan).
+- enqueue_availability_rebuild: invalida ya y reconstruye en background tras el commit.
+- rebuild_all_availability_days: job diario (hooks.py) que avanza el horizonte.
+
+Los doc_events que disparan la invalidación están en doc_events.py.
+"""
+
+import json
+import frappe
+from frappe.utils import add_days, getdate, now_datetime, today
+from datetime import date
+from typing import Optional, Tuple, Union
+
+from .availability import (
+	_compute_day_intervals,
+	_load_availability_context,
+	iter_date_chunks,
+)
+
+
+AVAILABILITY_DAY_DOCTYPE = "Availability Day"
+AVAILABILITY_DAY_HORIZON_DAYS = 180
+
+
+def get_horizon(
+	start_date: Optional[Union[date, str]] = None,
+	end_date: Optional[Union[date, str]] = None,
+	horizon_days: int = AVAILABILITY_DAY_HORIZON_DAYS
+) -> Optional[Tuple[date, date]]:
+	"""
+	Recorta [start_date, end_date] al horizonte materializado [hoy, hoy + horizon_days].
+
+	Returns:
+		tuple | None: (start, end) recortado, o None si queda vacío
+	"""
+	horizon_start = getdate(today())
+	horizon_end = add_days(horizon_start, horizon_days)
+
+	start = max(getdate(start_date), horizon_start) if start_date else horizon_start
+	end = min(getdate(end_date), horizon_end) if end_date else horizon_end
+
+	if start > end:
+		return None
+	return start, end
+
+
+def rebuild_availability_days(
+	calendar_resource: str,
+	start_date: Optional[Union[date, str]] = None,
+	end_date: Optional[Union[date, str]] = None
+) -> int:
+	"""
+	Recalcula y guarda la disponibilidad de un resource para un rango de fechas.
+
+	Se guardan también los días sin disponibilidad ("[]"), así una fila
+	ausente siempre significa "no materializado" y nunca "cerrado".
+
+	Args:
+		calendar_resource: nombre del Calendar Resource
+		start_date: fecha inicial (default: hoy)
+		end_date: fecha final (default: fin del horizonte)
+
+	Returns:
+		int: cantidad de días guardados
+	"""
+	window = get_horizon(start_date, end_date)
+	if not window or not frappe.db.exists("Calendar Resource", calendar_resource):
+		return 0
+
+	resource = frappe.get_doc("Calendar Resource", calendar_resource)
+	timestamp = now_datetime()
+	rows = []
+
+	for chunk_start, chunk_end in iter_date_chunks(*window):
+		# Se recalcula desde el plan y las excepciones, nunca desde las filas actuales
+		context = _load_availability_context(resource, chunk_start, chunk_end, use_materialized=False)
+
+		current_date = chunk_start
+		while current_date <= chunk_end:
+			intervals = _compute_day_intervals(context, current_date)
+			rows.append((
+				frappe.generate_hash(length=10),
+				timestamp,
+				timestamp,
+				"Administrator",
+				"Administrator",
+				resource.name,
+				current_date,
+				json.dumps([list(interval) for interval in intervals])
+			))
+			current_date = add_days(current_date, 1)
+
+	invalidate_availability_days(resource.name, *window)
+	frappe.db.bulk_insert(
+		AVAILABILITY_DAY_DOCTYPE,
+		fields=["name", "creation", "modified", "owner", "modified_by", "calendar_resource", "date", "intervals"],
+		values=rows
+	)
+
+	return len(rows)
+
+
+def invalidate_availability_days(
+	calendar_resource: str,
+	start_date: Optional[Union[date, str]] = None,
+	end_date: Optional[Union[date, str]] = None
+) -> None:
+	"""
+	Borra las filas materializadas de un resource (todas, o solo el rango indicado).
+	"""
+	filters = {"calendar_resource": calendar_resource}
+
+	if start_date and end_date:
+		filters["date"] = ["between", [getdate(start_date), getdate(end_date)]]
+	elif start_date:
+		filters["date"] = [">=", getdate(start_date)]
+	elif end_date:
+		filters["date"] = ["<=", getdate(end_date)]
+
+	frappe.db.delete(AVAILABILITY_DAY_DOCTYPE, filters)
+
+
+def enqueue_availability_rebuild(
+	calendar_resource: str,
+	start_date: Optional[Union[date, str]] = None,
+	end_date: Optional[Union[date, str]] = None
+) -> None:
+	"""
+	Invalida el rango de inmediato y encola su reconstrucción tras el commit.
+
+	Mientras el job no corre, las lecturas del rango recalculan (miss), así
+	nunca se sirve disponibilidad desactualizada.
+	"""
+	window = get_horizon(start_date, end_date)
+	if not window:
+		return
+
+	invalidate_availability_days(calendar_resource, *window)
+	frappe.enqueue(
+		"meet_scheduling.meet_scheduling.scheduling.materialized.rebuild_availability_days",
+		queue="long",
+		enqueue_after_commit=True,
+		calendar_resource=calendar_resource,
+		start_date=str(window[0]),
+		end_date=str(window[1])
+	)
+
+
+def rebuild_all_availability_days() -> int:
+	"""
+	Job diario: elimina días pasados y reconstruye el horizonte de todos los
+	resources activos. Se ejecuta vía scheduler (configurado en hooks.py).
+
+	Returns:
+		int: cantidad de días guardados
+	"""
+	frappe.db.delete(AVAILABILITY_DAY_DOCTYPE, {"date": ["<", getdate(today())]})
+
+	total = 0
+	for resource_name in frappe.get_all("Calendar Resource", filters={"is_active": 1}, pluck="name"):
+		try:
+			total += rebuild_availability_days(resource_name)
+			frappe.db.commit()
+		except Exception as e:
+			frappe.db.rollback()
+			frappe.log_error(
+				f"Error reconstruyendo Availability Day de {resource_name}: {str(e)}",
+				"Rebuild Availability Days"
+			)
+
+	return total
+
@@ -3,15 +3,28 @@ Overlap Detection Service
 
 Detects scheduling conflicts (overlaps) between appointments,
 considering:
-- Calendar Resource capacity
+- Seats per instant: Availability Slot capacity, falling back to the
+  Calendar Resource capacity (see capacity.py)
 - Appointment status (Draft, Confirmed)
 - Draft expiration
+
+check_overlaps_bulk answers many candidate intervals (calendar widgets,
+recurring appointments) with a single query and one sweep.
 """
 
 import frappe
-from frappe.utils import now_datetime, get_datetime
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from frappe.utils import get_datetime
+from datetime import datetime, tzinfo
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .capacity import (
+	CapacityTimeline,
+	appointment_interval,
+	build_capacity_timeline,
+	filter_active_appointments,
+)
+from .intervals import Interval, from_epoch, overlapping_pairs, peak_overlap
+from .timezones import get_resource_timezone, wall_to_epoch
 
 
 def check_overlap(
@@ -35,26 +48,29 @@ def check_overlap(
 			"overlapping_appointments": [list of appointment names],
 			"capacity_exceeded": bool,
 			"capacity_used": int,
-			"capacity_available": int
+			"capacity_available": int,
+			"peak_occupancy": int,
+			"peak_at": str | None
 		}
 
 	Algoritmo:
-		1. Obtener capacity del calendar_resource
-		2. Consultar appointments con:
+		1. Consultar appointments con:
 			- calendar_resource = X
 			- status in ("Draft", "Confirmed")
 			- (start < end_datetime AND end > start_datetime)
 			- name != exclude_appointment
-		3. Filtrar Drafts expirados
-		4. Contar overlaps
-		5. Comparar con capacity
+		2. Filtrar Drafts expirados
+		3. Armar el CapacityTimeline de los días del rango con esas citas
+		4. capacity_available = mínimo de asientos libres en [start, end)
+		   (las citas solo cuentan donde se solapan entre sí)
+		5. peak_occupancy = máximo de citas simultáneas dentro del rango y
+		   peak_at el primer instante en que se da (sweep ordenado)
 		6. Retornar resultado
 	"""
-	# 1. Obtener capacity del Calendar Resource
 	resource = frappe.get_doc("Calendar Resource", calendar_resource)
-	capacity = resource.capacity or 1
+	tz = get_resource_timezone(resource)
 
-	# 2. Consultar appointments que se solapan
+	# 1. Consultar appointments que se solapan
 	# Condición de overlap: start < end_datetime AND end > start_datetime
 	filters = {
 		"calendar_resource": calendar_resource,
@@ -73,35 +89,107 @@ def check_overlap(
 		fields=["name", "status", "draft_expires_at", "start_datetime", "end_datetime"]
 	)
 
-	# 3. Filtrar Drafts expirados
-	current_time = now_datetime()
-	active_appointments = []
-
-	for appt in appointments:
-		# Si es Draft, verificar si ha expirado
-		if appt.status == "Draft":
-			if appt.draft_expires_at:
-				# Si tiene fecha de expiración y ya pasó, ignorar
-				expires_at = get_datetime(appt.draft_expires_at)
-				if expires_at < current_time:
-					continue
-			# Si es Draft sin fecha de expiración, incluir
-
-		# Appointment activo (Confirmed o Draft no expirado)
-		active_appointments.append(appt.name)
-
-	# 4. Contar overlaps
-	overlap_count = len(active_appointments)
-	has_overlap = overlap_count > 0
-	capacity_exceeded = overlap_count >= capacity
-	capacity_used = overlap_count
-	capacity_available = max(0, capacity - overlap_count)
-
-	# 5. Retornar resultado
+	# 2. Filtrar Drafts expirados (Confirmed o Draft no expirado quedan activos)
+	active_appointments = filter_active_appointments(appointments)
+
+	# 3. Timeline de asientos de los días que toca el rango
+	start = wall_to_epoch(get_datetime(start_datetime), tz)
+	end = wall_to_epoch(get_datetime(end_datetime), tz)
+	bookings = [appointment_interval(appt, tz) for appt in active_appointments]
+	timeline = build_capacity_timeline(
+		resource,
+		from_epoch(start, tz).date(),
+		from_epoch(max(start, end - 1), tz).date(),
+		bookings
+	)
+
+	# 4-6. Asientos libres en el cuello de botella y pico de ocupación del rango
+	return _overlap_result(timeline, tz, Interval(start, end), [appt.name for appt in active_appointments], bookings)
+
+
+def check_overlaps_bulk(
+	calendar_resource: str,
+	intervals: Iterable[Tuple[Union[datetime, str], Union[datetime, str]]],
+	exclude: Optional[str] = None
+) -> List[Dict[str, Any]]:
+	"""
+	check_overlap para muchos intervalos candidatos con una sola query.
+
+	Trae las citas que tocan el rango que cubre a todos los candidatos, arma un
+	único CapacityTimeline y empareja candidatos y citas con un sweep
+	(intervals.overlapping_pairs), en lugar de un get_doc y una query por
+	candidato.
+
+	Args:
+		calendar_resource: nombre del Calendar Resource
+		intervals: pares (start_datetime, end_datetime), hora local del resource
+		exclude: nombre del Appointment a excluir (para ediciones)
+
+	Returns:
+		list[dict]: un resultado por candidato, en el mismo orden y con las
+		mismas claves que check_overlap
+	"""
+	candidates = [(get_datetime(start), get_datetime(end)) for start, end in intervals]
+	if not candidates:
+		return []
+
+	resource = frappe.get_doc("Calendar Resource", calendar_resource)
+	tz = get_resource_timezone(resource)
+
+	filters = {
+		"calendar_resource": calendar_resource,
+		"status": ["in", ["Draft", "Confirmed"]],
+		"start_datetime": ["<", max(end for _start, end in candidates)],
+		"end_datetime": [">", min(start for start, _end in candidates)]
+	}
+	if exclude:
+		filters["name"] = ["!=", exclude]
+
+	appointments = filter_active_appointments(frappe.get_all(
+		"Appointment",
+		filters=filters,
+		fields=["name", "status", "draft_expires_at", "start_datetime", "end_datetime"],
+		order_by="start_datetime asc"
+	))
+	bookings = [appointment_interval(appt, tz) for appt in appointments]
+
+	windows = [
+		Interval(wall_to_epoch(start, tz), wall_to_epoch(end, tz))
+		for start, end in candidates
+	]
+	first = min(window.start for window in windows)
+	last = max(max(window.start, window.end - 1) for window in windows)
+	timeline = build_capacity_timeline(resource, from_epoch(first, tz).date(), from_epoch(last, tz).date(), bookings)
+
+	return [
+		_overlap_result(
+			timeline,
+			tz,
+			window,
+			[appointments[index].name for index in matches],
+			[bookings[index] for index in matches]
+		)
+		for window, matches in zip(windows, overlapping_pairs(windows, bookings))
+	]
+
+
+def _overlap_result(
+	timeline: CapacityTimeline,
+	tz: tzinfo,
+	window: Interval,
+	overlapping: List[str],
+	bookings: List[Interval]
+) -> Dict[str, Any]:
+	"""Resultado de check_overlap para una ventana epoch y sus citas solapadas."""
+	capacity_available = max(0, timeline.free_seats(window.start, window.end))
+	peak_occupancy, peak_at = peak_overlap(bookings, window.start, window.end)
+
 	return {
-		"has_overlap": has_overlap,
-		"overlapping_appointments": active_appointments,
-		"capacity_exceeded": capacity_exceeded,
-		"capacity_used": capacity_used,
-		"capacity_available": capacity_available
+		"has_overlap": len(overlapping) > 0,
+		"overlapping_appointments": overlapping,
+		"capacity_exceeded": capacity_available <= 0,
+		"capacity_used": len(overlapping),
+		"capacity_available": capacity_available,
+		"peak_occupancy": peak_occupancy,
+		"peak_at": from_epoch(peak_at, tz).strftime("%Y-%m-%d %H:%M:%S") if peak_at is not None else None
 	}
@@ -0,0 +1,142 @@
+"""
+Compiled Availability Plan Cache
+
+Compila un Availability Plan a una representación compacta por día de la semana
+para que el cálculo de disponibilidad no recorra la tabla hija en cada llamada:
+
+	{
+		"name": "Horario Consultorio",
+		"token": "a1b2c3d4e5",
+		"is_active": True,
+		"valid_from": date | None,
+		"valid_to": date | None,
+		"weekdays": (
+			((480, 720, 0), (840, 1080, 2)),   # Monday: (start_minute, end_minute, capacity)
+			(),                                # Tuesday
+			...
+		)
+	}
+
+Niveles de caché:
+- Proceso: dict en memoria, validado contra un token guardado en Redis.
+- Redis: el plan compilado completo (compartido entre workers).
+
+Se invalida desde AvailabilityPlan.on_update / on_trash.
+"""
+
+import frappe
+from frappe.utils import cint, getdate, get_time
+from datetime import time, timedelta
+from typing import Any, Dict, Optional, Union
+
+
+COMPILED_PLAN_CACHE_KEY = "meet_scheduling:compiled_availability_plan"
+COMPILED_PLAN_TOKEN_KEY = "meet_scheduling:compiled_availability_plan_token"
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Caché por proceso: {plan_name: compiled_plan}
+_process_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def to_minutes(time_value: Union[time, timedelta, str]) -> int:
+	"""
+	Convierte un valor de tiempo (time, timedelta desde medianoche o string)
+	a minutos desde medianoche.
+	"""
+	if isinstance(time_value, timedelta):
+		return int(time_value.total_seconds() // 60)
+	if not isinstance(time_value, time):
+		time_value = get_time(time_value)
+	return time_value.hour * 60 + time_value.minute
+
+
+def compile_availability_plan(plan: Any) -> Dict[str, Any]:
+	"""
+	Compila un Availability Plan (doc) a tuplas ordenadas por día de la semana.
+
+	Args:
+		plan: documento Availability Plan
+
+	Returns:
+		dict: plan compilado (ver docstring del módulo)
+	"""
+	weekdays = [[] for _ in WEEKDAYS]
+
+	for slot in plan.availability_slots or []:
+		if slot.weekday not in WEEKDAYS or not slot.start_time or not slot.end_time:
+			continue
+
+		weekdays[WEEKDAYS.index(slot.weekday)].append((
+			to_minutes(slot.start_time),
+			to_minutes(slot.end_time),
+			cint(slot.capacity)
+		))
+
+	return {
+		"name": plan.name,
+		"token": frappe.generate_hash(length=10),
+		"is_active": bool(plan.is_active),
+		"valid_from": getdate(plan.valid_from) if plan.valid_from else None,
+		"valid_to": getdate(plan.valid_to) if plan.valid_to else None,
+		"weekdays": tuple(tuple(sorted(day)) for day in weekdays),
+	}
+
+
+def get_compiled_plan(plan_name: Optional[str]) -> Optional[Dict[str, Any]]:
+	"""
+	Obtiene el plan compilado desde caché (proceso → Redis → DB).
+
+	Args:
+		plan_name: nombre del Availability Plan
+
+	Returns:
+		dict | None: plan compilado, o None si el plan no existe
+	"""
+	if not plan_name:
+		return None
+
+	cache = frappe.cache()
+	token = cache.hget(COMPILED_PLAN_TOKEN_KEY, plan_name)
+
+	# 1. Caché del proceso (válida mientras el token de Redis no cambie)
+	compiled = _process_cache.get(plan_name)
+	if token and compiled and compiled["token"] == token:
+		return compiled
+
+	# 2. Caché de Redis
+	compiled = cache.hget(COMPILED_PLAN_CACHE_KEY, plan_name) if token else None
+
+	# 3. Compilar desde la DB
+	if not compiled or compiled["token"] != token:
+		if not frappe.db.exists("Availability Plan", plan_name):
+			return None
+		compiled = store_compiled_plan(frappe.get_doc("Availability Plan", plan_name))
+
+	_process_cache[plan_name] = compiled
+	return compiled
+
+
+def store_compiled_plan(plan: Any) -> Dict[str, Any]:
+	"""
+	Compila el plan y lo publica en Redis y en la caché del proceso.
+	"""
+	compiled = compile_availability_plan(plan)
+
+	cache = frappe.cache()
+	cache.hset(COMPILED_PLAN_CACHE_KEY, plan.name, compiled)
+	cache.hset(COMPILED_PLAN_TOKEN_KEY, plan.name, compiled["token"])
+	_process_cache[plan.name] = compiled
+
+	return compiled
+
+
+def invalidate_compiled_plan(plan_name: str) -> None:
+	"""
+	Elimina el plan compilado de Redis y de la caché del proceso.
+	Los demás procesos lo detectan porque el token desaparece de Redis.
+	"""
+	cache = frappe.cache()
+	cache.hdel(COMPILED_PLAN_TOKEN_KEY, plan_name)
+	cache.hdel(COMPILED_PLAN_CACHE_KEY, plan_name)
+	_process_cache.pop(plan_name, None)
@@ -0,0 +1,288 @@
+"""
+Versioned Slot Cache
+
+Caché en Redis de generate_available_slots (o generate_slot_runs en formato
+compacto, o el resumen por día de generate_availability_summary) por
+(resource, formato, filtros, duración/paso, from_date, to_date), etiquetada con
+la versión del resource:
+
+- Cada Calendar Resource tiene un contador de versión que se incrementa (tras el
+  commit) desde doc_events.py cuando se escribe un Appointment, Calendar
+  Exception, Availability Plan, Holiday Calendar o el propio resource.
+- Hit: la entrada tiene la versión actual.
+- Stale-while-revalidate: si la versión cambió hace menos de
+  SLOT_CACHE_STALE_SECONDS, se sirve la entrada anterior y se encola UNA
+  reconstrucción (lock en Redis), así una ráfaga de reservas no dispara un
+  recálculo por request.
+- Miss: se calcula en línea y se guarda.
+
+Contadores de hit / stale / miss en get_slot_cache_stats.
+"""
+
+import time
+import frappe
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+from .slots import SlotFilters, generate_availability_summary, generate_available_slots, generate_slot_runs
+
+
+SLOT_CACHE_KEY = "meet_scheduling:slots"
+SLOT_VERSION_KEY = "meet_scheduling:slot_version"
+SLOT_CACHE_STATS_KEY = "meet_scheduling:slot_cache_stats"
+
+SLOT_CACHE_TTL_SECONDS = 3600
+SLOT_CACHE_STALE_SECONDS = 30
+SLOT_REVALIDATE_LOCK_SECONDS = 30
+
+SLOT_CACHE_COUNTERS = ("hits", "stale_hits", "misses")
+
+# Formato de respuesta → función que genera los slots
+SLOT_FORMATS = {
+	"full": generate_available_slots,
+	"compact": generate_slot_runs,
+}
+
+# Salidas cacheables: los formatos de slots más el resumen por día
+CACHED_OUTPUTS = {
+	**SLOT_FORMATS,
+	"summary": generate_availability_summary,
+}
+
+
+class _SlotQuery(NamedTuple):
+	"""Parámetros (además de resource y fechas) que definen una entrada de la caché."""
+
+	slot_format: str = "full"
+	filters: Optional[SlotFilters] = None
+	duration_minutes: Optional[int] = None
+	step_minutes: Optional[int] = None
+
+	def key(self) -> str:
+		"""Representación estable para la clave de Redis."""
+		return ":".join((
+			self.slot_format,
+			_filters_key(self.filters),
+			str(self.duration_minutes or "-"),
+			str(self.step_minutes or "-"),
+		))
+
+	def to_job(self) -> List[Any]:
+		"""Forma serializable para frappe.enqueue (inverso: from_job)."""
+		return [self.slot_format, list(self.filters) if self.filters else None, self.duration_minutes, self.step_minutes]
+
+	@classmethod
+	def from_job(cls, values: List[Any]) -> "_SlotQuery":
+		slot_format, filters, duration_minutes, step_minutes = values
+		return cls(slot_format, SlotFilters(*filters) if filters else None, duration_minutes, step_minutes)
+
+
+DEFAULT_QUERY = _SlotQuery()
+
+
+def get_cached_available_slots(
+	calendar_resource: str,
+	start_date: Union[date, str],
+	end_date: Union[date, str],
+	slot_format: str = "full",
+	filters: Optional[SlotFilters] = None,
+	duration_minutes: Optional[int] = None,
+	step_minutes: Optional[int] = None
+) -> List[Dict[str, Any]]:
+	"""
+	generate_available_slots / generate_slot_runs con caché versionada por resource.
+
+	Args:
+		calendar_resource: nombre del Calendar Resource
+		start_date: fecha inicial
+		end_date: fecha final
+		slot_format: "full", "compact" o "summary" (ver CACHED_OUTPUTS)
+		filters: SlotFilters opcionales
+		duration_minutes: duración de cada slot (default: la del resource)
+		step_minutes: separación entre inicios de slot (default: la duración)
+
+	Returns:
+		list[dict]: mismo formato que la función de CACHED_OUTPUTS
+	"""
+	cache = frappe.cache()
+	query = _SlotQuery(slot_format, filters, duration_minutes, step_minutes)
+	key = _entry_key(calendar_resource, start_date, end_date, query)
+
+	# La versión se lee ANTES de calcular: si cambia mientras tanto, la entrada
+	# queda con la versión vieja y la próxima lectura la detecta
+	version = get_resource_version(calendar_resource)
+	entry = cache.get_value(key)
+
+	if entry and entry["version"] == version:
+		_record("hits")
+		return entry["slots"]
+
+	if entry and time.time() - _get_version_bumped_at(calendar_resource) <= SLOT_CACHE_STALE_SECONDS:
+		_record("stale_hits")
+		_schedule_revalidation(calendar_resource, start_date, end_date, query)
+		return entry["slots"]
+
+	_record("misses")
+	slots = _compute(calendar_resource, start_date, end_date, query)
+	_store(key, version, slots)
+	return slots
+
+
+def get_cached_availability_summary(
+	calendar_resource: str,
+	start_date: Union[date, str],
+	end_date: Union[date, str]
+) -> List[Dict[str, Any]]:
+	"""generate_availability_summary con la misma caché versionada que los slots."""
+	return get_cached_available_slots(calendar_resource, start_date, end_date, slot_format="summary")
+
+
+def revalidate_slots(
+	calendar_resource: str,
+	start_date: str,
+	end_date: str,
+	query: Optional[List[Any]] = None
+) -> None:
+	"""Job en background: recalcula una entrada servida como stale."""
+	query = _SlotQuery.from_job(query) if query else DEFAULT_QUERY
+	try:
+		version = get_resource_version(calendar_resource)
+		slots = _compute(calendar_resource, start_date, end_date, query)
+		_store(_entry_key(calendar_resource, start_date, end_date, query), version, slots)
+	finally:
+		frappe.cache().delete(_lock_key(calendar_resource, start_date, end_date, query))
+
+
+def get_resource_version(calendar_resource: str) -> int:
+	"""Versión actual de los datos de slots de un resource (0 si nunca cambió)."""
+	cache = frappe.cache()
+	return int(cache.get(cache.make_key(f"{SLOT_VERSION_KEY}:{calendar_resource}")) or 0)
+
+
+def bump_resource_version(calendar_resource: str) -> None:
+	"""
+	Incrementa la versión de un resource tras el commit de la transacción actual.
+
+	Hacerlo antes del commit permitiría que una lectura concurrente guarde datos
+	viejos con la versión nueva.
+	"""
+	if not calendar_resource:
+		return
+
+	frappe.db.after_commit.add(lambda: _bump_now(calendar_resource))
+
+
+def get_slot_cache_stats() -> Dict[str, Any]:
+	"""
+	Contadores acumulados de la caché de slots.
+
+	Returns:
+		dict: {"hits", "stale_hits", "misses", "hit_ratio"}
+	"""
+	cache = frappe.cache()
+	stats = {
+		counter: int(cache.get(cache.make_key(f"{SLOT_CACHE_STATS_KEY}:{counter}")) or 0)
+		for counter in SLOT_CACHE_COUNTERS
+	}
+
+	total = sum(stats.values())
+	stats["hit_ratio"] = round((stats["hits"] + stats["stale_hits"]) / total, 4) if total else 0.0
+	return stats
+
+
+def _bump_now(calendar_resource: str) -> None:
+	"""Incrementa la versión (INCR atómico) y registra cuándo cambió."""
+	cache = frappe.cache()
+	version_key = cache.make_key(f"{SLOT_VERSION_KEY}:{calendar_resource}")
+	cache.incr(version_key)
+	cache.set(f"{version_key}:bumped_at", time.time())
+
+
+def _get_version_bumped_at(calendar_resource: str) -> float:
+	"""Momento (epoch) del último cambio de versión del resource."""
+	cache = frappe.cache()
+	return float(cache.get(cache.make_key(f"{SLOT_VERSION_KEY}:{calendar_resource}:bumped_at")) or 0)
+
+
+def _schedule_revalidation(
+	calendar_resource: str,
+	start_date: Any,
+	end_date: Any,
+	query: _SlotQuery
+) -> None:
+	"""Encola la reconstrucción de una entrada, una sola vez por ventana de lock."""
+	cache = frappe.cache()
+	acquired = cache.set(
+		_lock_key(calendar_resource, start_date, end_date, query), 1,
+		nx=True, ex=SLOT_REVALIDATE_LOCK_SECONDS
+	)
+	if not acquired:
+		return
+
+	frappe.enqueue(
+		"meet_scheduling.meet_scheduling.scheduling.slot_cache.revalidate_slots",
+		queue="short",
+		calendar_resource=calendar_resource,
+		start_date=str(start_date),
+		end_date=str(end_date),
+		query=query.to_job()
+	)
+
+
+def _compute(calendar_resource: str, start_date: Any, end_date: Any, query: _SlotQuery) -> List[Dict[str, Any]]:
+	"""Genera los slots de una entrada (sin caché)."""
+	return CACHED_OUTPUTS[query.slot_format](
+		calendar_resource, start_date, end_date,
+		filters=query.filters,
+		duration_minutes=query.duration_minutes,
+		step_minutes=query.step_minutes
+	)
+
+
+def _store(key: str, version: int, slots: List[Dict[str, Any]]) -> None:
+	"""Guarda una entrada con su versión."""
+	frappe.cache().set_value(
+		key,
+		{"version": version, "slots": slots},
+		expires_in_sec=SLOT_CACHE_TTL_SECONDS
+	)
+
+
+def _record(counter: str) -> None:
+	"""Incrementa un contador de estadísticas."""
+	cache = frappe.cache()
+	cache.incr(cache.make_key(f"{SLOT_CACHE_STATS_KEY}:{counter}"))
+
+
+def _entry_key(
+	calendar_resource: str,
+	start_date: Any,
+	end_date: Any,
+	query: _SlotQuery = DEFAULT_QUERY
+) -> str:
+	return f"{SLOT_CACHE_KEY}:{query.key()}:{calendar_resource}:{start_date}:{end_date}"
+
+
+def _lock_key(
+	calendar_resource: str,
+	start_date: Any,
+	end_date: Any,
+	query: _SlotQuery = DEFAULT_QUERY
+) -> str:
+	return frappe.cache().make_key(
+		f"{SLOT_CACHE_KEY}:revalidate:{query.key()}:{calendar_resource}:{start_date}:{end_date}"
+	)
+
+
+def _filters_key(filters: Optional[SlotFilters]) -> str:
+	"""Representación estable de los filtros para la clave ("-" sin filtros)."""
+	if not filters or filters == SlotFilters():
+		return "-"
+
+	weekdays = ",".join(map(str, sorted(filters.weekdays))) if filters.weekdays is not None else ""
+	return "|".join((
+		weekdays,
+		str(filters.start_minute if filters.start_minute is not None else ""),
+		str(filters.end_minute if filters.end_minute is not None else ""),
+		str(filters.min_remaining),
+	))
@@ -0,0 +1,404 @@
+"""
+Slot Index
+
+Índice precalculado de slots (tabla "Slot Index Entry") para los Calendar
+Resources con use_slot_index: una fila por slot back-to-back (duración del
+resource) con su capacidad restante, en un horizonte móvil de
+SLOT_INDEX_HORIZON_DAYS días.
+
+- rebuild_slot_index: recalcula los slots de un rango de fechas de un resource.
+- enqueue_slot_index_rebuild: cambios de disponibilidad (plan, excepciones,
+  festivos, resource); saca las fechas de la cobertura ya y las reconstruye en
+  background tras el commit.
+- update_slot_index_for_appointment: cambios de un Appointment; recalcula solo
+  la capacidad de los slots que se solapan con la cita (antes y después del
+  cambio), en la misma transacción.
+- get_indexed_slots: lectura de un rango con una query sobre el índice
+  (calendar_resource, date, slot_start), si todas las fechas están cubiertas.
+  Las filas que toca un Draft ya expirado (todavía sin cancelar por
+  cleanup_expired_drafts) se recalculan al leer sin él.
+- rebuild_all_slot_indexes: job diario (hooks.py) que avanza el horizonte.
+
+Cobertura: un set en Redis por resource con las fechas indexadas. Una fecha
+fuera del set nunca se lee del índice (se calcula como siempre), así que
+perder Redis solo cuesta recálculos. Las fechas se agregan tras el commit de
+la reconstrucción.
+
+Los doc_events que disparan las actualizaciones están en doc_events.py.
+"""
+
+import frappe
+from frappe.utils import add_days, getdate, now_datetime, today
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Set, Union
+
+from .capacity import build_capacity_timeline, get_active_bookings
+from .intervals import from_epoch
+from .materialized import get_horizon
+from .slots import NO_FILTERS, _iter_capacity_remaining, _iter_slot_ranges
+from .timezones import get_resource_timezone, wall_to_epoch
+
+
+SLOT_INDEX_DOCTYPE = "Slot Index Entry"
+SLOT_INDEX_HORIZON_DAYS = 30
+SLOT_INDEX_COVERAGE_KEY = "meet_scheduling:slot_index_days"
+
+
+def get_indexed_slots(
+	calendar_resource: str,
+	start_date: Union[date, str],
+	end_date: Union[date, str],
+	min_remaining: int = 0
+) -> Optional[List[Dict[str, Any]]]:
+	"""
+	Slots de [start_date, end_date] leídos del índice, con el mismo formato que
+	generate_available_slots (duración del resource, sin paso deslizante).
+
+	Args:
+		calendar_resource: nombre del Calendar Resource
+		start_date: fecha inicial
+		end_date: fecha final
+		min_remaining: capacidad restante mínima (filtro en la query)
+
+	Returns:
+		list[dict] | None: None si alguna fecha no está indexada (el llamador
+		debe calcular los slots)
+	"""
+	start_date = getdate(start_date)
+	end_date = getdate(end_date)
+
+	# Fuera del horizonte (ej. días pasados) nunca se lee del índice
+	if get_horizon(start_date, end_date, SLOT_INDEX_HORIZON_DAYS) != (start_date, end_date):
+		return None
+
+	covered = _get_coverage(calendar_resource)
+	if any(str(day) not in covered for day in _iter_days(start_date, end_date)):
+		return None
+
+	expired_drafts = _get_expired_drafts(calendar_resource, start_date, end_date)
+
+	filters = {
+		"calendar_resource": calendar_resource,
+		"date": ["between", [start_date, end_date]],
+	}
+	if min_remaining and not expired_drafts:
+		filters["capacity_remaining"] = [">=", min_remaining]
+
+	rows = frappe.get_all(
+		SLOT_INDEX_DOCTYPE,
+		filters=filters,
+		fields=["date", "slot_start", "slot_end", "capacity_remaining"],
+		order_by="slot_start asc"
+	)
+
+	if expired_drafts:
+		# Los Drafts expirados que cleanup_expired_drafts todavía no canceló
+		# siguen contando en las filas: se recalculan sin ellos (sin escribir)
+		stale_rows = [
+			row for row in rows
+			if any(row.slot_start < appt.end_datetime and row.slot_end > appt.start_datetime for appt in expired_drafts)
+		]
+		for row, capacity_remaining in zip(stale_rows, _current_capacity(calendar_resource, stale_rows)):
+			row.capacity_remaining = capacity_remaining
+
+		if min_remaining:
+			rows = [row for row in rows if row.capacity_remaining >= min_remaining]
+
+	return [
+		{
+			"start": row.slot_start.strftime("%Y-%m-%d %H:%M:%S"),
+			"end": row.slot_end.strftime("%Y-%m-%d %H:%M:%S"),
+			"capacity_remaining": row.capacity_remaining,
+			"is_available": row.capacity_remaining > 0
+		}
+		for row in rows
+	]
+
+
+def rebuild_slot_index(
+	calendar_resource: str,
+	start_date: Optional[Union[date, str]] = None,
+	end_date: Optional[Union[date, str]] = None
+) -> int:
+	"""
+	Recalcula y guarda los slots de un resource para un rango de fechas.
+
+	Si el resource no tiene use_slot_index, solo borra lo que hubiera.
+
+	Args:
+		calendar_resource: nombre del Calendar Resource
+		start_date: fecha inicial (default: hoy)
+		end_date: fecha final (default: fin del horizonte)
+
+	Returns:
+		int: cantidad de slots guardados
+	"""
+	window = get_horizon(start_date, end_date, SLOT_INDEX_HORIZON_DAYS)
+	if not window or not frappe.db.exists("Calendar Resource", calendar_resource):
+		return 0
+
+	invalidate_slot_index(calendar_resource, *window)
+
+	resource = frappe.get_doc("Calendar Resource", calendar_resource)
+	if not resource.use_slot_index:
+		return 0
+
+	slot_seconds = (resource.slot_duration_minutes or 30) * 60
+	tz = get_resource_timezone(resource)
+	timestamp = now_datetime()
+	rows = []
+
+	for day, first_slot_start, slot_count, timeline in _iter_slot_ranges(
+		resource, window[0], window[1], slot_seconds, slot_seconds, tz, NO_FILTERS
+	):
+		for slot_start, capacity_remaining in _iter_capacity_remaining(
+			first_slot_start, slot_count, slot_seconds, slot_seconds, timeline
+		):
+			rows.append((
+				frappe.generate_hash(length=10),
+				timestamp,
+				timestamp,
+				"Administrator",
+				"Administrator",
+				resource.name,
+				day,
+				from_epoch(slot_start, tz).replace(tzinfo=None),
+				from_epoch(slot_start + slot_seconds, tz).replace(tzinfo=None),
+				capacity_remaining
+			))
+
+	frappe.db.bulk_insert(
+		SLOT_INDEX_DOCTYPE,
+		fields=[
+			"name", "creation", "modified", "owner", "modified_by",
+			"calendar_resource", "date", "slot_start", "slot_end", "capacity_remaining"
+		],
+		values=rows
+	)
+
+	# Las fechas pasan a estar cubiertas recién cuando las filas son visibles
+	days = [str(day) for day in _iter_days(*window)]
+	frappe.db.after_commit.add(lambda: _add_coverage(resource.name, days))
+
+	return len(rows)
+
+
+def invalidate_slot_index(
+	calendar_resource: str,
+	start_date: Optional[Union[date, str]] = None,
+	end_date: Optional[Union[date, str]] = None
+) -> None:
+	"""
+	Saca las fechas de la cobertura y borra sus filas (todas, o solo el rango indicado).
+	"""
+	filters = {"calendar_resource": calendar_resource}
+
+	if start_date and end_date:
+		_remove_coverage(calendar_resource, [str(day) for day in _iter_days(getdate(start_date), getdate(end_date))])
+		filters["date"] = ["between", [getdate(start_date), getdate(end_date)]]
+	else:
+		frappe.cache().delete_value(_coverage_key(calendar_resource))
+		if start_date:
+			filters["date"] = [">=", getdate(start_date)]
+		elif end_date:
+			filters["date"] = ["<=", getdate(end_date)]
+
+	frappe.db.delete(SLOT_INDEX_DOCTYPE, filters)
+
+
+def enqueue_slot_index_rebuild(
+	calendar_resource: str,
+	start_date: Optional[Union[date, str]] = None,
+	end_date: Optional[Union[date, str]] = None
+) -> None:
+	"""
+	Cambio de disponibilidad: saca el rango de la cobertura de inmediato y
+	encola su reconstrucción tras el commit.
+
+	Mientras el job no corre, las lecturas del rango calculan los slots, así
+	nunca se sirve un índice desactualizado. Si el resource no usa el índice,
+	solo se borran sus filas.
+	"""
+	window = get_horizon(start_date, end_date, SLOT_INDEX_HORIZON_DAYS)
+	if not window:
+		return
+
+	if not frappe.db.get_value("Calendar Resource", calendar_resource, "use_slot_index"):
+		invalidate_slot_index(calendar_resource)
+		return
+
+	_remove_coverage(calendar_resource, [str(day) for day in _iter_days(*window)])
+	frappe.enqueue(
+		"meet_scheduling.meet_scheduling.scheduling.slot_index.rebuild_slot_index",
+		queue="long",
+		enqueue_after_commit=True,
+		calendar_resource=calendar_resource,
+		start_date=str(window[0]),
+		end_date=str(window[1])
+	)
+
+
+def update_slot_index_for_appointment(doc: Any, deleted: bool = False) -> None:
+	"""
+	Recalcula la capacidad restante de los slots indexados que se solapan con
+	la cita, antes y después del cambio (también si cambió de resource).
+
+	Las citas que cuentan son las mismas que en generate_available_slots
+	(get_active_bookings: sin Drafts expirados). on_update y on_submit corren
+	ambos en un submit: se recalcula una sola vez por save (doc.modified).
+
+	Args:
+		doc: Appointment
+		deleted: True en on_trash (la cita todavía está en la DB y se excluye)
+	"""
+	if not deleted:
+		if doc.flags.slot_index_synced_at == doc.modified:
+			return
+		doc.flags.slot_index_synced_at = doc.modified
+
+	affected = [doc]
+
+	before = doc.get_doc_before_save()
+	if before:
+		affected.append(before)
+
+	for appt in affected:
+		if appt.calendar_resource and appt.start_datetime and appt.end_datetime:
+			_refresh_capacity(
+				appt.calendar_resource,
+				appt.start_datetime,
+				appt.end_datetime,
+				exclude_appointment=doc.name if deleted else None
+			)
+
+
+def rebuild_all_slot_indexes() -> int:
+	"""
+	Job diario: reconstruye el horizonte de los resources con use_slot_index
+	(elimina los días pasados). Se ejecuta vía scheduler (configurado en hooks.py).
+
+	Returns:
+		int: cantidad de slots guardados
+	"""
+	frappe.db.delete(SLOT_INDEX_DOCTYPE, {"date": ["<", getdate(today())]})
+
+	total = 0
+	resources = frappe.get_all(
+		"Calendar Resource",
+		filters={"is_active": 1, "use_slot_index": 1},
+		pluck="name"
+	)
+
+	for resource_name in resources:
+		try:
+			# Descarta también la cobertura de días ya pasados
+			invalidate_slot_index(resource_name)
+			total += rebuild_slot_index(resource_name)
+			frappe.db.commit()
+		except Exception as e:
+			frappe.db.rollback()
+			frappe.log_error(
+				f"Error reconstruyendo el índice de slots de {resource_name}: {str(e)}",
+				"Rebuild Slot Index"
+			)
+
+	return total
+
+
+def _refresh_capacity(
+	calendar_resource: str,
+	start_datetime: Any,
+	end_datetime: Any,
+	exclude_appointment: Optional[str] = None
+) -> None:
+	"""Recalcula capacity_remaining de las filas que se solapan con [start, end)."""
+	rows = frappe.get_all(
+		SLOT_INDEX_DOCTYPE,
+		filters={
+			"calendar_resource": calendar_resource,
+			"slot_start": ["<", end_datetime],
+			"slot_end": [">", start_datetime],
+		},
+		fields=["name", "date", "slot_start", "slot_end", "capacity_remaining"]
+	)
+	if not rows:
+		return
+
+	for row, capacity_remaining in zip(rows, _current_capacity(calendar_resource, rows, exclude_appointment)):
+		if capacity_remaining != row.capacity_remaining:
+			frappe.db.set_value(
+				SLOT_INDEX_DOCTYPE, row.name, "capacity_remaining", capacity_remaining,
+				update_modified=False
+			)
+
+
+def _current_capacity(
+	calendar_resource: str,
+	rows: List[Any],
+	exclude_appointment: Optional[str] = None
+) -> List[int]:
+	"""
+	capacity_remaining de cada fila según las citas activas actuales
+	(get_active_bookings descarta los Drafts expirados).
+	"""
+	if not rows:
+		return []
+
+	resource = frappe.get_doc("Calendar Resource", calendar_resource)
+	tz = get_resource_timezone(resource)
+	first_date = min(row.date for row in rows)
+	last_date = max(row.date for row in rows)
+
+	timeline = build_capacity_timeline(
+		resource, first_date, last_date,
+		get_active_bookings(calendar_resource, first_date, last_date, tz, exclude_appointment)
+	)
+
+	return [
+		max(0, timeline.free_seats(wall_to_epoch(row.slot_start, tz), wall_to_epoch(row.slot_end, tz)))
+		for row in rows
+	]
+
+
+def _get_expired_drafts(calendar_resource: str, start_date: date, end_date: date) -> List[Any]:
+	"""Drafts del rango con draft_expires_at vencido que todavía no se cancelaron."""
+	return frappe.get_all(
+		"Appointment",
+		filters={
+			"calendar_resource": calendar_resource,
+			"status": "Draft",
+			"draft_expires_at": ["<", now_datetime()],
+			"start_datetime": ["<=", f"{end_date} 23:59:59"],
+			"end_datetime": [">=", f"{start_date} 00:00:00"],
+		},
+		fields=["start_datetime", "end_datetime"]
+	)
+
+
+def _iter_days(start_date: date, end_date: date) -> Iterator[date]:
+	current_date = start_date
+	while current_date <= end_date:
+		yield current_date
+		current_date = add_days(current_date, 1)
+
+
+def _coverage_key(calendar_resource: str) -> str:
+	return f"{SLOT_INDEX_COVERAGE_KEY}:{calendar_resource}"
+
+
+def _get_coverage(calendar_resource: str) -> Set[str]:
+	"""Fechas (YYYY-MM-DD) indexadas de un resource."""
+	return {
+		value.decode() if isinstance(value, bytes) else value
+		for value in frappe.cache().smembers(_coverage_key(calendar_resource))
+	}
+
+
+def _add_coverage(calendar_resource: str, days: List[str]) -> None:
+	if days:
+		frappe.cache().sadd(_coverage_key(calendar_resource), *days)
+
+
+def _remove_coverage(calendar_resource: str, days: List[str]) -> None:
+	if days:
+		frappe.cache().srem(_coverage_key(calendar_resource), *days)
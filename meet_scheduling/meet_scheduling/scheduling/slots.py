@@ -5,27 +5,87 @@ Generates discrete time slots for UI display, considering:
 - Effective availability
 - Existing appointments
 - Capacity remaining
+
+Two output formats:
+- full: one dict per slot with formatted local datetimes (generate_available_slots).
+- compact: one run per availability interval with the start epoch, the slot
+  length and the remaining capacity of each slot (generate_slot_runs). No
+  per-slot dicts or datetime formatting.
+
+Slots are back-to-back by default. With step_minutes, candidate starts are
+placed every step_minutes (sliding window) and each lasts duration_minutes.
+
+Remaining capacity is the minimum of free seats over the slot, an O(1)
+range-min query on the chunk's CapacityTimeline (per-slot Availability Slot
+capacity with the resource capacity as fallback, minus concurrent bookings).
+
+A third output, generate_availability_summary, aggregates per day (total and
+free slot counts, first free start) for month views, also without building
+per-slot dicts. For back-to-back slots on the 15-minute grid it counts with
+per-day bitsets (bitsets.py) and falls back to the per-slot loop on days that
+don't fit the grid.
+
+All accept SlotFilters (weekdays, time-of-day window, minimum remaining
+capacity). Filters are applied inside the generation loop: excluded days are
+never computed and slots outside the window are never expanded.
 """
 
 import frappe
-from datetime import timedelta, date
-from frappe.utils import now_datetime, get_datetime
-from typing import List, Dict, Union, Any
-from .availability import get_effective_availability
+from datetime import date, tzinfo
+from typing import Callable, Iterator, List, Dict, NamedTuple, Optional, Tuple, Union, Any
+from .availability import iter_date_chunks, iter_effective_intervals
+from .bitsets import SlotCounts, build_day_bitset, count_slots, supports_bitsets
+from .timezones import get_resource_timezone, local_to_epoch
+from .intervals import Interval, from_epoch
+from .capacity import CapacityTimeline, build_capacity_timeline, get_active_bookings, get_max_seats
+
+
+class SlotFilters(NamedTuple):
+	"""
+	Filtros de consulta de slots.
+
+	- weekdays: días de la semana incluidos (0 = lunes); None = todos.
+	- start_minute / end_minute: ventana horaria local (minutos desde medianoche);
+	  solo se incluyen slots completamente dentro de [start_minute, end_minute).
+	- min_capacity_remaining: capacidad restante mínima del slot.
+	- only_available: solo slots con capacidad restante (equivale a mínimo 1).
+	"""
+
+	weekdays: Optional[Tuple[int, ...]] = None
+	start_minute: Optional[int] = None
+	end_minute: Optional[int] = None
+	min_capacity_remaining: int = 0
+	only_available: bool = False
+
+	@property
+	def min_remaining(self) -> int:
+		"""Capacidad restante mínima efectiva de un slot incluido."""
+		return max(self.min_capacity_remaining or 0, 1 if self.only_available else 0)
+
+
+NO_FILTERS = SlotFilters()
 
 
 def generate_available_slots(
 	calendar_resource: str,
 	start_date: Union[date, str],
-	end_date: Union[date, str]
+	end_date: Union[date, str],
+	filters: Optional[SlotFilters] = None,
+	duration_minutes: Optional[int] = None,
+	step_minutes: Optional[int] = None
 ) -> List[Dict[str, Any]]:
 	"""
 	Genera slots discretos disponibles para UI.
 
+	Materializa iter_available_slots en una lista.
+
 	Args:
 		calendar_resource: nombre del Calendar Resource
 		start_date: fecha inicial
 		end_date: fecha final
+		filters: SlotFilters opcionales
+		duration_minutes: duración de cada slot (default: slot_duration_minutes del resource)
+		step_minutes: separación entre inicios de slot (default: la duración, back-to-back)
 
 	Returns:
 		list[dict]: [
@@ -37,122 +97,407 @@ def generate_available_slots(
 			},
 			...
 		]
+	"""
+	return list(iter_available_slots(
+		calendar_resource, start_date, end_date,
+		slot_duration_minutes=duration_minutes,
+		filters=filters,
+		step_minutes=step_minutes
+	))
+
+
+def iter_available_slots(
+	calendar_resource: str,
+	start_date: Union[date, str],
+	end_date: Union[date, str],
+	slot_duration_minutes: Optional[int] = None,
+	chunk_days: Optional[int] = None,
+	filters: Optional[SlotFilters] = None,
+	step_minutes: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+	"""
+	Genera slots discretos de forma perezosa (pipeline de generadores).
+
+	El rango se procesa por bloques (AVAILABILITY_CHUNK_DAYS): por cada bloque se
+	pre-cargan los appointments en UNA query (CapacityTimeline del bloque) y la
+	disponibilidad se calcula día a día. Un consumidor que se detiene antes (ej. "próximo slot libre") no paga el
+	resto del horizonte.
+
+	Args:
+		calendar_resource: nombre del Calendar Resource
+		start_date: fecha inicial
+		end_date: fecha final
+		slot_duration_minutes: duración de cada slot (default: la del resource)
+		chunk_days: días por bloque (default: AVAILABILITY_CHUNK_DAYS)
+		filters: SlotFilters opcionales
+		step_minutes: separación entre inicios de slot (default: la duración)
 
-	Performance:
-		Pre-carga todos los appointments del rango en UNA sola query y verifica
-		overlaps en memoria. Anteriormente hacía una query por slot (N+1).
+	Yields:
+		dict: {"start", "end", "capacity_remaining", "is_available"}
 	"""
+	filters = filters or NO_FILTERS
+	min_remaining = filters.min_remaining
+
 	# 1. Obtener Calendar Resource (única query inicial)
 	resource = frappe.get_doc("Calendar Resource", calendar_resource)
-	slot_duration_minutes = resource.slot_duration_minutes or 30
-	capacity = resource.capacity or 1
+	slot_seconds = (slot_duration_minutes or resource.slot_duration_minutes or 30) * 60
+	step_seconds = step_minutes * 60 if step_minutes else slot_seconds
+	tz = get_resource_timezone(resource)
 
-	# 2. Obtener availability efectiva para el rango
-	availability_intervals = get_effective_availability(
-		calendar_resource, start_date, end_date
-	)
+	# Ningún slot puede superar la mayor capacidad del resource
+	if min_remaining > get_max_seats(resource):
+		return
 
-	# 3. Pre-cargar TODOS los appointments del rango (1 sola query)
-	active_appointments = _get_active_appointments_in_range(
-		calendar_resource, start_date, end_date
-	)
+	for _day, first_slot_start, slot_count, timeline in _iter_slot_ranges(
+		resource, start_date, end_date, slot_seconds, step_seconds, tz, filters, chunk_days
+	):
+		for slot_start, capacity_remaining in _iter_capacity_remaining(
+			first_slot_start, slot_count, slot_seconds, step_seconds, timeline
+		):
+			if capacity_remaining < min_remaining:
+				continue
 
-	slots = []
+			# Convertir a datetime solo en el borde de la API
+			yield {
+				"start": from_epoch(slot_start, tz).strftime("%Y-%m-%d %H:%M:%S"),
+				"end": from_epoch(slot_start + slot_seconds, tz).strftime("%Y-%m-%d %H:%M:%S"),
+				"capacity_remaining": capacity_remaining,
+				"is_available": capacity_remaining > 0
+			}
 
-	# 4. Para cada intervalo disponible, generar slots discretos
-	for date_intervals in availability_intervals.values():
-		for interval in date_intervals:
-			interval_start = interval["start"]
-			interval_end = interval["end"]
 
-			current_slot_start = interval_start
+def generate_slot_runs(
+	calendar_resource: str,
+	start_date: Union[date, str],
+	end_date: Union[date, str],
+	filters: Optional[SlotFilters] = None,
+	duration_minutes: Optional[int] = None,
+	step_minutes: Optional[int] = None
+) -> List[Dict[str, Any]]:
+	"""
+	Genera los slots en formato compacto (runs por intervalo disponible).
+
+	Materializa iter_slot_runs en una lista.
+
+	Returns:
+		list[dict]: [
+			{
+				"date": "2026-01-15",
+				"start_epoch": 1768485600,
+				"step_seconds": 1800,
+				"duration_seconds": 1800,
+				"capacity_remaining": [1, 0, 1, 1]
+			},
+			...
+		]
+	"""
+	return list(iter_slot_runs(
+		calendar_resource, start_date, end_date,
+		slot_duration_minutes=duration_minutes,
+		filters=filters,
+		step_minutes=step_minutes
+	))
+
 
-			while current_slot_start < interval_end:
-				current_slot_end = current_slot_start + timedelta(minutes=slot_duration_minutes)
+def iter_slot_runs(
+	calendar_resource: str,
+	start_date: Union[date, str],
+	end_date: Union[date, str],
+	slot_duration_minutes: Optional[int] = None,
+	chunk_days: Optional[int] = None,
+	filters: Optional[SlotFilters] = None,
+	step_minutes: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+	"""
+	Igual que iter_available_slots, pero agrupa los slots de cada intervalo
+	disponible en un run.
 
-				if current_slot_end > interval_end:
-					break
+	El slot i de un run es [start_epoch + i * step_seconds, ... + duration_seconds);
+	está disponible si capacity_remaining[i] > 0. Los intervalos donde no entra
+	ni un slot completo se omiten. Con un filtro de capacidad, el run se parte
+	donde hay slots excluidos.
 
-				# Verificar overlaps en memoria (sin queries adicionales)
-				overlap_count = _count_overlaps_in_memory(
-					active_appointments, current_slot_start, current_slot_end
-				)
+	Yields:
+		dict: {"date", "start_epoch", "step_seconds", "duration_seconds", "capacity_remaining"}
+	"""
+	filters = filters or NO_FILTERS
+	min_remaining = filters.min_remaining
 
-				capacity_remaining = max(0, capacity - overlap_count)
-				is_available = capacity_remaining > 0
+	resource = frappe.get_doc("Calendar Resource", calendar_resource)
+	slot_seconds = (slot_duration_minutes or resource.slot_duration_minutes or 30) * 60
+	step_seconds = step_minutes * 60 if step_minutes else slot_seconds
+	tz = get_resource_timezone(resource)
 
-				slots.append({
-					"start": current_slot_start.strftime("%Y-%m-%d %H:%M:%S"),
-					"end": current_slot_end.strftime("%Y-%m-%d %H:%M:%S"),
-					"capacity_remaining": capacity_remaining,
-					"is_available": is_available
-				})
+	if min_remaining > get_max_seats(resource):
+		return
 
-				current_slot_start = current_slot_end
+	for day, first_slot_start, slot_count, timeline in _iter_slot_ranges(
+		resource, start_date, end_date, slot_seconds, step_seconds, tz, filters, chunk_days
+	):
+		remaining = [
+			capacity_remaining
+			for _slot_start, capacity_remaining in _iter_capacity_remaining(
+				first_slot_start, slot_count, slot_seconds, step_seconds, timeline
+			)
+		]
 
-	return slots
+		# Partir en tramos consecutivos de slots que cumplen el mínimo
+		run_first = None
+		for i, capacity_remaining in enumerate(remaining + [-1]):
+			if capacity_remaining >= min_remaining:
+				if run_first is None:
+					run_first = i
+				continue
+			if run_first is not None:
+				yield {
+					"date": day.isoformat(),
+					"start_epoch": first_slot_start + run_first * step_seconds,
+					"step_seconds": step_seconds,
+					"duration_seconds": slot_seconds,
+					"capacity_remaining": remaining[run_first:i]
+				}
+				run_first = None
 
 
-def _get_active_appointments_in_range(
+def generate_availability_summary(
 	calendar_resource: str,
 	start_date: Union[date, str],
-	end_date: Union[date, str]
+	end_date: Union[date, str],
+	filters: Optional[SlotFilters] = None,
+	duration_minutes: Optional[int] = None,
+	step_minutes: Optional[int] = None
 ) -> List[Dict[str, Any]]:
 	"""
-	Pre-carga todos los appointments activos del rango con una sola query.
+	Resumen por día para vistas de mes: slots totales, libres y primer inicio libre.
+
+	La cantidad de slots sale de la aritmética sobre cada intervalo (_slot_range)
+	y la capacidad de cada uno del timeline del bloque; no se arman dicts por
+	slot. Con slots back-to-back múltiplos de 15 min y sin ventana horaria, los
+	días que caen en la grilla se cuentan con bitsets (build_day_bitset +
+	count_slots); el resultado es el mismo. Un slot es libre si su capacidad
+	restante es al menos max(1, filters.min_remaining). Los días sin slots se
+	omiten.
 
-	Activos = Draft no expirados + Confirmed.
+	Returns:
+		list[dict]: [
+			{
+				"date": "2026-01-15",
+				"total_slots": 16,
+				"free_slots": 12,
+				"first_free": "2026-01-15 09:00:00"   # None si no hay libres
+			},
+			...
+		]
 	"""
-	if isinstance(start_date, str):
-		start_date = get_datetime(start_date).date()
-	if isinstance(end_date, str):
-		end_date = get_datetime(end_date).date()
+	filters = filters or NO_FILTERS
+	min_free = max(filters.min_remaining, 1)
 
-	# Rango ampliado: incluye un margen para citas que cruzan medianoche
-	range_start = f"{start_date} 00:00:00"
-	range_end = f"{end_date} 23:59:59"
+	resource = frappe.get_doc("Calendar Resource", calendar_resource)
+	slot_seconds = (duration_minutes or resource.slot_duration_minutes or 30) * 60
+	step_seconds = step_minutes * 60 if step_minutes else slot_seconds
+	tz = get_resource_timezone(resource)
 
-	appointments = frappe.get_all(
-		"Appointment",
-		filters={
-			"calendar_resource": calendar_resource,
-			"status": ["in", ["Draft", "Confirmed"]],
-			"start_datetime": ["<=", range_end],
-			"end_datetime": [">=", range_start],
-		},
-		fields=["name", "status", "draft_expires_at", "start_datetime", "end_datetime"],
+	use_bitsets = (
+		supports_bitsets(slot_seconds, step_seconds)
+		and filters.start_minute is None
+		and filters.end_minute is None
 	)
 
-	# Filtrar Drafts expirados
-	current_time = now_datetime()
-	active = []
+	summaries = []
 
-	for appt in appointments:
-		if appt.status == "Draft" and appt.draft_expires_at:
-			expires_at = get_datetime(appt.draft_expires_at)
-			if expires_at < current_time:
-				continue
+	for day, date_intervals, get_timeline in _iter_days(resource, start_date, end_date, tz, filters.weekdays):
+		counts = None
+		if use_bitsets and date_intervals:
+			day_bitset = build_day_bitset(day, date_intervals, get_timeline(), tz, min_free)
+			if day_bitset is not None:
+				counts = count_slots(day_bitset, slot_seconds // 60, tz)
+
+		if counts is None:
+			counts = _count_day_slots(
+				day, date_intervals, get_timeline, slot_seconds, step_seconds, tz, filters, min_free
+			)
+
+		if not counts.total:
+			continue
 
-		active.append({
-			"name": appt.name,
-			"start_datetime": get_datetime(appt.start_datetime),
-			"end_datetime": get_datetime(appt.end_datetime),
+		summaries.append({
+			"date": day.isoformat(),
+			"total_slots": counts.total,
+			"free_slots": counts.free,
+			"first_free": (
+				from_epoch(counts.first_free, tz).strftime("%Y-%m-%d %H:%M:%S")
+				if counts.first_free is not None else None
+			)
 		})
 
-	return active
+	return summaries
+
+
+def _count_day_slots(
+	day: date,
+	date_intervals: List[Interval],
+	get_timeline: Callable[[], CapacityTimeline],
+	slot_seconds: int,
+	step_seconds: int,
+	tz: tzinfo,
+	filters: SlotFilters,
+	min_free: int
+) -> SlotCounts:
+	"""Slots totales y libres de un día, slot por slot (range-min del timeline por slot)."""
+	window_start, window_end = _day_window(day, filters, tz)
+	total = free = 0
+	first_free = None
+
+	for interval_start, interval_end in date_intervals:
+		first_slot_start, slot_count = _slot_range(
+			interval_start, interval_end, slot_seconds, window_start, window_end, step_seconds
+		)
+		if not slot_count:
+			continue
+
+		total += slot_count
+
+		for slot_start, capacity_remaining in _iter_capacity_remaining(
+			first_slot_start, slot_count, slot_seconds, step_seconds, get_timeline()
+		):
+			if capacity_remaining < min_free:
+				continue
+
+			free += 1
+			if first_free is None:
+				first_free = slot_start
+
+	return SlotCounts(total, free, first_free)
+
+
+def _iter_days(
+	resource: Any,
+	start_date: Union[date, str],
+	end_date: Union[date, str],
+	tz: tzinfo,
+	weekdays: Optional[Tuple[int, ...]] = None,
+	chunk_days: Optional[int] = None
+) -> Iterator[Tuple[date, List[Interval], Callable[[], CapacityTimeline]]]:
+	"""
+	Recorre los días con su disponibilidad efectiva (los excluidos por weekday
+	no se calculan).
+
+	El timeline de capacidad es uno por bloque y se arma (1 query de
+	appointments) recién cuando algún día lo pide.
+
+	Yields:
+		tuple: (date, intervalos epoch del día, función que retorna el timeline del bloque)
+	"""
+	for chunk_start, chunk_end in iter_date_chunks(start_date, end_date, chunk_days):
+		timelines: List[CapacityTimeline] = []
+
+		def get_timeline(chunk_start=chunk_start, chunk_end=chunk_end, timelines=timelines) -> CapacityTimeline:
+			if not timelines:
+				timelines.append(build_capacity_timeline(
+					resource, chunk_start, chunk_end,
+					get_active_bookings(resource.name, chunk_start, chunk_end, tz)
+				))
+			return timelines[0]
 
+		for day, date_intervals in iter_effective_intervals(
+			resource, chunk_start, chunk_end, weekdays=weekdays
+		):
+			yield day, date_intervals, get_timeline
 
-def _count_overlaps_in_memory(
-	appointments: List[Dict[str, Any]],
-	slot_start,
-	slot_end,
-) -> int:
+
+def _day_window(day: date, filters: SlotFilters, tz: tzinfo) -> Tuple[Optional[int], Optional[int]]:
+	"""Ventana horaria de los filtros en epochs del día (None = sin límite)."""
+	window_start = (
+		local_to_epoch(day, filters.start_minute, tz) if filters.start_minute is not None else None
+	)
+	window_end = (
+		local_to_epoch(day, filters.end_minute, tz) if filters.end_minute is not None else None
+	)
+	return window_start, window_end
+
+
+def _iter_slot_ranges(
+	resource: Any,
+	start_date: Union[date, str],
+	end_date: Union[date, str],
+	slot_seconds: int,
+	step_seconds: int,
+	tz: tzinfo,
+	filters: SlotFilters,
+	chunk_days: Optional[int] = None
+) -> Iterator[Tuple[date, int, int, CapacityTimeline]]:
+	"""
+	Recorre los intervalos disponibles aplicando los filtros de día y horario.
+
+	Los slots de un intervalo empiezan cada step_seconds desde su inicio y
+	duran slot_seconds (se descartan los que no entran completos). La ventana
+	horaria se resuelve con aritmética sobre ese índice, sin expandir los
+	slots excluidos.
+
+	Yields:
+		tuple: (date, inicio epoch del primer slot, cantidad de slots, timeline del bloque)
+	"""
+	for day, date_intervals, get_timeline in _iter_days(
+		resource, start_date, end_date, tz, filters.weekdays, chunk_days
+	):
+		window_start, window_end = _day_window(day, filters, tz)
+
+		for interval_start, interval_end in date_intervals:
+			first_slot_start, slot_count = _slot_range(
+				interval_start, interval_end, slot_seconds, window_start, window_end, step_seconds
+			)
+			if not slot_count:
+				continue
+
+			yield day, first_slot_start, slot_count, get_timeline()
+
+
+def _slot_range(
+	interval_start: int,
+	interval_end: int,
+	slot_seconds: int,
+	window_start: Optional[int] = None,
+	window_end: Optional[int] = None,
+	step_seconds: Optional[int] = None
+) -> Tuple[int, int]:
 	"""
-	Cuenta overlaps en memoria contra una lista pre-cargada.
-	Overlap: appt.start < slot_end AND appt.end > slot_start.
+	Slots completos de un intervalo dentro de la ventana [window_start, window_end).
+
+	El slot k es [interval_start + k * step, ... + slot_seconds); por defecto
+	step = slot_seconds (back-to-back).
+
+	Returns:
+		tuple: (inicio epoch del primer slot, cantidad de slots)
+	"""
+	step_seconds = step_seconds or slot_seconds
+	limit = interval_end if window_end is None else min(interval_end, window_end)
+
+	first = 0
+	if window_start is not None and window_start > interval_start:
+		first = -(-(window_start - interval_start) // step_seconds)
+
+	# Último k con interval_start + k * step + slot_seconds <= limit
+	if limit - interval_start < slot_seconds:
+		return interval_start, 0
+	last = (limit - interval_start - slot_seconds) // step_seconds
+
+	return interval_start + first * step_seconds, max(0, last - first + 1)
+
+
+def _iter_capacity_remaining(
+	first_slot_start: int,
+	slot_count: int,
+	slot_seconds: int,
+	step_seconds: int,
+	timeline: CapacityTimeline
+) -> Iterator[Tuple[int, int]]:
+	"""
+	Capacidad restante de cada slot de un rango: mínimo de asientos libres
+	en [inicio, fin), O(1) por slot (range-min del timeline).
+
+	Yields:
+		tuple: (inicio epoch del slot, capacidad restante)
 	"""
-	count = 0
-	for appt in appointments:
-		if appt["start_datetime"] < slot_end and appt["end_datetime"] > slot_start:
-			count += 1
-	return count
+	for k in range(slot_count):
+		slot_start = first_slot_start + k * step_seconds
+		yield slot_start, max(0, timeline.free_seats(slot_start, slot_start + slot_seconds))
@@ -11,6 +11,35 @@ from frappe.utils import now_datetime, add_to_date
 
 DRAFT_FALLBACK_MAX_AGE_HOURS = 24
 
+# Queries de los jobs (también las usa benchmarks/check_appointment_indexes.py
+# para verificar con EXPLAIN que usan los índices de Appointment)
+EXPIRED_DRAFTS_QUERY = """
+	SELECT name, calendar_resource, start_datetime, end_datetime, draft_expires_at, creation
+	FROM `tabAppointment`
+	WHERE status = 'Draft'
+	AND docstatus = 0
+	AND (
+		(draft_expires_at IS NOT NULL AND draft_expires_at < %(now)s)
+		OR (draft_expires_at IS NULL AND start_datetime < %(now)s)
+		OR (draft_expires_at IS NULL AND creation < %(fallback_cutoff)s)
+	)
+"""
+
+UPCOMING_CONFIRMED_QUERY = """
+	SELECT name
+	FROM `tabAppointment`
+	WHERE status = 'Confirmed'
+	AND start_datetime >= %(lead_start)s
+	AND start_datetime < %(lead_end)s
+"""
+
+PAST_CONFIRMED_QUERY = """
+	SELECT name
+	FROM `tabAppointment`
+	WHERE status = 'Confirmed'
+	AND end_datetime < %(now)s
+"""
+
 
 def cleanup_expired_drafts() -> int:
 	"""
@@ -30,17 +59,11 @@ def cleanup_expired_drafts() -> int:
 	fallback_cutoff = add_to_date(current_time, hours=-DRAFT_FALLBACK_MAX_AGE_HOURS)
 
 	# 1. Buscar Drafts expirados con cualquiera de las 3 condiciones
-	expired_drafts = frappe.db.sql("""
-		SELECT name, calendar_resource, start_datetime, end_datetime, draft_expires_at, creation
-		FROM `tabAppointment`
-		WHERE status = 'Draft'
-		AND docstatus = 0
-		AND (
-			(draft_expires_at IS NOT NULL AND draft_expires_at < %(now)s)
-			OR (draft_expires_at IS NULL AND start_datetime < %(now)s)
-			OR (draft_expires_at IS NULL AND creation < %(fallback_cutoff)s)
-		)
-	""", {"now": current_time, "fallback_cutoff": fallback_cutoff}, as_dict=True)
+	expired_drafts = frappe.db.sql(
+		EXPIRED_DRAFTS_QUERY,
+		{"now": current_time, "fallback_cutoff": fallback_cutoff},
+		as_dict=True
+	)
 
 	cancelled_count = 0
 
@@ -122,13 +145,11 @@ def send_appointment_reminders() -> int:
 	lead_start = add_to_date(current_time, hours=REMINDER_LEAD_HOURS)
 	lead_end = add_to_date(lead_start, minutes=REMINDER_WINDOW_MINUTES)
 
-	upcoming = frappe.db.sql("""
-		SELECT name
-		FROM `tabAppointment`
-		WHERE status = 'Confirmed'
-		AND start_datetime >= %(lead_start)s
-		AND start_datetime < %(lead_end)s
-	""", {"lead_start": lead_start, "lead_end": lead_end}, as_dict=True)
+	upcoming = frappe.db.sql(
+		UPCOMING_CONFIRMED_QUERY,
+		{"lead_start": lead_start, "lead_end": lead_end},
+		as_dict=True
+	)
 
 	sent_count = 0
 
@@ -167,12 +188,7 @@ def auto_complete_past_appointments() -> int:
 	"""
 	current_time = now_datetime()
 
-	past_confirmed = frappe.db.sql("""
-		SELECT name
-		FROM `tabAppointment`
-		WHERE status = 'Confirmed'
-		AND end_datetime < %s
-	""", (current_time,), as_dict=True)
+	past_confirmed = frappe.db.sql(PAST_CONFIRMED_QUERY, {"now": current_time}, as_dict=True)
 
 	completed_count = 0
 
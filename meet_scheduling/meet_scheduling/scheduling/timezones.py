@@ -0,0 +1,188 @@
+"""
+Timezone Service
+
+Resolución de timezones de Calendar Resources y conversión hora local → epoch UTC.
+
+- get_resource_timezone: tzinfo de un resource (doc o nombre), con caché por
+  resource en Redis (nombre de la timezone) y por proceso (objeto tzinfo).
+- local_to_epoch / wall_to_epoch / localize: convierten hora local a UTC usando
+  una tabla de transiciones precalculada por (timezone, año), sin llamar a
+  tz.localize por cada límite de slot.
+
+Horas locales en transiciones DST (determinístico, igual que fold=0 de PEP 495):
+- Hueco (ej. 02:30 cuando el reloj salta de 02:00 a 03:00): se usa el offset
+  previo a la transición, lo que equivale a correr la hora hacia adelante (03:30).
+- Ambigüedad (ej. 01:30 cuando el reloj vuelve de 02:00 a 01:00): se toma la
+  primera ocurrencia (offset previo a la transición).
+"""
+
+import frappe
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, tzinfo
+from typing import Any, Dict, List, NamedTuple, Tuple, Union
+import pytz
+
+from .intervals import from_epoch
+
+
+RESOURCE_TIMEZONE_CACHE_KEY = "meet_scheduling:resource_timezone"
+
+_EPOCH = datetime(1970, 1, 1)
+_SAMPLE_SECONDS = 86400
+
+# Caché por proceso: {tz_name: tzinfo} y {(tz_key, year): TransitionTable}
+_timezone_cache: Dict[str, tzinfo] = {}
+_transition_cache: Dict[Tuple[str, int], "TransitionTable"] = {}
+
+
+class TransitionTable(NamedTuple):
+	"""
+	Offsets UTC de una timezone durante un año, en coordenadas de hora local.
+
+	Para una hora local expresada como "segundos epoch como si fuera UTC",
+	offsets[bisect_right(boundaries, local_seconds)] es su offset en segundos.
+	"""
+
+	boundaries: Tuple[int, ...]
+	offsets: Tuple[int, ...]
+
+
+def resolve_timezone_name(tz_name: str) -> tzinfo:
+	"""
+	Resuelve un nombre de timezone a tzinfo (con caché por proceso).
+
+	Soporta el valor especial "system timezone". Si es inválida, usa UTC.
+	"""
+	tz_name = tz_name or "UTC"
+
+	tz = _timezone_cache.get(tz_name)
+	if tz is not None:
+		return tz
+
+	resolved_name = frappe.utils.get_system_timezone() if tz_name == "system timezone" else tz_name
+
+	try:
+		tz = pytz.timezone(resolved_name)
+	except Exception:
+		frappe.log_error(f"Invalid timezone '{resolved_name}', usando UTC", "Resolve Timezone")
+		tz = pytz.UTC
+
+	# "system timezone" depende de System Settings: no se cachea por proceso
+	if tz_name != "system timezone":
+		_timezone_cache[tz_name] = tz
+
+	return tz
+
+
+def get_resource_timezone(calendar_resource: Union[str, Any]) -> tzinfo:
+	"""
+	Obtiene la timezone de un Calendar Resource (doc o nombre).
+
+	Con un doc no hay queries. Con un nombre, el valor de `timezone` se cachea
+	en Redis por resource (doc_events la invalida tras el commit al guardar el resource).
+	"""
+	if not isinstance(calendar_resource, str):
+		return resolve_timezone_name(calendar_resource.timezone)
+
+	cache = frappe.cache()
+	tz_name = cache.hget(RESOURCE_TIMEZONE_CACHE_KEY, calendar_resource)
+
+	if tz_name is None:
+		tz_name = frappe.db.get_value("Calendar Resource", calendar_resource, "timezone") or "UTC"
+		cache.hset(RESOURCE_TIMEZONE_CACHE_KEY, calendar_resource, tz_name)
+
+	return resolve_timezone_name(tz_name)
+
+
+def invalidate_resource_timezone(resource_name: str) -> None:
+	"""
+	Elimina la timezone cacheada de un resource tras el commit de la transacción actual.
+
+	El hash no tiene TTL: borrarla antes del commit permitiría que una lectura
+	concurrente vuelva a cachear la timezone vieja sin vencimiento.
+	"""
+	frappe.db.after_commit.add(lambda: frappe.cache().hdel(RESOURCE_TIMEZONE_CACHE_KEY, resource_name))
+
+
+def get_transition_table(tz: tzinfo, year: int) -> TransitionTable:
+	"""
+	Tabla de transiciones de tz para las horas locales de `year` (con caché).
+
+	Se muestrea el offset una vez por día y, donde cambia, se ubica el segundo
+	exacto de la transición por bisección. Funciona con cualquier tzinfo.
+	"""
+	tz_key = getattr(tz, "zone", None) or str(tz)
+	table = _transition_cache.get((tz_key, year))
+	if table is not None:
+		return table
+
+	# Margen de 2 días para cubrir horas locales cerca del cambio de año
+	start = int((datetime(year, 1, 1) - _EPOCH).total_seconds()) - 2 * _SAMPLE_SECONDS
+	end = int((datetime(year + 1, 1, 1) - _EPOCH).total_seconds()) + 2 * _SAMPLE_SECONDS
+
+	offsets: List[int] = [_utc_offset(tz, start)]
+	boundaries: List[int] = []
+
+	previous = start
+	for sample in range(start + _SAMPLE_SECONDS, end + 1, _SAMPLE_SECONDS):
+		offset = _utc_offset(tz, sample)
+		if offset == offsets[-1]:
+			previous = sample
+			continue
+
+		transition = _find_transition(tz, previous, sample, offsets[-1])
+		# Límite en hora local: a partir de aquí la hora solo existe con el offset nuevo
+		boundaries.append(transition + max(offsets[-1], offset))
+		offsets.append(offset)
+		previous = sample
+
+	table = TransitionTable(tuple(boundaries), tuple(offsets))
+	_transition_cache[(tz_key, year)] = table
+	return table
+
+
+def local_to_epoch(target_date: date, minute: int, tz: tzinfo) -> int:
+	"""Convierte (fecha, minuto del día) en hora local de tz a epoch UTC."""
+	local_seconds = (target_date.toordinal() - _EPOCH.toordinal()) * 86400 + minute * 60
+	return _local_seconds_to_epoch(local_seconds, target_date.year, tz)
+
+
+def wall_to_epoch(value: datetime, tz: tzinfo) -> int:
+	"""
+	Convierte un datetime a epoch UTC. Si es naive, se interpreta como hora
+	local de tz (las citas se guardan en hora local del resource).
+	"""
+	if value.tzinfo is not None:
+		return int(value.timestamp())
+
+	local_seconds = int((value - _EPOCH).total_seconds())
+	return _local_seconds_to_epoch(local_seconds, value.year, tz)
+
+
+def localize(value: datetime, tz: tzinfo) -> datetime:
+	"""Retorna value como datetime aware en tz (si es naive, se interpreta en tz)."""
+	if value.tzinfo is not None:
+		return value
+	return from_epoch(wall_to_epoch(value, tz), tz) + timedelta(microseconds=value.microsecond)
+
+
+def _local_seconds_to_epoch(local_seconds: int, year: int, tz: tzinfo) -> int:
+	"""Resta el offset vigente (lookup en la tabla del año) a la hora local."""
+	table = get_transition_table(tz, year)
+	return local_seconds - table.offsets[bisect_right(table.boundaries, local_seconds)]
+
+
+def _utc_offset(tz: tzinfo, epoch: int) -> int:
+	"""Offset UTC de tz (en segundos) en el instante epoch."""
+	return int(datetime.fromtimestamp(epoch, tz).utcoffset().total_seconds())
+
+
+def _find_transition(tz: tzinfo, low: int, high: int, offset_before: int) -> int:
+	"""Primer segundo en (low, high] cuyo offset difiere de offset_before."""
+	while high - low > 1:
+		middle = (low + high) // 2
+		if _utc_offset(tz, middle) == offset_before:
+			low = middle
+		else:
+			high = middle
+	return high
@@ -13,6 +13,8 @@ from meet_scheduling.api.appointment_api import (
 	validate_appointment,
 	generate_meeting
 )
+from meet_scheduling.api.appointments import get_next_available_slot
+from meet_scheduling.api.appointments.endpoints import SLOTS_MAX_SPAN_DAYS
 
 
 class TestAppointmentAPI(unittest.TestCase):
@@ -20,6 +22,19 @@ class TestAppointmentAPI(unittest.TestCase):
 
 	def setUp(self):
 		"""Set up test data before each test."""
+		# Create Availability Plan (08:00-12:00 todos los días)
+		if not frappe.db.exists("Availability Plan", "Test Plan API"):
+			plan = frappe.get_doc({
+				"doctype": "Availability Plan",
+				"plan_name": "Test Plan API",
+				"is_active": 1,
+				"availability_slots": [
+					{"weekday": day, "start_time": "08:00:00", "end_time": "12:00:00"}
+					for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+				]
+			})
+			plan.insert(ignore_permissions=True)
+
 		# Create test Calendar Resource
 		if not frappe.db.exists("Calendar Resource", "Test Resource API"):
 			resource = frappe.get_doc({
@@ -33,6 +48,12 @@ class TestAppointmentAPI(unittest.TestCase):
 			})
 			resource.insert(ignore_permissions=True)
 
+		# Link resource to plan
+		resource = frappe.get_doc("Calendar Resource", "Test Resource API")
+		if resource.availability_plan != "Test Plan API":
+			resource.availability_plan = "Test Plan API"
+			resource.save(ignore_permissions=True)
+
 		frappe.db.commit()
 
 	def test_get_available_slots_returns_list(self):
@@ -47,6 +68,33 @@ class TestAppointmentAPI(unittest.TestCase):
 		)
 
 		self.assertIsInstance(result, list)
+		self.assertIsNone(frappe.response.get("next_cursor"))
+
+	def test_get_available_slots_paginates_long_ranges(self):
+		"""Test that ranges longer than SLOTS_MAX_SPAN_DAYS continue through next_cursor."""
+		today = getdate()
+		end = add_to_date(today, days=SLOTS_MAX_SPAN_DAYS + 5)
+
+		first = get_available_slots(
+			"Test Resource API",
+			today.strftime("%Y-%m-%d"),
+			end.strftime("%Y-%m-%d")
+		)
+		next_cursor = frappe.response.get("next_cursor")
+		self.assertIsNotNone(next_cursor)
+
+		second = get_available_slots("Test Resource API", cursor=next_cursor)
+		self.assertIsNone(frappe.response.get("next_cursor"))
+
+		# La primera página cubre SLOTS_MAX_SPAN_DAYS días y la segunda sigue al día siguiente
+		self.assertTrue(first)
+		self.assertTrue(second)
+		self.assertEqual(
+			getdate(first[-1]["start"]), add_to_date(today, days=SLOTS_MAX_SPAN_DAYS - 1)
+		)
+		self.assertEqual(
+			getdate(second[0]["start"]), add_to_date(today, days=SLOTS_MAX_SPAN_DAYS)
+		)
 
 	def test_get_available_slots_invalid_resource(self):
 		"""Test that get_available_slots fails with invalid resource."""
@@ -59,6 +107,36 @@ class TestAppointmentAPI(unittest.TestCase):
 				today.strftime("%Y-%m-%d")
 			)
 
+	def test_get_next_available_slot_respects_limit(self):
+		"""Test that get_next_available_slot skips full slots and slots before `after`."""
+		tomorrow = add_to_date(getdate(), days=1).strftime("%Y-%m-%d")
+		after = f"{tomorrow} 09:00:00"
+
+		# Ocupa el primer slot desde `after` (capacity 1); el de 08:00 queda antes de `after`
+		frappe.get_doc({
+			"doctype": "Appointment",
+			"calendar_resource": "Test Resource API",
+			"start_datetime": f"{tomorrow} 09:00:00",
+			"end_datetime": f"{tomorrow} 10:00:00",
+			"status": "Draft",
+			"docstatus": 0
+		}).insert(ignore_permissions=True)
+
+		result = get_next_available_slot("Test Resource API", after, limit=3)
+
+		self.assertEqual(len(result), 3)
+		self.assertEqual(result[0]["start"], f"{tomorrow} 10:00:00")
+		self.assertNotIn(f"{tomorrow} 08:00:00", [slot["start"] for slot in result])
+		self.assertNotIn(f"{tomorrow} 09:00:00", [slot["start"] for slot in result])
+		for slot in result:
+			self.assertTrue(slot["is_available"])
+			self.assertGreaterEqual(slot["start"], after)
+
+	def test_get_next_available_slot_invalid_resource(self):
+		"""Test that get_next_available_slot fails with invalid resource."""
+		with self.assertRaises(frappe.ValidationError):
+			get_next_available_slot("Nonexistent Resource", "2026-01-20 08:00:00")
+
 	def test_validate_appointment_returns_dict(self):
 		"""Test that validate_appointment returns expected structure."""
 		start_time = add_to_date(now_datetime(), hours=2)
@@ -13,6 +13,7 @@ import pytz
 from meet_scheduling.meet_scheduling.scheduling.availability import (
 	get_availability_slots_for_day,
 	get_effective_availability,
+	iter_effective_availability,
 	_merge_intervals,
 	_interval_subtract
 )
@@ -188,6 +189,228 @@ class TestAvailability(unittest.TestCase):
 		frappe.db.rollback()
 
 
+class TestEffectiveAvailabilityRange(unittest.TestCase):
+	"""Tests for the range-batched availability path."""
+
+	def setUp(self):
+		"""Set up a resource with a weekday plan and exceptions on two dates."""
+		if not frappe.db.exists("Availability Plan", "Test Plan Range"):
+			frappe.get_doc({
+				"doctype": "Availability Plan",
+				"plan_name": "Test Plan Range",
+				"is_active": 1,
+				"availability_slots": [
+					{"weekday": day, "start_time": "09:00:00", "end_time": "17:00:00"}
+					for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+				]
+			}).insert(ignore_permissions=True)
+
+		if not frappe.db.exists("Calendar Resource", "Test Resource Range"):
+			frappe.get_doc({
+				"doctype": "Calendar Resource",
+				"resource_name": "Test Resource Range",
+				"timezone": "America/Bogota",
+				"slot_duration_minutes": 30,
+				"capacity": 1,
+				"is_active": 1,
+				"availability_plan": "Test Plan Range"
+			}).insert(ignore_permissions=True)
+
+		frappe.db.delete("Calendar Exception", {"calendar_resource": "Test Resource Range"})
+		for exception in (
+			{"date": "2026-01-20", "exception_type": "Blocked", "start_time": "10:00:00", "end_time": "11:00:00"},
+			{"date": "2026-01-22", "exception_type": "Closed"},
+		):
+			frappe.get_doc({
+				"doctype": "Calendar Exception",
+				"calendar_resource": "Test Resource Range",
+				**exception
+			}).insert(ignore_permissions=True)
+
+		frappe.db.commit()
+
+	def test_range_matches_per_day(self):
+		"""Test that the batched range result matches the per-day wrapper."""
+		result = get_effective_availability("Test Resource Range", "2026-01-19", "2026-01-25")
+
+		for day in ("2026-01-19", "2026-01-20", "2026-01-21", "2026-01-22", "2026-01-23"):
+			self.assertEqual(
+				result.get(day, []),
+				get_availability_slots_for_day("Test Resource Range", day)
+			)
+
+	def test_iter_effective_availability_matches_dict(self):
+		"""Test that the generator yields the same days as the dict version."""
+		result = get_effective_availability("Test Resource Range", "2026-01-19", "2026-01-25")
+		streamed = {
+			day.strftime("%Y-%m-%d"): intervals
+			for day, intervals in iter_effective_availability("Test Resource Range", "2026-01-19", "2026-01-25")
+		}
+		self.assertEqual(streamed, result)
+
+	def test_range_applies_exceptions_by_date(self):
+		"""Test that preloaded exceptions only affect their own date."""
+		tz = pytz.timezone("America/Bogota")
+		result = get_effective_availability("Test Resource Range", "2026-01-19", "2026-01-25")
+
+		self.assertEqual(len(result["2026-01-19"]), 1)
+		self.assertEqual(len(result["2026-01-20"]), 2)
+		self.assertEqual(result["2026-01-20"][0]["end"], tz.localize(datetime(2026, 1, 20, 10, 0)))
+		self.assertNotIn("2026-01-22", result)
+		self.assertNotIn("2026-01-24", result)
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+
+
+
+class TestRecurringExceptions(unittest.TestCase):
+	"""Tests for date-range and recurring Calendar Exceptions."""
+
+	def setUp(self):
+		"""Set up a resource on the weekday plan with range/recurring exceptions."""
+		if not frappe.db.exists("Availability Plan", "Test Plan Range"):
+			frappe.get_doc({
+				"doctype": "Availability Plan",
+				"plan_name": "Test Plan Range",
+				"is_active": 1,
+				"availability_slots": [
+					{"weekday": day, "start_time": "09:00:00", "end_time": "17:00:00"}
+					for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+				]
+			}).insert(ignore_permissions=True)
+
+		if not frappe.db.exists("Calendar Resource", "Test Resource Recurring"):
+			frappe.get_doc({
+				"doctype": "Calendar Resource",
+				"resource_name": "Test Resource Recurring",
+				"timezone": "America/Bogota",
+				"slot_duration_minutes": 30,
+				"capacity": 1,
+				"is_active": 1,
+				"availability_plan": "Test Plan Range"
+			}).insert(ignore_permissions=True)
+
+		frappe.db.delete("Calendar Exception", {"calendar_resource": "Test Resource Recurring"})
+		for exception in (
+			# Vacaciones: lunes 2026-02-02 a viernes 2026-02-13
+			{"date": "2026-02-02", "to_date": "2026-02-13", "exception_type": "Closed"},
+			# Todos los miércoles desde 2026-01-07: bloqueo 12:00-13:00
+			{"date": "2026-01-07", "recurrence": "Weekly", "exception_type": "Blocked",
+			 "start_time": "12:00:00", "end_time": "13:00:00"},
+			# Festivo anual
+			{"date": "2025-03-23", "recurrence": "Yearly", "exception_type": "Closed"},
+		):
+			frappe.get_doc({
+				"doctype": "Calendar Exception",
+				"calendar_resource": "Test Resource Recurring",
+				**exception
+			}).insert(ignore_permissions=True)
+
+		frappe.db.commit()
+
+	def test_date_range_closes_every_day(self):
+		"""Test that a date-range exception applies to each day of the range."""
+		result = get_effective_availability("Test Resource Recurring", "2026-01-30", "2026-02-16")
+
+		self.assertIn("2026-01-30", result)
+		self.assertIn("2026-02-16", result)
+		for day in ("2026-02-02", "2026-02-06", "2026-02-09", "2026-02-13"):
+			self.assertNotIn(day, result)
+
+	def test_weekly_recurrence(self):
+		"""Test that a weekly exception applies on the same weekday only."""
+		result = get_effective_availability("Test Resource Recurring", "2026-03-02", "2026-03-06")
+
+		self.assertEqual(len(result["2026-03-04"]), 2)
+		self.assertEqual(len(result["2026-03-05"]), 1)
+
+	def test_yearly_recurrence(self):
+		"""Test that a yearly exception applies on the same day and month."""
+		# 2026-03-23 es lunes
+		self.assertEqual(get_availability_slots_for_day("Test Resource Recurring", "2026-03-23"), [])
+		self.assertEqual(len(get_availability_slots_for_day("Test Resource Recurring", "2026-03-24")), 1)
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+
+
+class TestHolidayCalendarClosures(unittest.TestCase):
+	"""Tests for shared Holiday Calendar closures."""
+
+	def setUp(self):
+		"""Set up two resources sharing one Holiday Calendar."""
+		if not frappe.db.exists("Availability Plan", "Test Plan Range"):
+			frappe.get_doc({
+				"doctype": "Availability Plan",
+				"plan_name": "Test Plan Range",
+				"is_active": 1,
+				"availability_slots": [
+					{"weekday": day, "start_time": "09:00:00", "end_time": "17:00:00"}
+					for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+				]
+			}).insert(ignore_permissions=True)
+
+		if frappe.db.exists("Holiday Calendar", "Test Holidays"):
+			frappe.delete_doc("Holiday Calendar", "Test Holidays", ignore_permissions=True, force=True)
+
+		frappe.get_doc({
+			"doctype": "Holiday Calendar",
+			"calendar_name": "Test Holidays",
+			"closures": [
+				{"date": "2025-12-25", "recurrence": "Yearly", "reason": "Navidad"},
+				{"date": "2026-01-05", "to_date": "2026-01-06", "reason": "Cierre de oficina"},
+				{"date": "2026-01-07", "start_time": "09:00:00", "end_time": "13:00:00", "reason": "Inventario"},
+			]
+		}).insert(ignore_permissions=True)
+
+		for resource_name in ("Test Resource Holidays A", "Test Resource Holidays B"):
+			if not frappe.db.exists("Calendar Resource", resource_name):
+				frappe.get_doc({
+					"doctype": "Calendar Resource",
+					"resource_name": resource_name,
+					"timezone": "America/Bogota",
+					"slot_duration_minutes": 30,
+					"capacity": 1,
+					"is_active": 1,
+					"availability_plan": "Test Plan Range",
+					"holiday_calendar": "Test Holidays"
+				}).insert(ignore_permissions=True)
+
+		frappe.db.commit()
+
+	def test_closures_apply_to_every_linked_resource(self):
+		"""Test that one Holiday Calendar closes the same dates for all its resources."""
+		for resource_name in ("Test Resource Holidays A", "Test Resource Holidays B"):
+			result = get_effective_availability(resource_name, "2026-12-21", "2026-12-28")
+
+			self.assertNotIn("2026-12-25", result)
+			self.assertIn("2026-12-24", result)
+
+	def test_range_and_partial_closures(self):
+		"""Test date-range closures and partial-day closures."""
+		tz = pytz.timezone("America/Bogota")
+		result = get_effective_availability("Test Resource Holidays A", "2026-01-05", "2026-01-08")
+
+		self.assertNotIn("2026-01-05", result)
+		self.assertNotIn("2026-01-06", result)
+		self.assertEqual(result["2026-01-07"][0]["start"], tz.localize(datetime(2026, 1, 7, 13, 0)))
+		self.assertEqual(len(result["2026-01-08"]), 1)
+
+	def test_invalid_closure_range(self):
+		"""Test that a closure with to_date before date is rejected."""
+		calendar = frappe.get_doc("Holiday Calendar", "Test Holidays")
+		calendar.append("closures", {"date": "2026-02-10", "to_date": "2026-02-01"})
+
+		with self.assertRaises(frappe.ValidationError):
+			calendar.save(ignore_permissions=True)
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+
 def run_tests():
 	"""Run all tests in this module."""
 	unittest.main()
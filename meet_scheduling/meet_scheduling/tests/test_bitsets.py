@@ -0,0 +1,229 @@
+"""
+Tests for scheduling/bitsets.py
+
+Tests the per-day bitset representation, its bitwise queries and the
+bitset path of generate_availability_summary against generate_available_slots.
+"""
+
+import unittest
+import frappe
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from frappe.utils import add_days, getdate, today
+import pytz
+
+from meet_scheduling.meet_scheduling.scheduling.bitsets import (
+	DayBitset,
+	bits_to_intervals,
+	build_day_bitset,
+	common_free_bits,
+	count_slots,
+	from_payload,
+	intervals_to_bits,
+	is_slot_free,
+	to_payload,
+)
+from meet_scheduling.meet_scheduling.scheduling.capacity import CapacityTimeline
+from meet_scheduling.meet_scheduling.scheduling.intervals import Interval
+from meet_scheduling.meet_scheduling.scheduling.slots import (
+	SlotFilters,
+	generate_availability_summary,
+	generate_available_slots,
+)
+from meet_scheduling.meet_scheduling.scheduling.timezones import local_to_epoch
+
+
+class TestBitsets(unittest.TestCase):
+	"""Tests for availability bitsets."""
+
+	def setUp(self):
+		"""Set up test data before each test."""
+		self.tz = pytz.timezone("America/Bogota")
+		self.date = date(2026, 1, 20)
+
+	def _interval(self, start_minute, end_minute):
+		return Interval(
+			local_to_epoch(self.date, start_minute, self.tz),
+			local_to_epoch(self.date, end_minute, self.tz)
+		)
+
+	def test_intervals_to_bits_marks_full_cells(self):
+		"""Test that only cells fully inside availability are marked."""
+		# 09:00-12:00 = 12 celdas; 13:10-14:00 solo cubre 13:15-14:00 (3 celdas)
+		bits = intervals_to_bits([self._interval(540, 720), self._interval(790, 840)], self.date, self.tz)
+
+		self.assertEqual(bits.bit_count(), 15)
+
+	def _timeline(self, segments, bookings, default_seats=1):
+		return CapacityTimeline(
+			[(*self._interval(start, end), seats) for start, end, seats in segments],
+			bookings,
+			default_seats
+		)
+
+	def test_booked_cells_follow_capacity_timeline(self):
+		"""Test that a cell is booked only where free seats run out, with per-slot capacity."""
+		availability = [self._interval(540, 720)]
+		bookings = [self._interval(600, 630), self._interval(600, 605)]
+
+		# Franja de 2 asientos: solo 10:00-10:15 se llena (dos citas a la vez)
+		day = build_day_bitset(self.date, availability, self._timeline([(540, 720, 2)], bookings), self.tz)
+		self.assertEqual(day.booked.bit_count(), 1)
+
+		# Con 1 asiento la cita parcial de 10:00-10:05 también llena su celda
+		day = build_day_bitset(self.date, availability, self._timeline([(540, 720, 1)], bookings), self.tz)
+		self.assertEqual(day.booked.bit_count(), 2)
+
+		# min_free pide asientos de sobra
+		day = build_day_bitset(self.date, availability, self._timeline([(540, 720, 2)], bookings), self.tz, min_free=2)
+		self.assertEqual(day.booked.bit_count(), 2)
+
+	def test_slot_queries(self):
+		"""Test is_slot_free and count_slots on available ANDNOT booked."""
+		day = build_day_bitset(
+			self.date,
+			[self._interval(540, 720)],
+			self._timeline([], [self._interval(600, 630)]),
+			self.tz
+		)
+
+		self.assertTrue(is_slot_free(day.free, 540, 30))
+		self.assertFalse(is_slot_free(day.free, 600, 30))
+		self.assertFalse(is_slot_free(day.free, 615, 30))
+		# 09:00-12:00 en slots de 30 min = 6, menos el de 10:00
+		self.assertEqual(count_slots(day, 30, self.tz), (6, 5, local_to_epoch(self.date, 540, self.tz)))
+
+	def test_count_slots_start_at_each_interval(self):
+		"""Test that slots start at each interval start, not at midnight-aligned cells."""
+		# 09:15-10:45 → 09:15, 09:45, 10:15; 13:00-13:45 → 13:00 (sobran 15 min)
+		day = build_day_bitset(
+			self.date,
+			[self._interval(555, 645), self._interval(780, 825)],
+			self._timeline([], [self._interval(555, 560)]),
+			self.tz
+		)
+
+		self.assertEqual(count_slots(day, 30, self.tz), (4, 3, local_to_epoch(self.date, 585, self.tz)))
+
+	def test_off_grid_days_are_not_represented(self):
+		"""Test that days whose slots would differ from the epoch path return None."""
+		timeline = self._timeline([], [])
+		self.assertIsNone(build_day_bitset(self.date, [self._interval(550, 600)], timeline, self.tz))
+
+		tz = pytz.timezone("America/New_York")
+		day = date(2026, 3, 8)
+		interval = Interval(local_to_epoch(day, 540, tz), local_to_epoch(day, 600, tz))
+		self.assertIsNone(build_day_bitset(day, [interval], timeline, tz))
+
+	def test_common_free_bits(self):
+		"""Test the common free time of several resources."""
+		first = intervals_to_bits([self._interval(540, 720)], self.date, self.tz)
+		second = intervals_to_bits([self._interval(660, 780)], self.date, self.tz)
+
+		result = bits_to_intervals(common_free_bits([first, second]), self.date, self.tz)
+
+		self.assertEqual(len(result), 1)
+		self.assertEqual((result[0]["start"].hour, result[0]["end"].hour), (11, 12))
+
+	def test_dst_gap_cells_are_skipped(self):
+		"""Test that cells inside a DST gap are never available."""
+		tz = pytz.timezone("America/New_York")
+		day = date(2026, 3, 8)
+		whole_day = Interval(local_to_epoch(day, 0, tz), local_to_epoch(day, 1440, tz))
+
+		# 02:00-03:00 no existe: 92 celdas en vez de 96
+		self.assertEqual(intervals_to_bits([whole_day], day, tz).bit_count(), 92)
+
+	def test_payload_round_trip(self):
+		"""Test that bitsets serialize and deserialize losslessly."""
+		day = DayBitset(self.date, intervals_to_bits([self._interval(540, 720)], self.date, self.tz), 0b1010)
+
+		self.assertEqual(from_payload(frappe.parse_json(frappe.as_json(to_payload(day)))), day)
+
+
+class TestBitsetSummary(unittest.TestCase):
+	"""Tests that the bitset summary matches per-slot generation."""
+
+	def setUp(self):
+		"""Set up test data before each test."""
+		if not frappe.db.exists("Availability Plan", "Test Plan Bitsets"):
+			plan = frappe.get_doc({
+				"doctype": "Availability Plan",
+				"plan_name": "Test Plan Bitsets",
+				"is_active": 1,
+				"availability_slots": [
+					slot
+					for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+					for slot in (
+						{"weekday": day, "start_time": "09:00:00", "end_time": "10:00:00", "capacity": 2},
+						{"weekday": day, "start_time": "10:15:00", "end_time": "12:00:00"},
+					)
+				]
+			})
+			plan.insert(ignore_permissions=True)
+
+		if not frappe.db.exists("Calendar Resource", "Test Resource Bitsets"):
+			resource = frappe.get_doc({
+				"doctype": "Calendar Resource",
+				"resource_name": "Test Resource Bitsets",
+				"timezone": "America/Bogota",
+				"slot_duration_minutes": 30,
+				"capacity": 1,
+				"availability_plan": "Test Plan Bitsets",
+				"is_active": 1
+			})
+			resource.insert(ignore_permissions=True)
+
+		frappe.db.commit()
+
+		self.resource = "Test Resource Bitsets"
+		self.start_date = add_days(getdate(today()), 3)
+		self.end_date = add_days(self.start_date, 6)
+
+	def _at(self, days, hour, minute=0):
+		start = datetime.combine(add_days(self.start_date, days), datetime.min.time())
+		return start + timedelta(hours=hour, minutes=minute)
+
+	def _book(self, start, end):
+		frappe.get_doc({
+			"doctype": "Appointment",
+			"calendar_resource": self.resource,
+			"start_datetime": start,
+			"end_datetime": end,
+			"status": "Draft",
+			"docstatus": 0
+		}).insert(ignore_permissions=True)
+
+	def test_summary_matches_generated_slots(self):
+		"""Test that bitset counts equal counting generate_available_slots, off-grid bookings included."""
+		# Citas que tocan parte de una celda, en franjas de 2 y de 1 asiento; la
+		# franja de 10:15 arranca fuera de la grilla de 30 min desde medianoche
+		self._book(self._at(0, 9, 5), self._at(0, 9, 17))
+		self._book(self._at(0, 9, 10), self._at(0, 9, 22))
+		self._book(self._at(1, 10, 20), self._at(1, 10, 32))
+		self._book(self._at(2, 11, 20), self._at(2, 11, 35))
+
+		for min_capacity in (0, 2):
+			expected = defaultdict(lambda: {"total_slots": 0, "free_slots": 0, "first_free": None})
+			for slot in generate_available_slots(self.resource, self.start_date, self.end_date):
+				day = expected[slot["start"][:10]]
+				day["total_slots"] += 1
+				if slot["capacity_remaining"] >= max(min_capacity, 1):
+					day["free_slots"] += 1
+					day["first_free"] = day["first_free"] or slot["start"]
+
+			summary = generate_availability_summary(
+				self.resource, self.start_date, self.end_date,
+				filters=SlotFilters(min_capacity_remaining=min_capacity)
+			)
+
+			self.assertEqual({row.pop("date"): row for row in summary}, dict(expected))
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+
+
+def run_tests():
+	"""Run all tests in this module."""
+	unittest.main()
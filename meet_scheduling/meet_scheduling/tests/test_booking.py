@@ -0,0 +1,107 @@
+"""
+Tests for scheduling/booking.py
+
+Tests that concurrent bookings of the same slot never exceed the resource capacity.
+"""
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import frappe
+from frappe.utils import add_days, getdate, today
+
+from meet_scheduling.meet_scheduling.scheduling.booking import book_appointment
+
+
+CONCURRENT_BOOKINGS = 200
+CAPACITY = 3
+
+
+class TestBookingConcurrency(unittest.TestCase):
+	"""Tests for the per-resource booking lock."""
+
+	def setUp(self):
+		"""Set up test data before each test."""
+		if not frappe.db.exists("Availability Plan", "Test Plan Booking"):
+			plan = frappe.get_doc({
+				"doctype": "Availability Plan",
+				"plan_name": "Test Plan Booking",
+				"is_active": 1,
+				"availability_slots": [
+					{"weekday": day, "start_time": "09:00:00", "end_time": "11:00:00"}
+					for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+				]
+			})
+			plan.insert(ignore_permissions=True)
+
+		if not frappe.db.exists("Calendar Resource", "Test Resource Booking"):
+			resource = frappe.get_doc({
+				"doctype": "Calendar Resource",
+				"resource_name": "Test Resource Booking",
+				"timezone": "America/Bogota",
+				"slot_duration_minutes": 30,
+				"capacity": CAPACITY,
+				"availability_plan": "Test Plan Booking",
+				"is_active": 1
+			})
+			resource.insert(ignore_permissions=True)
+
+		frappe.db.commit()
+
+		self.resource = "Test Resource Booking"
+		start = datetime.combine(add_days(getdate(today()), 3), datetime.min.time()) + timedelta(hours=9)
+		self.start = start.strftime("%Y-%m-%d %H:%M:%S")
+		self.end = (start + timedelta(minutes=30)).strftime("%Y-%m-%d %H:%M:%S")
+
+	def test_concurrent_bookings_respect_capacity(self):
+		"""Test that 200 simultaneous bookings of one slot confirm exactly `capacity`.
+
+		Abre una conexión por hilo; con max_connections de MariaDB por debajo de
+		CONCURRENT_BOOKINGS (el default es 151) los hilos sin conexión cuentan
+		como reservas fallidas.
+		"""
+		site = frappe.local.site
+		sites_path = frappe.local.sites_path
+		barrier = threading.Barrier(CONCURRENT_BOOKINGS, timeout=60)
+
+		def book(_index):
+			# Cada hilo con su propio contexto de Frappe y conexión a la DB
+			frappe.init(site=site, sites_path=sites_path)
+			try:
+				try:
+					frappe.connect()
+					frappe.set_user("Administrator")
+				finally:
+					# Todos arrancan juntos, aunque alguno no haya podido conectar
+					barrier.wait()
+				book_appointment(self.resource, None, self.start, self.end)
+				return True
+			except Exception:
+				if getattr(frappe.local, "db", None):
+					frappe.db.rollback()
+				return False
+			finally:
+				frappe.destroy()
+
+		with ThreadPoolExecutor(max_workers=CONCURRENT_BOOKINGS) as pool:
+			results = list(pool.map(book, range(CONCURRENT_BOOKINGS)))
+
+		self.assertEqual(sum(results), CAPACITY)
+		self.assertEqual(
+			frappe.db.count("Appointment", {"calendar_resource": self.resource, "status": "Confirmed"}),
+			CAPACITY
+		)
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+		# Las reservas de los hilos quedaron commiteadas
+		frappe.db.delete("Appointment", {"calendar_resource": self.resource})
+		frappe.db.commit()
+
+
+def run_tests():
+	"""Run all tests in this module."""
+	unittest.main()
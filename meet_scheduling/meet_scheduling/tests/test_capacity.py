@@ -0,0 +1,164 @@
+"""
+Tests for scheduling/capacity.py
+
+Tests the seats timeline (per-slot capacity, resource fallback, bookings)
+and its use from slot generation and check_overlap.
+"""
+
+import unittest
+import frappe
+from datetime import datetime, timedelta
+from frappe.utils import add_days, getdate, today
+
+from meet_scheduling.meet_scheduling.scheduling.capacity import CapacityTimeline
+from meet_scheduling.meet_scheduling.scheduling.intervals import Interval
+from meet_scheduling.meet_scheduling.scheduling.overlap import check_overlap
+from meet_scheduling.meet_scheduling.scheduling.slots import generate_available_slots
+
+
+class TestCapacityTimeline(unittest.TestCase):
+	"""Tests for CapacityTimeline range-min queries (no DB)."""
+
+	def test_default_seats_outside_segments(self):
+		"""Test that instants without a plan segment use the fallback capacity."""
+		timeline = CapacityTimeline([(100, 200, 3)], [], default_seats=1)
+
+		self.assertEqual(timeline.free_seats(0, 50), 1)
+		self.assertEqual(timeline.free_seats(100, 200), 3)
+		self.assertEqual(timeline.free_seats(150, 250), 1)
+
+	def test_overlapping_segments_take_max(self):
+		"""Test that overlapping plan segments use the larger capacity."""
+		timeline = CapacityTimeline([(0, 100, 2), (50, 150, 4)], [], default_seats=1)
+
+		self.assertEqual(timeline.free_seats(0, 50), 2)
+		self.assertEqual(timeline.free_seats(50, 150), 4)
+
+	def test_bookings_count_only_where_concurrent(self):
+		"""Test that back-to-back bookings take one seat, not two."""
+		bookings = [Interval(0, 30), Interval(30, 60)]
+		timeline = CapacityTimeline([(0, 120, 2)], bookings, default_seats=1)
+
+		self.assertEqual(timeline.free_seats(0, 60), 1)
+		self.assertEqual(timeline.free_seats(60, 120), 2)
+
+	def test_matches_linear_scan(self):
+		"""Test range-min against a point-by-point scan."""
+		segments = [(0, 40, 2), (40, 90, 3), (60, 120, 1)]
+		bookings = [Interval(10, 50), Interval(20, 30), Interval(45, 100), Interval(80, 85)]
+		timeline = CapacityTimeline(segments, bookings, default_seats=1)
+
+		def free_at(point):
+			covering = [seats for start, end, seats in segments if start <= point < end]
+			seats = max(covering) if covering else 1
+			return seats - sum(1 for start, end in bookings if start <= point < end)
+
+		for start in range(0, 130, 5):
+			for end in range(start + 5, 140, 5):
+				expected = min(free_at(point) for point in range(start, end))
+				self.assertEqual(timeline.free_seats(start, end), expected)
+
+
+class TestCapacityIntegration(unittest.TestCase):
+	"""Tests per-slot capacity through slots and check_overlap."""
+
+	def setUp(self):
+		"""Set up test data before each test."""
+		if not frappe.db.exists("Availability Plan", "Test Plan Capacity"):
+			plan = frappe.get_doc({
+				"doctype": "Availability Plan",
+				"plan_name": "Test Plan Capacity",
+				"is_active": 1,
+				"availability_slots": [
+					slot
+					for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+					for slot in (
+						{"weekday": day, "start_time": "09:00:00", "end_time": "10:00:00", "capacity": 3},
+						{"weekday": day, "start_time": "10:00:00", "end_time": "11:00:00"},
+					)
+				]
+			})
+			plan.insert(ignore_permissions=True)
+
+		if not frappe.db.exists("Calendar Resource", "Test Resource Capacity"):
+			resource = frappe.get_doc({
+				"doctype": "Calendar Resource",
+				"resource_name": "Test Resource Capacity",
+				"timezone": "America/Bogota",
+				"slot_duration_minutes": 30,
+				"capacity": 1,
+				"availability_plan": "Test Plan Capacity",
+				"is_active": 1
+			})
+			resource.insert(ignore_permissions=True)
+
+		frappe.db.commit()
+
+		self.resource = "Test Resource Capacity"
+		self.target_date = add_days(getdate(today()), 3)
+
+	def _at(self, hour, minute=0):
+		return datetime.combine(self.target_date, datetime.min.time()) + timedelta(hours=hour, minutes=minute)
+
+	def _book(self, start, end):
+		appointment = frappe.get_doc({
+			"doctype": "Appointment",
+			"calendar_resource": self.resource,
+			"start_datetime": start,
+			"end_datetime": end,
+			"status": "Draft",
+			"docstatus": 0
+		})
+		appointment.insert(ignore_permissions=True)
+		return appointment
+
+	def test_slots_use_slot_capacity(self):
+		"""Test that slots take the Availability Slot capacity, with resource fallback."""
+		slots = generate_available_slots(self.resource, self.target_date, self.target_date)
+
+		self.assertEqual([slot["capacity_remaining"] for slot in slots], [3, 3, 1, 1])
+
+	def test_check_overlap_uses_slot_capacity(self):
+		"""Test that check_overlap reports free seats of the staffed shift."""
+		self._book(self._at(9), self._at(9, 30))
+
+		result = check_overlap(self.resource, self._at(9), self._at(9, 30))
+		self.assertFalse(result["capacity_exceeded"])
+		self.assertEqual(result["capacity_available"], 2)
+
+	def test_check_overlap_counts_peak_not_total(self):
+		"""Test that bookings that don't overlap each other share a seat."""
+		self._book(self._at(9), self._at(9, 30))
+		self._book(self._at(9, 30), self._at(10))
+
+		result = check_overlap(self.resource, self._at(9), self._at(10))
+		self.assertEqual(result["capacity_used"], 2)
+		self.assertEqual(result["capacity_available"], 2)
+		self.assertEqual(result["peak_occupancy"], 1)
+		self.assertEqual(result["peak_at"], self._at(9).strftime("%Y-%m-%d %H:%M:%S"))
+
+	def test_check_overlap_reports_peak_time(self):
+		"""Test that the peak is measured inside the window and reported when it starts."""
+		self._book(self._at(9), self._at(9, 30))
+		self._book(self._at(9, 15), self._at(9, 45))
+
+		result = check_overlap(self.resource, self._at(9), self._at(10))
+		self.assertEqual(result["peak_occupancy"], 2)
+		self.assertEqual(result["peak_at"], self._at(9, 15).strftime("%Y-%m-%d %H:%M:%S"))
+
+		result = check_overlap(self.resource, self._at(9, 20), self._at(10))
+		self.assertEqual(result["peak_occupancy"], 2)
+		self.assertEqual(result["peak_at"], self._at(9, 20).strftime("%Y-%m-%d %H:%M:%S"))
+
+		result = check_overlap(self.resource, self._at(10), self._at(10, 30))
+		self.assertEqual(result["peak_occupancy"], 0)
+		self.assertIsNone(result["peak_at"])
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+
+
+def run_tests():
+	"""Run all tests in this module."""
+	unittest.main()
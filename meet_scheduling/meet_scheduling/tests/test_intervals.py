@@ -0,0 +1,138 @@
+"""
+Tests for scheduling/intervals.py
+
+Tests the epoch-based interval algebra (normalize, union, subtract, intersect, clip),
+window/interval overlap pairs and peak concurrency.
+"""
+
+import unittest
+from datetime import datetime
+
+import pytz
+
+from meet_scheduling.meet_scheduling.scheduling.intervals import (
+	Interval,
+	clip,
+	from_epoch,
+	intersect,
+	normalize,
+	overlapping_pairs,
+	peak_overlap,
+	subtract,
+	sweep,
+	to_epoch,
+	union,
+)
+
+
+class TestIntervals(unittest.TestCase):
+	"""Tests for interval set operations."""
+
+	def test_normalize_merges_overlapping_and_adjacent(self):
+		"""Test that normalize sorts, merges and drops empty intervals."""
+		result = normalize([Interval(30, 40), Interval(0, 10), Interval(10, 20), Interval(5, 5)])
+		self.assertEqual(result, [Interval(0, 20), Interval(30, 40)])
+
+	def test_union(self):
+		"""Test union of two normalized sets."""
+		result = union([Interval(0, 10), Interval(20, 30)], [Interval(8, 22), Interval(40, 50)])
+		self.assertEqual(result, [Interval(0, 30), Interval(40, 50)])
+
+	def test_subtract_cases(self):
+		"""Test subtract: no overlap, covers all, covers start, covers end, middle."""
+		base = [Interval(100, 200)]
+		self.assertEqual(subtract(base, [Interval(300, 400)]), base)
+		self.assertEqual(subtract(base, [Interval(50, 250)]), [])
+		self.assertEqual(subtract(base, [Interval(50, 150)]), [Interval(150, 200)])
+		self.assertEqual(subtract(base, [Interval(150, 250)]), [Interval(100, 150)])
+		self.assertEqual(
+			subtract(base, [Interval(120, 130), Interval(150, 160)]),
+			[Interval(100, 120), Interval(130, 150), Interval(160, 200)]
+		)
+
+	def test_subtract_block_spanning_several_intervals(self):
+		"""Test that one block can cut several base intervals."""
+		result = subtract([Interval(0, 10), Interval(20, 30), Interval(40, 50)], [Interval(5, 45)])
+		self.assertEqual(result, [Interval(0, 5), Interval(45, 50)])
+
+	def test_intersect(self):
+		"""Test intersection of two normalized sets."""
+		result = intersect([Interval(0, 10), Interval(20, 30)], [Interval(5, 25)])
+		self.assertEqual(result, [Interval(5, 10), Interval(20, 25)])
+
+	def test_clip(self):
+		"""Test clipping a set to a window."""
+		result = clip([Interval(0, 10), Interval(20, 30), Interval(40, 50)], 5, 45)
+		self.assertEqual(result, [Interval(5, 10), Interval(20, 30), Interval(40, 45)])
+
+	def test_sweep_blocks_win_over_extra(self):
+		"""Test that blocks remove extra availability regardless of input order."""
+		base = [Interval(0, 100)]
+		extra = [Interval(100, 150)]
+		blocks = [Interval(20, 30), Interval(120, 130)]
+
+		expected = [Interval(0, 20), Interval(30, 120), Interval(130, 150)]
+		self.assertEqual(sweep(base, extra, blocks), expected)
+		self.assertEqual(sweep(base, extra[::-1], blocks[::-1]), expected)
+
+	def test_sweep_close_all(self):
+		"""Test that close_all removes everything, including extra availability."""
+		self.assertEqual(sweep([Interval(0, 100)], [Interval(200, 300)], close_all=True), [])
+
+	def test_sweep_many_partial_blocks(self):
+		"""Test that sweep matches sequential subtraction with dozens of blocks."""
+		base = [Interval(0, 1000), Interval(1200, 2000)]
+		blocks = [Interval(i, i + 7) for i in range(5, 1995, 31)]
+
+		expected = base
+		for block in blocks:
+			expected = subtract(expected, [block])
+
+		self.assertEqual(sweep(base, blocks=blocks), expected)
+
+	def test_epoch_round_trip(self):
+		"""Test conversion between aware datetimes and epoch seconds."""
+		tz = pytz.timezone("America/Bogota")
+		value = tz.localize(datetime(2026, 1, 20, 9, 0))
+		self.assertEqual(from_epoch(to_epoch(value), tz), value)
+
+	def test_overlapping_pairs_half_open(self):
+		"""Test that touching endpoints do not overlap and order is preserved."""
+		windows = [Interval(10, 20), Interval(0, 10), Interval(5, 25), Interval(40, 50)]
+		appointments = [Interval(0, 10), Interval(15, 30), Interval(20, 40)]
+
+		self.assertEqual(overlapping_pairs(windows, appointments), [[1], [0], [0, 1, 2], []])
+
+	def test_overlapping_pairs_match_linear_scan(self):
+		"""Test overlap pairs against a brute-force scan."""
+		appointments = [Interval(i * 13 % 500, i * 13 % 500 + 15 * (i % 4 + 1)) for i in range(80)]
+		windows = [Interval(i * 37 % 520, i * 37 % 520 + 30) for i in range(50)]
+
+		expected = [
+			[index for index, (s, e) in enumerate(appointments) if s < end and e > start]
+			for start, end in windows
+		]
+		self.assertEqual(overlapping_pairs(windows, appointments), expected)
+
+	def test_peak_overlap_half_open_and_clipped(self):
+		"""Test that back-to-back intervals don't stack and the window clips the peak."""
+		appointments = [Interval(0, 30), Interval(30, 60), Interval(20, 40), Interval(50, 90)]
+
+		self.assertEqual(peak_overlap(appointments, 0, 60), (2, 20))
+		self.assertEqual(peak_overlap(appointments, 40, 50), (1, 40))
+		self.assertEqual(peak_overlap(appointments, 90, 120), (0, None))
+		self.assertEqual(peak_overlap([], 0, 60), (0, None))
+
+	def test_peak_overlap_matches_linear_scan(self):
+		"""Test peak concurrency against a second-by-second count."""
+		appointments = [Interval(i * 13 % 500, i * 13 % 500 + 15 * (i % 4 + 1)) for i in range(80)]
+
+		for start, end in [(0, 520), (100, 130), (37, 38), (250, 400)]:
+			counts = [sum(1 for s, e in appointments if s <= t < e) for t in range(start, end)]
+			peak = max(counts)
+			self.assertEqual(peak_overlap(appointments, start, end), (peak, start + counts.index(peak)))
+
+
+def run_tests():
+	"""Run all tests in this module."""
+	unittest.main()
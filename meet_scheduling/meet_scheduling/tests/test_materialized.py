@@ -0,0 +1,149 @@
+"""
+Tests for scheduling/materialized.py
+
+Tests the materialized "Availability Day" store and its invalidation.
+"""
+
+import json
+import unittest
+import frappe
+from frappe.utils import add_days, getdate, today
+
+from meet_scheduling.meet_scheduling.scheduling.availability import (
+	get_availability_slots_for_day,
+	iter_effective_intervals,
+)
+from meet_scheduling.meet_scheduling.scheduling.materialized import (
+	enqueue_availability_rebuild,
+	get_horizon,
+	rebuild_availability_days,
+	AVAILABILITY_DAY_HORIZON_DAYS,
+)
+
+
+class TestMaterializedAvailability(unittest.TestCase):
+	"""Tests for the materialized availability store."""
+
+	def setUp(self):
+		"""Set up test data before each test."""
+		if not frappe.db.exists("Availability Plan", "Test Plan Materialized"):
+			plan = frappe.get_doc({
+				"doctype": "Availability Plan",
+				"plan_name": "Test Plan Materialized",
+				"is_active": 1,
+				"availability_slots": [
+					{"weekday": day, "start_time": "09:00:00", "end_time": "12:00:00"}
+					for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+				]
+			})
+			plan.insert(ignore_permissions=True)
+
+		if not frappe.db.exists("Calendar Resource", "Test Resource Materialized"):
+			resource = frappe.get_doc({
+				"doctype": "Calendar Resource",
+				"resource_name": "Test Resource Materialized",
+				"timezone": "America/Bogota",
+				"slot_duration_minutes": 30,
+				"capacity": 1,
+				"availability_plan": "Test Plan Materialized",
+				"is_active": 1
+			})
+			resource.insert(ignore_permissions=True)
+
+		frappe.db.commit()
+
+		self.target_date = add_days(getdate(today()), 3)
+
+	def test_get_horizon_clips_range(self):
+		"""Test that ranges are clipped to [today, today + horizon]."""
+		start, end = get_horizon(add_days(today(), -10), add_days(today(), 1000))
+
+		self.assertEqual(start, getdate(today()))
+		self.assertEqual(end, add_days(getdate(today()), AVAILABILITY_DAY_HORIZON_DAYS))
+		self.assertIsNone(get_horizon(add_days(today(), -10), add_days(today(), -5)))
+
+	def test_rebuild_stores_one_row_per_day(self):
+		"""Test that rebuild stores every day of the range, including empty ones."""
+		count = rebuild_availability_days("Test Resource Materialized", today(), self.target_date)
+
+		self.assertEqual(count, 4)
+		self.assertEqual(
+			frappe.db.count("Availability Day", {"calendar_resource": "Test Resource Materialized"}),
+			4
+		)
+
+		stored = frappe.db.get_value(
+			"Availability Day",
+			{"calendar_resource": "Test Resource Materialized", "date": self.target_date},
+			"intervals"
+		)
+		self.assertEqual(len(json.loads(stored)), 1)
+
+	def test_get_availability_slots_for_day_reads_store(self):
+		"""Test that get_availability_slots_for_day serves the materialized row."""
+		rebuild_availability_days("Test Resource Materialized", self.target_date, self.target_date)
+
+		# Vaciar la fila: si se lee la tabla, el día queda sin disponibilidad
+		frappe.db.set_value(
+			"Availability Day",
+			{"calendar_resource": "Test Resource Materialized", "date": self.target_date},
+			"intervals",
+			"[]"
+		)
+
+		self.assertEqual(get_availability_slots_for_day("Test Resource Materialized", self.target_date), [])
+
+	def test_range_reads_store_and_computes_missing_days(self):
+		"""Test that the range path serves materialized days and computes only the rest."""
+		next_date = add_days(self.target_date, 1)
+		rebuild_availability_days("Test Resource Materialized", self.target_date, self.target_date)
+
+		frappe.db.set_value(
+			"Availability Day",
+			{"calendar_resource": "Test Resource Materialized", "date": self.target_date},
+			"intervals",
+			"[]"
+		)
+
+		days = dict(iter_effective_intervals("Test Resource Materialized", self.target_date, next_date))
+
+		# El día materializado (vaciado) no aparece; el siguiente se calcula del plan
+		self.assertNotIn(getdate(self.target_date), days)
+		self.assertEqual(len(days[getdate(next_date)]), 1)
+
+	def test_rebuild_ignores_stored_rows(self):
+		"""Test that rebuilding recomputes from the plan instead of reading the current rows."""
+		rebuild_availability_days("Test Resource Materialized", self.target_date, self.target_date)
+		frappe.db.set_value(
+			"Availability Day",
+			{"calendar_resource": "Test Resource Materialized", "date": self.target_date},
+			"intervals",
+			"[]"
+		)
+
+		rebuild_availability_days("Test Resource Materialized", self.target_date, self.target_date)
+		self.assertEqual(len(get_availability_slots_for_day("Test Resource Materialized", self.target_date)), 1)
+
+	def test_invalidation_falls_back_to_computing(self):
+		"""Test that invalidated days are computed on read."""
+		rebuild_availability_days("Test Resource Materialized", self.target_date, self.target_date)
+		enqueue_availability_rebuild("Test Resource Materialized", self.target_date, self.target_date)
+
+		self.assertFalse(frappe.db.exists(
+			"Availability Day",
+			{"calendar_resource": "Test Resource Materialized", "date": self.target_date}
+		))
+
+		slots = get_availability_slots_for_day("Test Resource Materialized", self.target_date)
+		self.assertEqual(len(slots), 1)
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+		frappe.db.delete("Availability Day", {"calendar_resource": "Test Resource Materialized"})
+		frappe.db.commit()
+
+
+def run_tests():
+	"""Run all tests in this module."""
+	unittest.main()
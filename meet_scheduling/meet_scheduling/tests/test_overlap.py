@@ -9,7 +9,7 @@ import frappe
 from frappe.utils import now_datetime, add_to_date, get_datetime
 from datetime import datetime, timedelta
 
-from meet_scheduling.meet_scheduling.scheduling.overlap import check_overlap
+from meet_scheduling.meet_scheduling.scheduling.overlap import check_overlap, check_overlaps_bulk
 
 
 class TestOverlap(unittest.TestCase):
@@ -220,6 +220,37 @@ class TestOverlap(unittest.TestCase):
 		appointment.delete()
 		frappe.db.commit()
 
+	def test_bulk_matches_single_checks(self):
+		"""Test that check_overlaps_bulk answers each candidate like check_overlap."""
+		start_time = add_to_date(now_datetime(), hours=8)
+		appointments = []
+		for offset in (0, 0, 90):
+			appointment = frappe.get_doc({
+				"doctype": "Appointment",
+				"calendar_resource": "Test Resource Overlap",
+				"start_datetime": add_to_date(start_time, minutes=offset),
+				"end_datetime": add_to_date(start_time, minutes=offset + 60),
+				"status": "Draft",
+				"docstatus": 0
+			})
+			appointment.insert(ignore_permissions=True)
+			appointments.append(appointment)
+
+		candidates = [
+			(add_to_date(start_time, minutes=offset), add_to_date(start_time, minutes=offset + 30))
+			for offset in (-30, 0, 45, 60, 90, 180)
+		]
+
+		results = check_overlaps_bulk("Test Resource Overlap", candidates, exclude=appointments[0].name)
+
+		self.assertEqual(len(results), len(candidates))
+		for (start, end), result in zip(candidates, results):
+			expected = check_overlap("Test Resource Overlap", start, end, exclude_appointment=appointments[0].name)
+			self.assertEqual(result, expected)
+
+		self.assertEqual(results[1]["overlapping_appointments"], [appointments[1].name])
+		self.assertEqual(check_overlaps_bulk("Test Resource Overlap", []), [])
+
 	def tearDown(self):
 		"""Clean up after tests."""
 		frappe.db.rollback()
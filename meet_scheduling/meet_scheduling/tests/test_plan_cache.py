@@ -0,0 +1,84 @@
+"""
+Tests for scheduling/plan_cache.py
+
+Tests Availability Plan compilation and cache invalidation.
+"""
+
+import unittest
+import frappe
+from datetime import timedelta
+
+from meet_scheduling.meet_scheduling.scheduling.plan_cache import (
+	compile_availability_plan,
+	get_compiled_plan,
+	invalidate_compiled_plan,
+	to_minutes,
+)
+
+
+class TestPlanCache(unittest.TestCase):
+	"""Tests for compiled Availability Plans."""
+
+	def setUp(self):
+		"""Set up test data before each test."""
+		# Recrear el plan para que cada test parta de las mismas franjas
+		if frappe.db.exists("Availability Plan", "Test Plan Cache"):
+			frappe.delete_doc("Availability Plan", "Test Plan Cache", ignore_permissions=True, force=True)
+
+		plan = frappe.get_doc({
+			"doctype": "Availability Plan",
+			"plan_name": "Test Plan Cache",
+			"is_active": 1,
+			"availability_slots": [
+				{"weekday": "Monday", "start_time": "14:00:00", "end_time": "18:00:00", "capacity": 2},
+				{"weekday": "Monday", "start_time": "08:00:00", "end_time": "12:00:00"},
+				{"weekday": "Friday", "start_time": "09:30:00", "end_time": "10:15:00"},
+			]
+		})
+		plan.insert(ignore_permissions=True)
+
+		frappe.db.commit()
+
+	def test_to_minutes(self):
+		"""Test conversion of time values to minutes since midnight."""
+		self.assertEqual(to_minutes("09:30:00"), 570)
+		self.assertEqual(to_minutes(timedelta(hours=18)), 1080)
+
+	def test_compile_sorts_slots_by_weekday(self):
+		"""Test that compiled slots are grouped by weekday and sorted."""
+		plan = frappe.get_doc("Availability Plan", "Test Plan Cache")
+		compiled = compile_availability_plan(plan)
+
+		self.assertEqual(compiled["weekdays"][0], ((480, 720, 0), (840, 1080, 2)))
+		self.assertEqual(compiled["weekdays"][4], ((570, 615, 0),))
+		self.assertEqual(compiled["weekdays"][1], ())
+
+	def test_get_compiled_plan_is_invalidated_on_update(self):
+		"""Test that saving the plan invalidates the compiled version."""
+		first = get_compiled_plan("Test Plan Cache")
+		self.assertIsNotNone(first)
+
+		plan = frappe.get_doc("Availability Plan", "Test Plan Cache")
+		plan.append("availability_slots", {
+			"weekday": "Sunday", "start_time": "10:00:00", "end_time": "11:00:00"
+		})
+		plan.save(ignore_permissions=True)
+		frappe.db.commit()
+
+		second = get_compiled_plan("Test Plan Cache")
+		self.assertNotEqual(first["token"], second["token"])
+		self.assertEqual(second["weekdays"][6], ((600, 660, 0),))
+
+	def test_missing_plan_returns_none(self):
+		"""Test that a nonexistent plan is not compiled."""
+		invalidate_compiled_plan("Nonexistent Plan")
+		self.assertIsNone(get_compiled_plan("Nonexistent Plan"))
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+
+
+def run_tests():
+	"""Run all tests in this module."""
+	unittest.main()
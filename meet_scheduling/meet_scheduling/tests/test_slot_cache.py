@@ -0,0 +1,121 @@
+"""
+Tests for scheduling/slot_cache.py
+
+Tests the versioned cache of generate_available_slots.
+"""
+
+import unittest
+import frappe
+from frappe.utils import add_days, getdate, today
+
+from meet_scheduling.meet_scheduling.scheduling.slot_cache import (
+	_bump_now,
+	_entry_key,
+	_store,
+	bump_resource_version,
+	get_cached_available_slots,
+	get_resource_version,
+	get_slot_cache_stats,
+	SLOT_VERSION_KEY,
+)
+
+
+class TestSlotCache(unittest.TestCase):
+	"""Tests for the versioned slot cache."""
+
+	def setUp(self):
+		"""Set up test data before each test."""
+		if not frappe.db.exists("Availability Plan", "Test Plan Slot Cache"):
+			plan = frappe.get_doc({
+				"doctype": "Availability Plan",
+				"plan_name": "Test Plan Slot Cache",
+				"is_active": 1,
+				"availability_slots": [
+					{"weekday": day, "start_time": "09:00:00", "end_time": "10:00:00"}
+					for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+				]
+			})
+			plan.insert(ignore_permissions=True)
+
+		if not frappe.db.exists("Calendar Resource", "Test Resource Slot Cache"):
+			resource = frappe.get_doc({
+				"doctype": "Calendar Resource",
+				"resource_name": "Test Resource Slot Cache",
+				"timezone": "America/Bogota",
+				"slot_duration_minutes": 30,
+				"capacity": 1,
+				"availability_plan": "Test Plan Slot Cache",
+				"is_active": 1
+			})
+			resource.insert(ignore_permissions=True)
+
+		frappe.db.commit()
+
+		self.resource = "Test Resource Slot Cache"
+		self.target_date = add_days(getdate(today()), 3)
+		self.key = _entry_key(self.resource, self.target_date, self.target_date)
+		frappe.cache().delete_value(self.key)
+
+	def test_miss_then_hit(self):
+		"""Test that the second read of the same range is a hit."""
+		before = get_slot_cache_stats()
+
+		first = get_cached_available_slots(self.resource, self.target_date, self.target_date)
+		second = get_cached_available_slots(self.resource, self.target_date, self.target_date)
+
+		after = get_slot_cache_stats()
+		self.assertEqual(first, second)
+		self.assertEqual(len(first), 2)
+		self.assertEqual(after["misses"] - before["misses"], 1)
+		self.assertEqual(after["hits"] - before["hits"], 1)
+
+	def test_recent_bump_serves_stale(self):
+		"""Test that a recently bumped version still serves the previous entry."""
+		_store(self.key, get_resource_version(self.resource), [{"marker": True}])
+		_bump_now(self.resource)
+
+		before = get_slot_cache_stats()
+		slots = get_cached_available_slots(self.resource, self.target_date, self.target_date)
+
+		self.assertEqual(slots, [{"marker": True}])
+		self.assertEqual(get_slot_cache_stats()["stale_hits"] - before["stale_hits"], 1)
+
+	def test_old_bump_recomputes(self):
+		"""Test that an outdated entry past the stale window is recomputed."""
+		_store(self.key, get_resource_version(self.resource), [{"marker": True}])
+		_bump_now(self.resource)
+
+		# Simular que el cambio ocurrió fuera de la ventana stale
+		cache = frappe.cache()
+		cache.set(cache.make_key(f"{SLOT_VERSION_KEY}:{self.resource}:bumped_at"), 0)
+
+		slots = get_cached_available_slots(self.resource, self.target_date, self.target_date)
+		self.assertEqual(len(slots), 2)
+
+	def test_bump_runs_after_commit(self):
+		"""Test that the version only changes once the transaction commits."""
+		version = get_resource_version(self.resource)
+
+		bump_resource_version(self.resource)
+		self.assertEqual(get_resource_version(self.resource), version)
+
+		frappe.db.commit()
+		self.assertEqual(get_resource_version(self.resource), version + 1)
+
+	def test_stats_hit_ratio(self):
+		"""Test that stats expose a hit ratio between 0 and 1."""
+		get_cached_available_slots(self.resource, self.target_date, self.target_date)
+
+		stats = get_slot_cache_stats()
+		self.assertGreaterEqual(stats["hit_ratio"], 0)
+		self.assertLessEqual(stats["hit_ratio"], 1)
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+		frappe.cache().delete_value(self.key)
+
+
+def run_tests():
+	"""Run all tests in this module."""
+	unittest.main()
@@ -0,0 +1,150 @@
+"""
+Tests for scheduling/slot_index.py
+
+Tests the precomputed slot index, its coverage and incremental updates.
+"""
+
+import unittest
+import frappe
+from datetime import datetime, timedelta
+from frappe.utils import add_days, add_to_date, getdate, now_datetime, today
+
+from meet_scheduling.meet_scheduling.scheduling.slot_index import (
+	enqueue_slot_index_rebuild,
+	get_indexed_slots,
+	invalidate_slot_index,
+	rebuild_slot_index,
+	update_slot_index_for_appointment,
+)
+from meet_scheduling.meet_scheduling.scheduling.slots import generate_available_slots
+
+
+class TestSlotIndex(unittest.TestCase):
+	"""Tests for the slot index."""
+
+	def setUp(self):
+		"""Set up test data before each test."""
+		if not frappe.db.exists("Availability Plan", "Test Plan Slot Index"):
+			plan = frappe.get_doc({
+				"doctype": "Availability Plan",
+				"plan_name": "Test Plan Slot Index",
+				"is_active": 1,
+				"availability_slots": [
+					{"weekday": day, "start_time": "09:00:00", "end_time": "11:00:00"}
+					for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+				]
+			})
+			plan.insert(ignore_permissions=True)
+
+		if not frappe.db.exists("Calendar Resource", "Test Resource Slot Index"):
+			resource = frappe.get_doc({
+				"doctype": "Calendar Resource",
+				"resource_name": "Test Resource Slot Index",
+				"timezone": "America/Bogota",
+				"slot_duration_minutes": 30,
+				"capacity": 1,
+				"availability_plan": "Test Plan Slot Index",
+				"use_slot_index": 1,
+				"is_active": 1
+			})
+			resource.insert(ignore_permissions=True)
+
+		frappe.db.commit()
+
+		self.resource = "Test Resource Slot Index"
+		self.target_date = add_days(getdate(today()), 3)
+
+		# La cobertura se registra tras el commit de la reconstrucción
+		rebuild_slot_index(self.resource, self.target_date, self.target_date)
+		frappe.db.commit()
+
+	def test_index_matches_generated_slots(self):
+		"""Test that indexed slots equal the computed ones."""
+		self.assertEqual(
+			get_indexed_slots(self.resource, self.target_date, self.target_date),
+			generate_available_slots(self.resource, self.target_date, self.target_date)
+		)
+
+	def test_uncovered_range_returns_none(self):
+		"""Test that a range with days outside the index is not served."""
+		self.assertIsNone(get_indexed_slots(self.resource, self.target_date, add_days(self.target_date, 1)))
+
+		invalidate_slot_index(self.resource, self.target_date, self.target_date)
+		self.assertIsNone(get_indexed_slots(self.resource, self.target_date, self.target_date))
+
+	def test_availability_change_drops_coverage(self):
+		"""Test that an availability rebuild request stops serving the range."""
+		enqueue_slot_index_rebuild(self.resource, self.target_date, self.target_date)
+		self.assertIsNone(get_indexed_slots(self.resource, self.target_date, self.target_date))
+
+	def test_appointment_updates_only_affected_slots(self):
+		"""Test that booking a slot updates that slot's capacity in place."""
+		start = datetime.combine(self.target_date, datetime.min.time()) + timedelta(hours=9, minutes=30)
+		appointment = frappe.get_doc({
+			"doctype": "Appointment",
+			"calendar_resource": self.resource,
+			"start_datetime": start,
+			"end_datetime": start + timedelta(minutes=30),
+			"status": "Draft",
+			"docstatus": 0
+		})
+		appointment.insert(ignore_permissions=True)
+
+		slots = get_indexed_slots(self.resource, self.target_date, self.target_date)
+		self.assertEqual([slot["capacity_remaining"] for slot in slots], [1, 0, 1, 1])
+
+		appointment.delete()
+		slots = get_indexed_slots(self.resource, self.target_date, self.target_date)
+		self.assertEqual([slot["capacity_remaining"] for slot in slots], [1, 1, 1, 1])
+
+	def test_expired_draft_not_counted(self):
+		"""Test that a Draft that expired without being saved does not hold its indexed slot."""
+		appointment = self._insert_draft(hours=9, minutes=30)
+
+		# Expira sin doc_events, como pasa hasta que corre cleanup_expired_drafts
+		frappe.db.set_value("Appointment", appointment.name, "draft_expires_at", add_to_date(now_datetime(), minutes=-1))
+
+		slots = get_indexed_slots(self.resource, self.target_date, self.target_date)
+		self.assertEqual([slot["capacity_remaining"] for slot in slots], [1, 1, 1, 1])
+		self.assertEqual(slots, generate_available_slots(self.resource, self.target_date, self.target_date))
+		self.assertEqual(len(get_indexed_slots(self.resource, self.target_date, self.target_date, min_remaining=1)), 4)
+
+	def test_update_runs_once_per_save(self):
+		"""Test that on_update and on_submit of the same save recompute the index once."""
+		appointment = self._insert_draft(hours=9, minutes=30)
+		row = frappe.get_all(
+			"Slot Index Entry",
+			filters={"calendar_resource": self.resource, "capacity_remaining": 0},
+			pluck="name"
+		)[0]
+
+		# on_update ya recalculó en este save: una segunda llamada no vuelve a tocar las filas
+		frappe.db.set_value("Slot Index Entry", row, "capacity_remaining", 5, update_modified=False)
+		update_slot_index_for_appointment(appointment)
+		self.assertEqual(frappe.db.get_value("Slot Index Entry", row, "capacity_remaining"), 5)
+
+		appointment.save(ignore_permissions=True)
+		self.assertEqual(frappe.db.get_value("Slot Index Entry", row, "capacity_remaining"), 0)
+
+	def _insert_draft(self, hours, minutes):
+		start = datetime.combine(self.target_date, datetime.min.time()) + timedelta(hours=hours, minutes=minutes)
+		appointment = frappe.get_doc({
+			"doctype": "Appointment",
+			"calendar_resource": self.resource,
+			"start_datetime": start,
+			"end_datetime": start + timedelta(minutes=30),
+			"status": "Draft",
+			"docstatus": 0
+		})
+		return appointment.insert(ignore_permissions=True)
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+		invalidate_slot_index(self.resource)
+		frappe.db.commit()
+
+
+def run_tests():
+	"""Run all tests in this module."""
+	unittest.main()
@@ -5,11 +5,23 @@ Tests discrete slot generation for UI display.
 """
 
 import unittest
+from unittest.mock import patch
+
 import frappe
-from frappe.utils import getdate, add_to_date, now_datetime
+from frappe.utils import getdate, add_to_date, get_datetime, now_datetime
 from datetime import date
 
-from meet_scheduling.meet_scheduling.scheduling.slots import generate_available_slots
+from meet_scheduling.meet_scheduling.scheduling import availability, slots
+from meet_scheduling.meet_scheduling.scheduling.intervals import from_epoch
+from meet_scheduling.meet_scheduling.scheduling.slots import (
+	SlotFilters,
+	_slot_range,
+	generate_availability_summary,
+	generate_available_slots,
+	generate_slot_runs,
+	iter_available_slots,
+)
+from meet_scheduling.meet_scheduling.scheduling.timezones import get_resource_timezone
 
 
 class TestSlots(unittest.TestCase):
@@ -29,14 +41,24 @@ class TestSlots(unittest.TestCase):
 			})
 			resource.insert(ignore_permissions=True)
 
-		# Create Availability Plan
+		# Create Availability Plan (08:00-12:00 todos los días, así hoy siempre tiene slots)
+		weekly_slots = [
+			{"weekday": day, "start_time": "08:00:00", "end_time": "12:00:00"}
+			for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+		]
 		if not frappe.db.exists("Availability Plan", "Test Plan Slots"):
 			plan = frappe.get_doc({
 				"doctype": "Availability Plan",
 				"plan_name": "Test Plan Slots",
-				"is_active": 1
+				"is_active": 1,
+				"availability_slots": weekly_slots
 			})
 			plan.insert(ignore_permissions=True)
+		else:
+			plan = frappe.get_doc("Availability Plan", "Test Plan Slots")
+			if not plan.availability_slots:
+				plan.set("availability_slots", weekly_slots)
+				plan.save(ignore_permissions=True)
 
 		# Link resource to plan
 		resource = frappe.get_doc("Calendar Resource", "Test Resource Slots")
@@ -99,6 +121,132 @@ class TestSlots(unittest.TestCase):
 		except Exception as e:
 			self.fail(f"generate_available_slots raised exception: {e}")
 
+	def test_iter_available_slots_is_lazy(self):
+		"""Test that pulling the first slot of a long range only loads the first chunk."""
+		today = getdate()
+		end = add_to_date(today, days=365)
+		expected = generate_available_slots("Test Resource Slots", today, today)
+		self.assertTrue(expected)
+
+		with patch.object(
+			availability, "_load_availability_context", wraps=availability._load_availability_context
+		) as load_context, patch.object(
+			slots, "get_active_bookings", wraps=slots.get_active_bookings
+		) as load_bookings:
+			first = next(iter_available_slots("Test Resource Slots", today, end), None)
+
+			self.assertEqual(first, expected[0])
+			self.assertEqual(load_context.call_count, 1)
+			self.assertEqual(load_bookings.call_count, 1)
+
+	def test_compact_runs_match_full_slots(self):
+		"""Test that expanding the compact runs gives the same slots as the full format."""
+		today = getdate()
+		end = add_to_date(today, days=7)
+		tz = get_resource_timezone("Test Resource Slots")
+
+		expanded = []
+		for run in generate_slot_runs("Test Resource Slots", today, end):
+			for i, capacity_remaining in enumerate(run["capacity_remaining"]):
+				slot_start = run["start_epoch"] + i * run["step_seconds"]
+				expanded.append({
+					"start": from_epoch(slot_start, tz).strftime("%Y-%m-%d %H:%M:%S"),
+					"end": from_epoch(slot_start + run["duration_seconds"], tz).strftime("%Y-%m-%d %H:%M:%S"),
+					"capacity_remaining": capacity_remaining,
+					"is_available": capacity_remaining > 0
+				})
+
+		self.assertEqual(expanded, generate_available_slots("Test Resource Slots", today, end))
+
+	def test_filters_return_subset_of_full_slots(self):
+		"""Test that filtered slots are exactly the full slots matching the filters."""
+		today = getdate()
+		end = add_to_date(today, days=14)
+		filters = SlotFilters(weekdays=(0, 2, 4), start_minute=9 * 60, end_minute=12 * 60, only_available=True)
+
+		expected = [
+			slot for slot in generate_available_slots("Test Resource Slots", today, end)
+			if getdate(slot["start"]).weekday() in (0, 2, 4)
+			and "09:00:00" <= slot["start"][11:] and slot["end"][11:] <= "12:00:00"
+			and slot["is_available"]
+		]
+
+		self.assertEqual(generate_available_slots("Test Resource Slots", today, end, filters), expected)
+
+	def test_summary_matches_full_slots(self):
+		"""Test that the per-day summary matches counting the full slots."""
+		today = getdate()
+		end = add_to_date(today, days=14)
+
+		expected = {}
+		for slot in generate_available_slots("Test Resource Slots", today, end):
+			day = expected.setdefault(slot["start"][:10], {"total_slots": 0, "free_slots": 0, "first_free": None})
+			day["total_slots"] += 1
+			if slot["is_available"]:
+				day["free_slots"] += 1
+				day["first_free"] = day["first_free"] or slot["start"]
+
+		summary = {
+			day.pop("date"): day
+			for day in generate_availability_summary("Test Resource Slots", today, end)
+		}
+		self.assertEqual(summary, expected)
+
+	def test_min_capacity_above_resource_capacity_is_empty(self):
+		"""Test that asking for more free seats than the capacity yields nothing."""
+		today = getdate()
+
+		result = generate_available_slots(
+			"Test Resource Slots", today, add_to_date(today, days=7),
+			SlotFilters(min_capacity_remaining=2)
+		)
+
+		self.assertEqual(result, [])
+
+	def test_step_equal_to_duration_is_back_to_back(self):
+		"""Test that step_minutes equal to the duration reproduces the default slots."""
+		today = getdate()
+		end = add_to_date(today, days=7)
+
+		self.assertEqual(
+			generate_available_slots("Test Resource Slots", today, end, duration_minutes=60, step_minutes=60),
+			generate_available_slots("Test Resource Slots", today, end)
+		)
+
+	def test_sliding_step_starts_every_step(self):
+		"""Test that sliding slots start every step_minutes and last duration_minutes."""
+		today = getdate()
+		end = add_to_date(today, days=7)
+
+		result = generate_available_slots("Test Resource Slots", today, end, duration_minutes=45, step_minutes=15)
+		self.assertTrue(result)
+
+		for slot in result:
+			start = get_datetime(slot["start"])
+			self.assertEqual((get_datetime(slot["end"]) - start).total_seconds(), 45 * 60)
+
+		# Un único intervalo por día (08:00-12:00): inicios consecutivos a 15 min
+		for previous, current in zip(result, result[1:]):
+			if previous["start"][:10] == current["start"][:10]:
+				gap = get_datetime(current["start"]) - get_datetime(previous["start"])
+				self.assertEqual(gap.total_seconds(), 15 * 60)
+
+	def test_slot_range_with_step(self):
+		"""Test candidate counting with a step shorter than the duration."""
+		# Intervalo de 2 horas, slots de 45 min cada 15 min: inicios 0, 15, ..., 75 min
+		self.assertEqual(_slot_range(0, 7200, 2700, step_seconds=900), (0, 6))
+
+	def test_slot_range_respects_window(self):
+		"""Test the slot index arithmetic used to apply the time window."""
+		# Intervalo de 3 horas con slots de 1 hora
+		self.assertEqual(_slot_range(0, 10800, 3600), (0, 3))
+		# La ventana empieza a mitad de un slot: ese slot se excluye
+		self.assertEqual(_slot_range(0, 10800, 3600, 1800, None), (3600, 2))
+		# La ventana termina antes del fin del segundo slot
+		self.assertEqual(_slot_range(0, 10800, 3600, None, 7000), (0, 1))
+		# Ventana vacía
+		self.assertEqual(_slot_range(0, 10800, 3600, 7200, 7200)[1], 0)
+
 	def tearDown(self):
 		"""Clean up after tests."""
 		frappe.db.rollback()
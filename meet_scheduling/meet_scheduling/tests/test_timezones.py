@@ -0,0 +1,84 @@
+"""
+Tests for scheduling/timezones.py
+
+Tests timezone resolution and local time → UTC conversion across DST transitions.
+"""
+
+import unittest
+import frappe
+from datetime import date, datetime
+import pytz
+
+from meet_scheduling.meet_scheduling.scheduling.timezones import (
+	RESOURCE_TIMEZONE_CACHE_KEY,
+	get_transition_table,
+	invalidate_resource_timezone,
+	local_to_epoch,
+	localize,
+	resolve_timezone_name,
+	wall_to_epoch,
+)
+
+
+class TestTimezones(unittest.TestCase):
+	"""Tests for the timezone service."""
+
+	def setUp(self):
+		"""Set up test data before each test."""
+		self.tz = pytz.timezone("America/New_York")
+
+	def test_invalid_timezone_falls_back_to_utc(self):
+		"""Test that an invalid timezone name resolves to UTC."""
+		self.assertEqual(resolve_timezone_name("Invalid/Timezone"), pytz.UTC)
+		self.assertEqual(resolve_timezone_name(None), pytz.UTC)
+
+	def test_transition_table_has_both_dst_changes(self):
+		"""Test that the yearly table finds the spring and fall transitions."""
+		table = get_transition_table(self.tz, 2026)
+
+		self.assertEqual(len(table.boundaries), 2)
+		self.assertEqual(table.offsets, (-18000, -14400, -18000))
+
+	def test_matches_pytz_outside_transitions(self):
+		"""Test that conversion matches tz.localize for unambiguous times."""
+		for value in (datetime(2026, 1, 20, 9, 0), datetime(2026, 7, 4, 18, 45), datetime(2026, 12, 31, 23, 30)):
+			self.assertEqual(wall_to_epoch(value, self.tz), int(self.tz.localize(value).timestamp()))
+
+	def test_dst_gap_shifts_forward(self):
+		"""Test that a nonexistent local time (spring forward) moves forward."""
+		# 2026-03-08 02:30 no existe en New York
+		epoch = local_to_epoch(date(2026, 3, 8), 150, self.tz)
+		result = datetime.fromtimestamp(epoch, self.tz)
+
+		self.assertEqual((result.hour, result.minute), (3, 30))
+
+	def test_dst_overlap_uses_first_occurrence(self):
+		"""Test that an ambiguous local time (fall back) uses the first occurrence."""
+		# 2026-11-01 01:30 ocurre dos veces en New York
+		epoch = local_to_epoch(date(2026, 11, 1), 90, self.tz)
+
+		self.assertEqual(epoch, int(self.tz.localize(datetime(2026, 11, 1, 1, 30), is_dst=True).timestamp()))
+
+	def test_localize_keeps_aware_datetimes(self):
+		"""Test that localize only converts naive datetimes."""
+		aware = pytz.UTC.localize(datetime(2026, 1, 20, 14, 0))
+		self.assertIs(localize(aware, self.tz), aware)
+
+		naive = localize(datetime(2026, 1, 20, 9, 0), self.tz)
+		self.assertEqual(naive, aware)
+
+	def test_resource_timezone_invalidated_after_commit(self):
+		"""Test that the cached resource timezone is only dropped once the transaction commits."""
+		cache = frappe.cache()
+		cache.hset(RESOURCE_TIMEZONE_CACHE_KEY, "Test Resource Timezone", "America/Bogota")
+
+		invalidate_resource_timezone("Test Resource Timezone")
+		self.assertEqual(cache.hget(RESOURCE_TIMEZONE_CACHE_KEY, "Test Resource Timezone"), "America/Bogota")
+
+		frappe.db.commit()
+		self.assertIsNone(cache.hget(RESOURCE_TIMEZONE_CACHE_KEY, "Test Resource Timezone"))
+
+
+def run_tests():
+	"""Run all tests in this module."""
+	unittest.main()
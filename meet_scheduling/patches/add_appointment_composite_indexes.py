@@ -0,0 +1,10 @@
+"""
+Índices compuestos de Appointment para las queries del motor de disponibilidad,
+los jobs programados y get_my_appointments (ver APPOINTMENT_INDEXES).
+"""
+
+from meet_scheduling.meet_scheduling.doctype.appointment.appointment import add_appointment_indexes
+
+
+def execute():
+	add_appointment_indexes()
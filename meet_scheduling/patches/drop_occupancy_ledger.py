@@ -0,0 +1,14 @@
+"""
+Elimina el DocType Occupancy Bucket y su tabla: la capacidad se valida con
+CapacityTimeline (capacity.py) y las reservas se serializan por resource
+(booking.lock_calendar_resource).
+"""
+
+import frappe
+
+
+def execute():
+	if frappe.db.exists("DocType", "Occupancy Bucket"):
+		frappe.delete_doc("DocType", "Occupancy Bucket", ignore_missing=True, force=True)
+
+	frappe.db.sql_ddl("DROP TABLE IF EXISTS `tabOccupancy Bucket`")